@@ -0,0 +1,39 @@
+{
+    'name': 'Dubai SME Lead Webhook',
+    'version': '17.0.1.0.0',
+    'summary': 'Queue and process leads pushed by the Dubai SME Scraper',
+    'description': """
+Receives leads from the Dubai SME Scraper webhook connectors.
+
+The webhook endpoint only stores raw payloads in a staging table and returns
+immediately. A scheduled worker drains the staging table in locked batches,
+upserting partners, tags and CRM leads set-wise, with retries and error status.
+
+Partners and leads are matched through stored, indexed normalized keys
+(E.164 phone, website domain, name slug), with optional pg_trgm similarity
+matching on names (system parameter dubai_sme_webhook.fuzzy_name_threshold).
+
+Batch bodies may be gzip or zstd compressed (Content-Encoding header); zstd
+needs the optional zstandard Python package on the server.
+
+Pushes carry an idempotency key (lead identity + content digest). Keys seen
+within the dedup window (system parameter
+dubai_sme_webhook.idempotency_window_hours, default 24) are acknowledged as
+duplicates without queueing anything.
+
+Every sighting of a lead is stored as a compact observation row (source,
+search term, score, changed fields) instead of being appended to the lead
+description, so lead rows keep a constant size.
+""",
+    'category': 'Sales/CRM',
+    'depends': ['crm', 'base'],
+    'data': [
+        'security/ir.model.access.csv',
+        'data/ir_cron.xml',
+        'views/lead_staging_views.xml',
+        'views/crm_lead_views.xml',
+    ],
+    'installable': True,
+    'auto_install': False,
+    'license': 'LGPL-3',
+}
@@ -0,0 +1 @@
+from . import sme_webhook
@@ -0,0 +1,220 @@
+# ====================================================================
+# ODOO 17/18 WEBHOOK CONTROLLER FOR DUBAI SME LEADS
+# Part of the dubai_sme_webhook addon (see __manifest__.py)
+# ====================================================================
+
+from odoo import http
+from odoo.http import request
+import io
+import json
+import logging
+import zlib
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+_logger = logging.getLogger(__name__)
+
+# Upper bound on a decoded request body, guards against compression bombs
+MAX_BODY_BYTES = 32 * 1024 * 1024
+
+
+class PayloadTooLarge(ValueError):
+    pass
+
+
+def _reply(payload, status=200, rpc_id=False):
+    """
+    JSON response for plain and JSON-RPC callers (rpc_id is not False)
+
+    Plain callers see the outcome in the HTTP status. JSON-RPC callers get
+    HTTP 200 with {"result": ...}, or {"error": ...} for a failed request,
+    the way Odoo answers type='json' routes.
+    """
+    if rpc_id is False:
+        return request.make_json_response(payload, status=status)
+
+    envelope = {'jsonrpc': '2.0', 'id': rpc_id}
+    if status >= 400:
+        envelope['error'] = {'code': status, 'message': payload.get('message', ''), 'data': payload}
+    else:
+        envelope['result'] = payload
+    return request.make_json_response(envelope)
+
+
+def _decode_body(raw, encoding):
+    """Decode a request body according to its Content-Encoding header"""
+    encoding = (encoding or '').strip().lower()
+    if encoding in ('', 'identity'):
+        body = raw
+    elif encoding in ('gzip', 'x-gzip'):
+        body = zlib.decompressobj(16 + zlib.MAX_WBITS).decompress(raw, MAX_BODY_BYTES + 1)
+    elif encoding == 'zstd' and zstandard is not None:
+        reader = zstandard.ZstdDecompressor().stream_reader(io.BytesIO(raw))
+        body = reader.read(MAX_BODY_BYTES + 1)
+    else:
+        raise NotImplementedError(encoding)
+
+    if len(body) > MAX_BODY_BYTES:
+        raise PayloadTooLarge()
+    return body
+
+
+class DubaiSMEWebhookController(http.Controller):
+    
+    @http.route('/web/hook/1342d838-a97c-466c-99f1-8ae3222f38ce', 
+                type='http', auth='none', methods=['POST'], csrf=False, save_session=False)
+    def receive_sme_lead(self, **kwargs):
+        """
+        Webhook endpoint to receive leads from Dubai SME Scraper
+        URL: https://scholarixglobal.com/web/hook/1342d838-a97c-466c-99f1-8ae3222f38ce
+        
+        Accepts a single lead, or a batch as {"leads": [...], "batch": true}.
+        Bodies may be sent with Content-Encoding gzip or (when the zstandard
+        package is installed) zstd.
+        Requests and leads carrying an already seen Idempotency-Key header /
+        idempotency_key field are acknowledged as duplicates and dropped.
+        Keys of leads whose staging row ends in error are released again.
+        Payloads are only stored in dubai.sme.lead.staging here; the
+        "Dubai SME: Process Lead Staging" cron creates partners and leads.
+        """
+        
+        httprequest = request.httprequest
+        try:
+            body = _decode_body(httprequest.get_data(), httprequest.headers.get('Content-Encoding'))
+            # Form-encoded posts arrive as keyword arguments
+            lead_data = json.loads(body) if body and not httprequest.form else dict(kwargs)
+        except NotImplementedError as e:
+            return request.make_json_response(
+                {'status': 'error', 'message': f'Unsupported Content-Encoding: {e}'}, status=415)
+        except PayloadTooLarge:
+            return request.make_json_response(
+                {'status': 'error', 'message': 'Decoded payload too large'}, status=413)
+        except (zlib.error, ValueError) as e:
+            return request.make_json_response(
+                {'status': 'error', 'message': f'Invalid payload: {e}'}, status=400)
+        
+        # Callers built for the former type='json' route may still send a JSON-RPC envelope
+        rpc_id = False
+        if isinstance(lead_data, dict) and isinstance(lead_data.get('params'), dict) and 'jsonrpc' in lead_data:
+            rpc_id = lead_data.get('id')
+            lead_data = lead_data['params']
+        if not isinstance(lead_data, dict):
+            return _reply({'status': 'error', 'message': 'Expected a JSON object'}, status=400, rpc_id=rpc_id)
+        
+        try:
+            if lead_data.get('batch') or isinstance(lead_data.get('leads'), list):
+                leads = lead_data.get('leads') or []
+            else:
+                leads = [lead_data]
+            leads = [lead for lead in leads if isinstance(lead, dict)]
+            
+            # Repeated pushes (retries, end-of-run re-pushes) are answered
+            # without touching the staging table, partners or leads
+            Keys = request.env['dubai.sme.idempotency.key'].sudo()
+            request_key = httprequest.headers.get('Idempotency-Key')
+            if request_key and not Keys._claim([request_key]):
+                return _reply({'status': 'duplicate', 'queued': 0, 'duplicates': len(leads), 'rejected': []},
+                              rpc_id=rpc_id)
+            
+            # A single-lead push uses the lead's own key as request key: claimed above
+            fresh_keys = Keys._claim([
+                lead.get('idempotency_key') for lead in leads if lead.get('idempotency_key') != request_key
+            ])
+            if request_key:
+                fresh_keys.add(request_key)
+            seen_keys = set()
+            duplicates = 0
+            
+            Processor = request.env['dubai.sme.lead.processor']
+            accepted = []
+            rejected = []
+            for index, lead in enumerate(leads):
+                key = lead.get('idempotency_key')
+                if key and (key not in fresh_keys or key in seen_keys):
+                    duplicates += 1
+                    continue
+                seen_keys.add(key)
+                
+                # Validate required fields
+                lead = Processor._coerce_lead(lead)
+                if lead.get('Name'):
+                    accepted.append(lead)
+                else:
+                    rejected.append(index)
+            
+            if not accepted:
+                if duplicates:
+                    return _reply({'status': 'duplicate', 'queued': 0, 'duplicates': duplicates,
+                                   'rejected': rejected}, rpc_id=rpc_id)
+                # Nothing was queued: a success status would count the leads as delivered
+                return _reply({'status': 'error', 'message': 'Company name is required', 'rejected': rejected},
+                              status=422, rpc_id=rpc_id)
+            
+            staged = request.env['dubai.sme.lead.staging'].sudo().enqueue(accepted, request_key=request_key)
+            _logger.info(f"Queued {len(staged)} Dubai SME lead(s) for processing, {duplicates} duplicate(s) skipped")
+            
+            return _reply({
+                'status': 'queued',
+                'queued': len(staged),
+                'staging_ids': staged.ids,
+                'duplicates': duplicates,
+                'rejected': rejected
+            }, rpc_id=rpc_id)
+            
+        except Exception as e:
+            # Don't keep idempotency keys of a request whose leads were not queued
+            request.env.cr.rollback()
+            _logger.error(f"Dubai SME webhook error: {str(e)}")
+            return _reply({'status': 'error', 'message': f'Queueing failed: {str(e)}'}, status=500, rpc_id=rpc_id)
+
+
+# ====================================================================
+# INSTALLATION INSTRUCTIONS FOR ODOO
+# ====================================================================
+
+"""
+STEP 1: Copy the dubai_sme_webhook folder into your Odoo addons path
+
+STEP 2: Update the apps list and install "Dubai SME Lead Webhook"
+
+STEP 3: Test the webhook:
+curl -X POST https://scholarixglobal.com/web/hook/1342d838-a97c-466c-99f1-8ae3222f38ce \
+-H "Content-Type: application/json" \
+-d '{
+  "Name": "Test Company LLC",
+  "Category": "Manufacturing",
+  "Phone": "+971501234567",
+  "Email": "contact@testcompany.ae",
+  "Website": "https://testcompany.ae",
+  "Address": "Dubai Investment Park, Dubai",
+  "Priority": "HIGH",
+  "Quality Score": "9",
+  "Data Source": "Dubai SME Scraper",
+  "Search Term": "manufacturing companies Dubai",
+  "Timestamp": "2025-10-15T08:30:00.000Z"
+}'
+
+Batch payloads (as sent by push_leads_batch) are queued the same way:
+curl -X POST https://scholarixglobal.com/web/hook/1342d838-a97c-466c-99f1-8ae3222f38ce \
+-H "Content-Type: application/json" \
+-d '{"batch": true, "leads": [{"Name": "Test Company LLC", "Phone": "+971501234567"},
+                             {"Name": "Another Company FZE", "Email": "info@another.ae"}]}'
+
+Large batches can be sent compressed (gzip, or zstd when the zstandard
+package is installed on the Odoo server):
+gzip -c batch.json | curl -X POST https://scholarixglobal.com/web/hook/1342d838-a97c-466c-99f1-8ae3222f38ce \
+-H "Content-Type: application/json" -H "Content-Encoding: gzip" --data-binary @-
+
+The webhook answers immediately with {"status": "queued", ...}. A request in
+which every lead was rejected is answered with HTTP 422; requests sent in a
+JSON-RPC envelope get the JSON-RPC result/error envelope instead. Queued payloads
+are processed set-wise by the staging cron; failures are retried with backoff
+and end up in state "error" after 5 attempts. Follow them under
+Settings > Technical > Dubai SME Lead Staging.
+
+WEBHOOK ENDPOINT: /web/hook/1342d838-a97c-466c-99f1-8ae3222f38ce
+FULL URL: https://scholarixglobal.com/web/hook/1342d838-a97c-466c-99f1-8ae3222f38ce
+"""
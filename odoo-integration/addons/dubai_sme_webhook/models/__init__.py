@@ -0,0 +1,7 @@
+from . import crm_lead
+from . import crm_tag
+from . import idempotency_key
+from . import lead_observation
+from . import lead_processor
+from . import lead_staging
+from . import res_partner
@@ -0,0 +1,27 @@
+from odoo import api, fields, models
+
+from .match_keys import domain_key, name_key, phone_key
+
+
+class CrmLead(models.Model):
+    _inherit = 'crm.lead'
+    
+    sme_name_key = fields.Char(compute='_compute_sme_match_keys', store=True, index=True)
+    sme_phone_key = fields.Char(compute='_compute_sme_match_keys', store=True, index=True)
+    sme_domain_key = fields.Char(compute='_compute_sme_match_keys', store=True, index=True)
+    sme_observation_ids = fields.One2many('dubai.sme.lead.observation', 'lead_id', string='Scraper History')
+    sme_observation_count = fields.Integer(compute='_compute_sme_observation_count')
+    
+    @api.depends('name', 'partner_name', 'partner_id.name', 'phone', 'website')
+    def _compute_sme_match_keys(self):
+        for lead in self:
+            lead.sme_name_key = name_key(lead.partner_id.name or lead.partner_name or lead.name) or False
+            lead.sme_phone_key = phone_key(lead.phone) or False
+            lead.sme_domain_key = domain_key(lead.website) or False
+    
+    def _compute_sme_observation_count(self):
+        counts = dict(self.env['dubai.sme.lead.observation']._read_group(
+            [('lead_id', 'in', self.ids)], ['lead_id'], ['__count']
+        ))
+        for lead in self:
+            lead.sme_observation_count = counts.get(lead, 0)
@@ -0,0 +1,51 @@
+import logging
+
+from odoo import api, models
+
+from .tag_cache import TagCache, resolve_tags
+
+_logger = logging.getLogger(__name__)
+
+# Shared by every request of this worker; validated per call (see tag_cache)
+TAG_CACHE = TagCache()
+
+
+class CrmTag(models.Model):
+    _inherit = 'crm.tag'
+
+    @api.model
+    def _dubai_sme_tag_fingerprint(self):
+        """Row count, latest write_date and highest id of crm_tag, as this transaction sees it"""
+
+        self.flush_model(['name', 'active'])
+        self.env.cr.execute("SELECT count(*), max(write_date), max(id) FROM crm_tag")
+        return self.env.cr.fetchone()
+
+    @api.model
+    def _dubai_sme_tag_ids_by_key(self):
+        """Normalized name -> id for every tag, cached per worker until the crm_tag table changes"""
+
+        tags = self.sudo().with_context(lang='en_US', active_test=False)
+        return TAG_CACHE.get(
+            self.env.cr.dbname,
+            self._dubai_sme_tag_fingerprint(),
+            lambda: [(tag['id'], tag['name']) for tag in tags.search_read([], ['name'])]
+        )
+
+    @api.model
+    def _dubai_sme_resolve_tags(self, tag_names):
+        """
+        Resolve tag names to ids, creating the missing ones in one multi-record create
+
+        In steady state the names are served from the worker cache after a
+        single fingerprint query. Returns a dict keyed by normalize_tag_name().
+        """
+
+        def create(names):
+            self.sudo().create([{
+                'name': name,
+                'color': 2  # Green color for Dubai SME tags
+            } for name in names])
+            _logger.info(f"Created new tags: {', '.join(names)}")
+
+        return resolve_tags(tag_names, self._dubai_sme_tag_ids_by_key, create)
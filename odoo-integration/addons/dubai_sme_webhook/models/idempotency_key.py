@@ -0,0 +1,68 @@
+import logging
+from datetime import timedelta
+
+from odoo import api, fields, models
+
+_logger = logging.getLogger(__name__)
+
+# Default dedup window; override with the system parameter below
+DEFAULT_WINDOW_HOURS = 24
+WINDOW_PARAM = 'dubai_sme_webhook.idempotency_window_hours'
+
+
+class DubaiSMEIdempotencyKey(models.Model):
+    """Idempotency keys of recently received webhook pushes"""
+
+    _name = 'dubai.sme.idempotency.key'
+    _description = 'Dubai SME Webhook Idempotency Key'
+    _log_access = False
+
+    key = fields.Char(required=True)
+    received_at = fields.Datetime(required=True, default=fields.Datetime.now, index=True)
+
+    _sql_constraints = [
+        ('key_unique', 'UNIQUE(key)', 'Idempotency keys must be unique.'),
+    ]
+
+    @api.model
+    def _window(self):
+        hours = self.env['ir.config_parameter'].sudo().get_param(WINDOW_PARAM, DEFAULT_WINDOW_HOURS)
+        return timedelta(hours=float(hours))
+
+    @api.model
+    def _claim(self, keys):
+        """
+        Record keys as seen and return the ones that were not seen in the window
+
+        A single INSERT ... ON CONFLICT makes this atomic across concurrent
+        requests: of two requests carrying the same key, only one gets it back.
+        Keys older than the window are claimed again.
+        """
+        keys = list({key for key in keys if key})
+        if not keys:
+            return set()
+
+        cutoff = fields.Datetime.now() - self._window()
+        self.env.cr.execute("""
+            INSERT INTO dubai_sme_idempotency_key (key, received_at)
+                 SELECT unnest(%s::varchar[]), now() AT TIME ZONE 'UTC'
+            ON CONFLICT (key) DO UPDATE
+                    SET received_at = EXCLUDED.received_at
+                  WHERE dubai_sme_idempotency_key.received_at < %s
+              RETURNING key
+        """, [keys, cutoff])
+        return {row[0] for row in self.env.cr.fetchall()}
+
+    @api.model
+    def _release(self, keys):
+        """Forget keys so a re-push carrying them is accepted again"""
+        keys = list({key for key in keys if key})
+        if keys:
+            self.env.cr.execute("DELETE FROM dubai_sme_idempotency_key WHERE key = ANY(%s)", [keys])
+
+    @api.autovacuum
+    def _gc_expired_keys(self):
+        """Drop keys older than the dedup window"""
+        cutoff = fields.Datetime.now() - self._window()
+        self.env.cr.execute("DELETE FROM dubai_sme_idempotency_key WHERE received_at < %s", [cutoff])
+        _logger.info(f"Purged {self.env.cr.rowcount} expired Dubai SME idempotency key(s)")
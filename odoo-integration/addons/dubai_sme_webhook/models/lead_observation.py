@@ -0,0 +1,18 @@
+from odoo import fields, models
+
+
+class DubaiSMELeadObservation(models.Model):
+    """One sighting of a lead by the Dubai SME Scraper"""
+    
+    _name = 'dubai.sme.lead.observation'
+    _description = 'Dubai SME Lead Observation'
+    _order = 'observed_at desc, id desc'
+    
+    lead_id = fields.Many2one('crm.lead', required=True, ondelete='cascade', index=True)
+    observed_at = fields.Datetime(required=True, default=fields.Datetime.now)
+    first_seen = fields.Boolean()
+    source = fields.Char()
+    search_term = fields.Char()
+    quality_score = fields.Integer()
+    priority = fields.Char()
+    changed_fields = fields.Char(help="Comma-separated lead fields this sighting updated")
@@ -0,0 +1,474 @@
+import logging
+from datetime import datetime
+
+from odoo import fields, models
+from odoo.osv import expression
+
+from .match_keys import index_by_keys, keys_conflict, lead_match_keys, pick_by_keys, record_keys
+from .tag_cache import normalize_tag_name
+
+_logger = logging.getLogger(__name__)
+
+# Map priority to Odoo values
+PRIORITY_MAP = {
+    'URGENT': '3',  # Very High
+    'HIGH': '2',    # High
+    'MEDIUM': '1',  # Medium
+    'LOW': '0'      # Low
+}
+
+# Keys sent by OdooWebhookConnector._format_lead_for_odoo -> scraper CSV keys
+FORMATTED_LEAD_KEYS = {
+    'company_name': 'Name',
+    'industry': 'Category',
+    'phone': 'Phone',
+    'email': 'Email',
+    'website': 'Website',
+    'street': 'Address',
+    'source': 'Data Source',
+    'search_term': 'Search Term',
+    'quality_score': 'Quality Score',
+    'scraped_at': 'Timestamp',
+}
+
+
+class DubaiSMELeadProcessor(models.AbstractModel):
+    """Partner/lead/tag upserts for leads received from the Dubai SME Scraper"""
+    
+    _name = 'dubai.sme.lead.processor'
+    _description = 'Dubai SME Lead Processor'
+    
+    def _coerce_lead(self, lead_data):
+        """Accept both scraper CSV keys and the pre-formatted webhook connector keys"""
+        
+        if lead_data.get('Name') or not lead_data.get('company_name'):
+            return lead_data
+        
+        coerced = {target: lead_data.get(source) for source, target in FORMATTED_LEAD_KEYS.items()}
+        label_by_value = {value: label for label, value in PRIORITY_MAP.items()}
+        coerced['Priority'] = label_by_value.get(str(lead_data.get('priority')), 'MEDIUM')
+        return coerced
+    
+    def _clean_contact_fields(self, lead_data):
+        """Return (phone, email, website) with placeholder values mapped to False"""
+        
+        phone = lead_data.get('Phone', '') if lead_data.get('Phone') not in ['Contact via website', 'Not available', '', None] else False
+        email = lead_data.get('Email', '') if lead_data.get('Email') not in ['Not available', '', None] else False
+        website = lead_data.get('Website', '') if lead_data.get('Website') not in ['Not available', '', None] else False
+        return phone, email, website
+    
+    def _process_lead_data(self, lead_data):
+        """Process and create lead/partner in Odoo"""
+        
+        # Find or create partner
+        partner_id = self._find_or_create_partner(lead_data)
+        
+        # Create CRM lead
+        lead_id = self._create_crm_lead(lead_data, partner_id)
+        
+        return {
+            'status': 'success',
+            'message': f"Lead created successfully for {lead_data.get('Name')}",
+            'lead_id': lead_id,
+            'partner_id': partner_id
+        }
+    
+    def _process_leads(self, leads):
+        """
+        Process a batch of leads set-wise in the current transaction
+        
+        Partners and leads are each prefetched with one query, tags come from
+        the cached crm.tag resolver, and new records are created with one
+        multi-record create per model. If the set-wise pass fails, leads are
+        retried one by one so every lead still gets its own result.
+        """
+        
+        leads = [self._coerce_lead(lead) for lead in leads if isinstance(lead, dict)]
+        
+        try:
+            with self.env.cr.savepoint():
+                results = self._process_leads_setwise(leads)
+        except Exception as e:
+            _logger.warning(f"Set-wise batch failed ({e}), falling back to per-lead processing")
+            results = []
+            for index, lead_data in enumerate(leads):
+                if not lead_data.get('Name'):
+                    results.append({'index': index, 'status': 'error', 'message': 'Company name is required'})
+                    continue
+                try:
+                    with self.env.cr.savepoint():
+                        result = self._process_lead_data(lead_data)
+                    results.append(dict(result, index=index, name=lead_data.get('Name')))
+                except Exception as lead_error:
+                    results.append({'index': index, 'name': lead_data.get('Name'),
+                                    'status': 'error', 'message': str(lead_error)})
+        
+        failed = sum(1 for result in results if result['status'] == 'error')
+        return {
+            'status': 'success' if not failed else ('partial' if failed < len(results) else 'error'),
+            'batch': True,
+            'count': len(results),
+            'created': sum(1 for result in results if result.get('action') == 'created'),
+            'updated': sum(1 for result in results if result.get('action') == 'updated'),
+            'failed': failed,
+            'results': results
+        }
+    
+    def _process_leads_setwise(self, leads):
+        """Upsert partners and leads for a whole batch with a fixed number of queries"""
+        
+        Partner = self.env['res.partner'].sudo()
+        Lead = self.env['crm.lead'].sudo()
+        
+        results = [None] * len(leads)
+        valid = []
+        for index, lead_data in enumerate(leads):
+            if lead_data.get('Name'):
+                valid.append((index, lead_data))
+            else:
+                results[index] = {'index': index, 'status': 'error', 'message': 'Company name is required'}
+        
+        keys_by_index = {index: lead_match_keys(lead_data) for index, lead_data in valid}
+        
+        # 1 query: existing partners matching any phone, domain or name key in the batch
+        partner_index = index_by_keys(
+            Partner.search(self._match_key_domain(keys_by_index.values())) if valid else Partner
+        )
+        
+        # Optional trigram fallback for names that matched nothing exactly (1 query)
+        unmatched_names = [
+            keys['name'] for keys in keys_by_index.values()
+            if keys['name'] and not pick_by_keys(partner_index, keys)
+        ]
+        fuzzy_partners = self._fuzzy_match_partners(unmatched_names)
+        
+        # Update partners that already exist, create the rest in one call
+        partner_by_index = {}
+        new_partner_vals = {}
+        new_partner_indexes = {}
+        for index, lead_data in valid:
+            keys = keys_by_index[index]
+            partner = pick_by_keys(partner_index, keys) or self._fuzzy_partner(fuzzy_partners, keys)
+            if partner:
+                partner.write(self._partner_update_vals(partner, lead_data))
+                partner_by_index[index] = partner
+                continue
+            
+            # Leads of the same business within the batch share one new partner
+            identity = self._strongest_key(keys) or ('index', index)
+            if identity not in new_partner_vals:
+                new_partner_vals[identity] = self._partner_create_vals(lead_data)
+            new_partner_indexes.setdefault(identity, []).append(index)
+        
+        if new_partner_vals:
+            created = Partner.create(list(new_partner_vals.values()))
+            for identity, partner in zip(new_partner_vals.keys(), created):
+                for index in new_partner_indexes[identity]:
+                    partner_by_index[index] = partner
+        
+        # 1 query: existing leads for all of those partners (crm_lead.partner_id is indexed)
+        partner_ids = list({partner.id for partner in partner_by_index.values()})
+        leads_by_partner = {}
+        for lead in Lead.search([('partner_id', 'in', partner_ids)]):
+            leads_by_partner.setdefault(lead.partner_id.id, []).append(lead)
+        
+        # Every tag the new leads need (cached; queries only when tags are new)
+        tag_ids_by_key = self._get_or_create_tags_bulk(
+            name for _, lead_data in valid for name in self._lead_tag_names(lead_data)
+        )
+        
+        new_lead_vals = []
+        new_lead_indexes = []
+        observation_vals = []
+        for index, lead_data in valid:
+            partner = partner_by_index[index]
+            existing_lead = self._match_existing_lead(leads_by_partner.get(partner.id, []), keys_by_index[index])
+            
+            if existing_lead:
+                changed = self._lead_update_vals(existing_lead, lead_data)
+                if changed:
+                    existing_lead.write(changed)
+                observation_vals.append(self._observation_vals(existing_lead.id, lead_data, changed))
+                results[index] = {'index': index, 'name': lead_data['Name'], 'status': 'success',
+                                  'action': 'updated', 'lead_id': existing_lead.id, 'partner_id': partner.id}
+            else:
+                tag_ids = self._tag_ids_for(tag_ids_by_key, self._lead_tag_names(lead_data))
+                new_lead_vals.append(self._lead_create_vals(lead_data, partner.id, tag_ids))
+                new_lead_indexes.append(index)
+        
+        if new_lead_vals:
+            for index, lead in zip(new_lead_indexes, Lead.create(new_lead_vals)):
+                observation_vals.append(self._observation_vals(lead.id, leads[index], first_seen=True))
+                results[index] = {'index': index, 'name': leads[index]['Name'], 'status': 'success',
+                                  'action': 'created', 'lead_id': lead.id, 'partner_id': lead.partner_id.id}
+        
+        # 1 query: one compact history row per sighting
+        if observation_vals:
+            self.env['dubai.sme.lead.observation'].sudo().create(observation_vals)
+        
+        _logger.info(f"Processed Dubai SME batch: {len(new_lead_vals)} created, "
+                     f"{len(valid) - len(new_lead_vals)} updated")
+        return results
+    
+    def _partner_create_vals(self, lead_data):
+        """Values for a new partner created from a lead"""
+        
+        phone, email, website = self._clean_contact_fields(lead_data)
+        return {
+            'name': lead_data.get('Name'),
+            'phone': phone,
+            'email': email,
+            'website': website,
+            'street': lead_data.get('Address', ''),
+            'city': 'Dubai',
+            'country_id': self.env.ref('base.ae').id,  # UAE
+            'is_company': True,
+            'company_type': 'company',
+            'comment': f"Created from Dubai SME Scraper - {lead_data.get('Category', '')}"
+        }
+    
+    def _partner_update_vals(self, partner, lead_data):
+        """Values refreshing an existing partner without erasing known contact details"""
+        
+        phone, email, website = self._clean_contact_fields(lead_data)
+        return {
+            'phone': phone or partner.phone,
+            'email': email or partner.email,
+            'website': website or partner.website,
+            'street': lead_data.get('Address', '') or partner.street,
+            'city': 'Dubai',
+            'comment': f"Updated from Dubai SME Scraper - {lead_data.get('Category', '')}"
+        }
+    
+    def _match_key_domain(self, keys_list):
+        """Domain matching any of the given phone, domain or name keys through their btree indexes"""
+        
+        keys_list = list(keys_list)
+        terms = []
+        for kind in ('phone', 'domain', 'name'):
+            values = list({keys[kind] for keys in keys_list if keys[kind]})
+            if values:
+                terms.append([(f'sme_{kind}_key', 'in', values)])
+        return expression.OR(terms) if terms else expression.FALSE_DOMAIN
+    
+    def _fuzzy_partner(self, fuzzy_partners, keys):
+        """Trigram name match for a lead, unless its phone or domain belongs to another business"""
+        
+        partner = fuzzy_partners.get(keys['name'])
+        if partner and keys_conflict(keys, record_keys(partner)):
+            return None
+        return partner
+    
+    def _strongest_key(self, keys):
+        for kind in ('phone', 'domain', 'name'):
+            if keys[kind]:
+                return (kind, keys[kind])
+        return None
+    
+    def _fuzzy_match_partners(self, name_keys):
+        """
+        Trigram similarity fallback for names without an exact key match
+        
+        Disabled unless the dubai_sme_webhook.fuzzy_name_threshold system
+        parameter is set (e.g. 0.6) and pg_trgm is installed.
+        """
+        
+        threshold = float(self.env['ir.config_parameter'].sudo().get_param(
+            'dubai_sme_webhook.fuzzy_name_threshold', 0) or 0)
+        name_keys = list(set(name_keys))
+        if not threshold or not name_keys:
+            return {}
+        
+        try:
+            with self.env.cr.savepoint():
+                self.env.cr.execute("""
+                    SELECT DISTINCT ON (q.key) q.key, p.id
+                      FROM unnest(%s::varchar[]) AS q(key)
+                      JOIN res_partner p ON p.sme_name_key %% q.key
+                     WHERE similarity(p.sme_name_key, q.key) >= %s
+                     ORDER BY q.key, similarity(p.sme_name_key, q.key) DESC
+                """, [name_keys, threshold])
+                rows = self.env.cr.fetchall()
+        except Exception as e:
+            _logger.warning(f"Fuzzy partner matching unavailable: {e}")
+            return {}
+        
+        Partner = self.env['res.partner'].sudo()
+        return {key: Partner.browse(partner_id) for key, partner_id in rows}
+    
+    def _find_or_create_partner(self, lead_data):
+        """Find existing partner or create new one"""
+        
+        Partner = self.env['res.partner'].sudo()
+        
+        # Search for existing partner by normalized phone, domain or name
+        keys = lead_match_keys(lead_data)
+        partner = pick_by_keys(
+            index_by_keys(Partner.search(self._match_key_domain([keys]))), keys
+        ) or self._fuzzy_partner(self._fuzzy_match_partners([keys['name']] if keys['name'] else []), keys)
+        
+        if partner:
+            # Update existing partner with new info
+            partner.write(self._partner_update_vals(partner, lead_data))
+            _logger.info(f"Updated existing partner: {partner.name}")
+            return partner.id
+        else:
+            # Create new partner
+            partner = Partner.create(self._partner_create_vals(lead_data))
+            _logger.info(f"Created new partner: {partner.name}")
+            return partner.id
+    
+    def _match_existing_lead(self, partner_leads, keys):
+        """Pick the partner's lead for the same business, by phone, domain or name key"""
+        
+        return pick_by_keys(index_by_keys(partner_leads), keys)
+    
+    def _lead_tag_names(self, lead_data):
+        """Tags attached to a new lead"""
+        
+        names = [
+            'Dubai SME Scraper',
+            lead_data.get('Category', 'Business Services'),
+            f"Priority: {lead_data.get('Priority', 'MEDIUM')}",
+            'ERP/Automation Potential'
+        ]
+        return [name for name in names if name and name.strip()]
+    
+    def _lead_current_vals(self, lead_data):
+        """Current contact values a lead keeps in sync with the latest scrape"""
+        
+        phone, email, website = self._clean_contact_fields(lead_data)
+        return {
+            'phone': phone,
+            'email_from': email,
+            'website': website,
+            'street': lead_data.get('Address') or False,
+            'priority': PRIORITY_MAP.get(lead_data.get('Priority', 'MEDIUM'), '1'),
+        }
+    
+    def _lead_update_vals(self, existing_lead, lead_data):
+        """Fields of an existing lead that the new sighting changes (known values are never erased)"""
+        
+        return {
+            field: value for field, value in self._lead_current_vals(lead_data).items()
+            if value and value != existing_lead[field]
+        }
+    
+    def _observation_vals(self, lead_id, lead_data, changed=None, first_seen=False):
+        """History row recording one sighting of a lead by the scraper"""
+        
+        try:
+            quality_score = int(float(lead_data.get('Quality Score') or 0))
+        except (TypeError, ValueError):
+            quality_score = 0
+        
+        return {
+            'lead_id': lead_id,
+            'observed_at': fields.Datetime.now(),
+            'first_seen': first_seen,
+            'source': lead_data.get('Data Source') or False,
+            'search_term': lead_data.get('Search Term') or False,
+            'quality_score': quality_score,
+            'priority': lead_data.get('Priority') or False,
+            'changed_fields': ','.join(sorted(changed)) if changed else False,
+        }
+    
+    def _lead_create_vals(self, lead_data, partner_id, tag_ids):
+        """Values for a new CRM lead/opportunity"""
+        
+        phone, email, website = self._clean_contact_fields(lead_data)
+        return {
+            'name': f"{lead_data.get('Name')} - Dubai SME Lead",
+            'partner_id': partner_id,
+            'type': 'opportunity',
+            'phone': phone,
+            'email_from': email,
+            'website': website,
+            'street': lead_data.get('Address', ''),
+            'city': 'Dubai',
+            'country_id': self.env.ref('base.ae').id,
+            'priority': PRIORITY_MAP.get(lead_data.get('Priority', 'MEDIUM'), '1'),
+            'tag_ids': [(6, 0, tag_ids)],
+            'description': f"""🚀 LEAD FROM DUBAI SME SCRAPER
+
+📊 COMPANY DETAILS:
+• Category: {lead_data.get('Category', 'N/A')}
+• Search Term: {lead_data.get('Search Term', 'N/A')}
+• Quality Score: {lead_data.get('Quality Score', 'N/A')}/10
+• Priority Level: {lead_data.get('Priority', 'MEDIUM')}
+
+📞 CONTACT INFORMATION:
+• Phone: {lead_data.get('Phone', 'N/A')}
+• Email: {lead_data.get('Email', 'N/A')}
+• Website: {lead_data.get('Website', 'N/A')}
+• Address: {lead_data.get('Address', 'N/A')}
+
+🎯 BUSINESS POTENTIAL:
+• ERP Implementation Ready
+• Automation & AI Potential
+• Digital Transformation Candidate
+• SME Scaling Phase
+
+📝 TECHNICAL INFO:
+• Data Source: {lead_data.get('Data Source', 'Dubai SME Scraper')}
+• Scraped At: {lead_data.get('Timestamp', 'N/A')}
+• Import Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+• Processed By: Dubai SME Webhook Automation
+
+💼 NEXT ACTIONS:
+• Schedule discovery call
+• Assess ERP/automation needs  
+• Prepare solution proposal
+• Follow up within 24-48 hours
+""",
+            'user_id': self.env.user.id,
+        }
+    
+    def _create_crm_lead(self, lead_data, partner_id):
+        """Create CRM lead/opportunity"""
+        
+        Lead = self.env['crm.lead'].sudo()
+        
+        # Check if lead already exists for this partner
+        existing_lead = self._match_existing_lead(
+            Lead.search([('partner_id', '=', partner_id)]), lead_match_keys(lead_data)
+        )
+        
+        Observation = self.env['dubai.sme.lead.observation'].sudo()
+        
+        if existing_lead:
+            # Update existing lead with changed current values only
+            changed = self._lead_update_vals(existing_lead, lead_data)
+            if changed:
+                existing_lead.write(changed)
+            Observation.create(self._observation_vals(existing_lead.id, lead_data, changed))
+            _logger.info(f"Updated existing lead: {existing_lead.name}")
+            return existing_lead.id
+        
+        # Get or create tags
+        tag_ids = self._get_or_create_tags(self._lead_tag_names(lead_data))
+        
+        lead = Lead.create(self._lead_create_vals(lead_data, partner_id, tag_ids))
+        Observation.create(self._observation_vals(lead.id, lead_data, first_seen=True))
+        _logger.info(f"Created new lead #{lead.id}: {lead.name}")
+        return lead.id
+    
+    def _get_or_create_tags(self, tag_names):
+        """Get or create CRM tags"""
+        
+        return self._tag_ids_for(self._get_or_create_tags_bulk(tag_names), tag_names)
+    
+    def _get_or_create_tags_bulk(self, tag_names):
+        """Resolve many tag names through the cached crm.tag resolver, keyed by normalized name"""
+        
+        return self.env['crm.tag']._dubai_sme_resolve_tags(tag_names)
+    
+    def _tag_ids_for(self, tag_ids_by_key, tag_names):
+        """Distinct tag ids for names, in order, from a resolved mapping"""
+        
+        tag_ids = []
+        for tag_name in tag_names:
+            tag_id = tag_ids_by_key.get(normalize_tag_name(tag_name))
+            if tag_id and tag_id not in tag_ids:
+                tag_ids.append(tag_id)
+        return tag_ids
@@ -0,0 +1,178 @@
+import json
+import logging
+from datetime import timedelta
+
+from odoo import api, fields, models
+
+_logger = logging.getLogger(__name__)
+
+
+class DubaiSMELeadStaging(models.Model):
+    """Raw webhook payloads waiting to be turned into partners and CRM leads"""
+    
+    _name = 'dubai.sme.lead.staging'
+    _description = 'Dubai SME Lead Staging'
+    _order = 'id'
+    
+    payload = fields.Text(required=True)
+    state = fields.Selection([
+        ('pending', 'Pending'),
+        ('done', 'Done'),
+        ('error', 'Error'),
+    ], default='pending', required=True, index=True)
+    attempts = fields.Integer(default=0)
+    next_attempt_at = fields.Datetime(index=True)
+    error_message = fields.Text()
+    lead_id = fields.Many2one('crm.lead', ondelete='set null')
+    # Idempotency keys claimed for this payload, released if it ends in error
+    idempotency_key = fields.Char()
+    request_key = fields.Char()
+    processed_at = fields.Datetime()
+    
+    # Retry delays (minutes) after the 1st, 2nd, ... failed attempt
+    RETRY_DELAYS = [1, 5, 15, 60]
+    MAX_ATTEMPTS = 5
+    
+    @api.model
+    def enqueue(self, leads, request_key=None):
+        """
+        Store raw lead payloads with one multi-record create and wake the worker
+        
+        Runs with the caller's access rights: the webhook controller and
+        server actions call it through sudo().
+        
+        Args:
+            leads: Lead dicts; their idempotency_key is kept on the row
+            request_key: Idempotency-Key header of the request that carried them
+        """
+        
+        records = self.create([
+            {
+                'payload': json.dumps(lead, ensure_ascii=False, default=str),
+                'idempotency_key': lead.get('idempotency_key') or False,
+                'request_key': request_key or False,
+            }
+            for lead in leads if isinstance(lead, dict)
+        ])
+        
+        # Run the worker as soon as this transaction commits instead of
+        # waiting for the next scheduled tick
+        cron = self.env.ref('dubai_sme_webhook.ir_cron_process_lead_staging', raise_if_not_found=False)
+        if cron:
+            cron.sudo()._trigger()
+        
+        return records
+    
+    @api.model
+    def _claim_pending(self, batch_size):
+        """Lock a batch of due pending rows, skipping rows another worker holds"""
+        
+        self.env.cr.execute("""
+            SELECT id FROM dubai_sme_lead_staging
+             WHERE state = 'pending'
+               AND (next_attempt_at IS NULL OR next_attempt_at <= (now() AT TIME ZONE 'UTC'))
+             ORDER BY id
+             LIMIT %s
+               FOR UPDATE SKIP LOCKED
+        """, [batch_size])
+        return self.browse([row[0] for row in self.env.cr.fetchall()])
+    
+    def _process_claimed(self):
+        """Run the lead processor over claimed rows and record per-row outcomes"""
+        
+        now = fields.Datetime.now()
+        records = self.browse()
+        payloads = []
+        for record in self:
+            try:
+                payload = json.loads(record.payload)
+                error = None if isinstance(payload, dict) else 'expected a JSON object'
+            except ValueError as e:
+                error = str(e)
+            if error:
+                # Retrying cannot fix the payload: fail it on the first attempt
+                _logger.warning(f"Invalid staging payload #{record.id}: {error}")
+                record._record_failure(f"Invalid payload: {error}", now, retry=False)
+                continue
+            records |= record
+            payloads.append(payload)
+        
+        if not records:
+            return {'count': 0, 'failed': 0, 'results': []}
+        summary = self.env['dubai.sme.lead.processor']._process_leads(payloads)
+        results = {result['index']: result for result in summary['results']}
+        
+        for index, record in enumerate(records):
+            result = results.get(index) or {'status': 'error', 'message': 'No result returned'}
+            if result['status'] != 'error':
+                record.write({
+                    'state': 'done',
+                    'lead_id': result.get('lead_id'),
+                    'processed_at': now,
+                    'error_message': False,
+                })
+                continue
+            
+            record._record_failure(result.get('message'), now)
+        
+        return summary
+    
+    def _record_failure(self, message, now=None, retry=True):
+        """Count a failed attempt and schedule the retry, or give up after MAX_ATTEMPTS or when retry is False"""
+        
+        now = now or fields.Datetime.now()
+        for record in self:
+            attempts = record.attempts + 1
+            retry_record = retry and attempts < self.MAX_ATTEMPTS
+            delay = self.RETRY_DELAYS[min(attempts, len(self.RETRY_DELAYS)) - 1]
+            record.write({
+                'state': 'pending' if retry_record else 'error',
+                'attempts': attempts,
+                'next_attempt_at': now + timedelta(minutes=delay) if retry_record else False,
+                'error_message': message,
+                'processed_at': now,
+            })
+        
+        # The lead never reached the CRM: let a later re-push through instead
+        # of answering it as a duplicate
+        failed = self.filtered(lambda record: record.state == 'error')
+        self.env['dubai.sme.idempotency.key'].sudo()._release(
+            failed.mapped('idempotency_key') + failed.mapped('request_key')
+        )
+    
+    @api.model
+    def _cron_process_staging(self, batch_size=200, max_batches=50):
+        """Drain pending payloads in locked batches, committing after each batch"""
+        
+        processed = 0
+        for _ in range(max_batches):
+            batch = self._claim_pending(batch_size)
+            if not batch:
+                break
+            
+            try:
+                batch._process_claimed()
+            except Exception as e:
+                # Should not happen (the processor isolates lead errors), but never
+                # leave claimed rows half-written: roll back and count an attempt
+                self.env.cr.rollback()
+                _logger.exception(f"Dubai SME staging batch failed: {e}")
+                # The backoff keeps the next loop of this run from claiming them again
+                batch = self.browse(batch.ids)
+                batch._record_failure(str(e))
+            
+            self.env.cr.commit()
+            processed += len(batch)
+        
+        if processed:
+            _logger.info(f"Dubai SME staging worker processed {processed} payloads")
+        return processed
+    
+    @api.autovacuum
+    def _gc_done_payloads(self):
+        """Drop processed payloads after a week"""
+        
+        self.search([
+            ('state', '=', 'done'),
+            ('processed_at', '<', fields.Datetime.now() - timedelta(days=7)),
+        ]).unlink()
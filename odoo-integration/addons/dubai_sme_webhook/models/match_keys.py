@@ -0,0 +1,156 @@
+"""
+Normalized match keys for partners and leads
+
+Mirrors odoo-integration/connectors/lead_identity.py so that the scraper
+side and the Odoo side agree on what "the same business" means. The addon
+cannot import the connectors, so the rules are copied;
+odoo-integration/tests/test_match_keys_parity.py runs both copies over the
+same fixtures - change them together.
+"""
+
+import logging
+import re
+from urllib.parse import urlparse
+
+_logger = logging.getLogger(__name__)
+
+# Placeholder values the scrapers write when a contact field is missing
+MISSING_VALUES = {'', 'contact via website', 'not available', 'n/a', 'none', 'null', 'false'}
+
+# Legal-form suffixes dropped before comparing business names
+NAME_SUFFIXES = {
+    'llc', 'fze', 'fzco', 'fzc', 'fz llc', 'dmcc', 'ltd', 'limited',
+    'co', 'company', 'est', 'establishment', 'trading', 'group', 'inc', 'plc'
+}
+
+# Suffix the webhook appends to lead names ("ABC LLC - Dubai SME Lead")
+LEAD_NAME_SUFFIX = re.compile(r'\s+-\s+(dubai\s+sme\s+lead|dubai\s+lead|google\s+maps\s+lead)\s*$', re.I)
+
+
+def _clean(value):
+    if not value:
+        return ''
+    value = str(value).strip().strip('"')
+    return '' if value.lower() in MISSING_VALUES else value
+
+
+def phone_key(phone):
+    """UAE phone number in E.164 (+971XXXXXXXX), '' if unusable"""
+    digits = re.sub(r'\D', '', _clean(phone))
+    if not digits:
+        return ''
+
+    if digits.startswith('00'):
+        digits = digits[2:]
+    elif digits.startswith('0'):
+        digits = '971' + digits[1:]
+    elif not digits.startswith('971') and len(digits) <= 9:
+        digits = '971' + digits
+
+    if len(digits) < 10 or len(digits) > 15:
+        return ''
+    return f'+{digits}'
+
+
+def domain_key(website):
+    """Bare website host without www., '' for missing or shared hosts"""
+    website = _clean(website).lower()
+    if not website:
+        return ''
+
+    if '://' not in website:
+        website = f'http://{website}'
+    host = urlparse(website).hostname or ''
+    if host.startswith('www.'):
+        host = host[4:]
+
+    if not host or '.' not in host or any(
+        shared in host for shared in ('google.', 'facebook.com', 'instagram.com', 'linktr.ee', 'wa.me')
+    ):
+        return ''
+    return host
+
+
+def name_key(name):
+    """Business name slug without punctuation or legal-form suffixes"""
+    name = LEAD_NAME_SUFFIX.sub('', _clean(name))
+    name = name.lower().replace('&', ' and ').replace('.', '')
+    words = re.sub(r'[^a-z0-9\u0600-\u06ff]+', ' ', name).split()
+
+    stripped = list(words)
+    while stripped:
+        if len(stripped) >= 2 and ' '.join(stripped[-2:]) in NAME_SUFFIXES:
+            stripped = stripped[:-2]
+        elif stripped[-1] in NAME_SUFFIXES:
+            stripped = stripped[:-1]
+        else:
+            break
+
+    return '-'.join(stripped or words)
+
+
+def lead_match_keys(lead_data):
+    """Match keys for an incoming scraper lead"""
+    return {
+        'phone': phone_key(lead_data.get('Phone')),
+        'domain': domain_key(lead_data.get('Website')),
+        'name': name_key(lead_data.get('Name')),
+    }
+
+
+def record_keys(record):
+    """Match keys stored on a partner or lead (its sme_*_key fields)"""
+    return {kind: record[f'sme_{kind}_key'] or '' for kind in ('phone', 'domain', 'name')}
+
+
+def keys_conflict(keys, other_keys):
+    """True when both sides carry a phone or website domain key and they differ"""
+    return any(
+        keys[kind] and other_keys[kind] and keys[kind] != other_keys[kind]
+        for kind in ('phone', 'domain')
+    )
+
+
+def index_by_keys(records):
+    """{kind: {key: [records]}} for records carrying sme_*_key fields, in record order"""
+    index = {'phone': {}, 'domain': {}, 'name': {}}
+    for record in records:
+        for kind, key in record_keys(record).items():
+            if key:
+                index[kind].setdefault(key, []).append(record)
+    return index
+
+
+def pick_by_keys(index, keys):
+    """
+    Best match for a lead: same phone, then same website domain, then same name
+
+    A name match is refused when the record's phone or domain conflicts with
+    the lead's, so branches and same-named businesses are not merged.
+    """
+    for kind in ('phone', 'domain'):
+        if keys[kind] and keys[kind] in index[kind]:
+            return index[kind][keys[kind]][0]
+
+    for record in index['name'].get(keys['name'], []) if keys['name'] else []:
+        if not keys_conflict(keys, record_keys(record)):
+            return record
+    return None
+
+
+def create_trigram_index(cr, table, column):
+    """Create a pg_trgm GIN index on table(column) when the extension is available"""
+    cr.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+    if not cr.fetchone():
+        try:
+            with cr.savepoint():
+                cr.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        except Exception as e:
+            _logger.info(f"pg_trgm not available, fuzzy name matching disabled: {e}")
+            return False
+
+    cr.execute(
+        f"CREATE INDEX IF NOT EXISTS {table}_{column}_trgm_idx "
+        f"ON {table} USING gin ({column} gin_trgm_ops)"
+    )
+    return True
@@ -0,0 +1,23 @@
+from odoo import api, fields, models
+
+from .match_keys import create_trigram_index, domain_key, name_key, phone_key
+
+
+class ResPartner(models.Model):
+    _inherit = 'res.partner'
+    
+    sme_name_key = fields.Char(compute='_compute_sme_match_keys', store=True, index=True)
+    sme_phone_key = fields.Char(compute='_compute_sme_match_keys', store=True, index=True)
+    sme_domain_key = fields.Char(compute='_compute_sme_match_keys', store=True, index=True)
+    
+    @api.depends('name', 'phone', 'mobile', 'website')
+    def _compute_sme_match_keys(self):
+        for partner in self:
+            partner.sme_name_key = name_key(partner.name) or False
+            partner.sme_phone_key = phone_key(partner.phone) or phone_key(partner.mobile) or False
+            partner.sme_domain_key = domain_key(partner.website) or False
+    
+    def init(self):
+        super().init()
+        # Optional: lets the webhook fall back to similarity matching on names
+        create_trigram_index(self.env.cr, 'res_partner', 'sme_name_key')
@@ -0,0 +1,83 @@
+"""
+Process-wide crm.tag name -> id cache for the webhook tag resolver
+
+Only uses the standard library so odoo-integration/tests/test_tag_cache.py
+can exercise it without an Odoo server.
+
+The cache is validated against a fingerprint of the crm_tag table (row
+count, latest write_date, highest id), read with one cheap query. Any
+create, rename, archive or delete - in this worker, another worker or a
+rolled back transaction - changes the fingerprint, so tag changes never
+need to flush the registry-wide ORM cache.
+"""
+
+import re
+import threading
+
+
+def normalize_tag_name(name):
+    """Cache key for a tag name: trimmed, inner whitespace collapsed, case-folded"""
+    return re.sub(r'\s+', ' ', (name or '').strip()).casefold()
+
+
+class TagCache:
+    """Normalized tag name -> id per database, rebuilt when the fingerprint changes"""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, dbname, fingerprint, load_tags):
+        """
+        Tag ids for a database
+
+        Args:
+            dbname: Database the tags belong to
+            fingerprint: Current fingerprint of the crm_tag table
+            load_tags: () -> iterable of (id, name) for every tag, called on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(dbname)
+        if entry and entry[0] == fingerprint:
+            return entry[1]
+
+        tag_ids = {}
+        for tag_id, name in load_tags():
+            tag_ids.setdefault(normalize_tag_name(name), tag_id)
+        with self._lock:
+            self._entries[dbname] = (fingerprint, tag_ids)
+        return tag_ids
+
+    def clear(self, dbname=None):
+        with self._lock:
+            if dbname is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(dbname, None)
+
+
+def resolve_tags(tag_names, lookup, create):
+    """
+    Resolve tag names to ids, creating the missing ones in one call
+
+    Args:
+        tag_names: Tag names as received; blank ones are ignored
+        lookup: () -> dict of normalized name -> id for every existing tag
+        create: list of names -> None, creates those tags
+
+    Returns:
+        Dict keyed by normalize_tag_name()
+    """
+    wanted = {}
+    for tag_name in tag_names:
+        key = normalize_tag_name(tag_name)
+        if key:
+            wanted.setdefault(key, tag_name.strip())
+
+    tag_ids = lookup()
+    missing = [name for key, name in wanted.items() if key not in tag_ids]
+    if missing:
+        create(missing)
+        tag_ids = lookup()
+
+    return {key: tag_ids[key] for key in wanted}
@@ -0,0 +1,298 @@
+import asyncio
+import atexit
+import json
+import logging
+import random
+import time
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional
+
+try:
+    import aiohttp
+except ImportError:  # only needed when webhook_settings.async is enabled
+    aiohttp = None
+
+from http_session import RETRY_STATUS_CODES, encode_json_body
+from webhook_crm_connector import OdooWebhookConnector
+
+logger = logging.getLogger(__name__)
+
+# Longest pause taken for a single retry, whatever Retry-After asks for
+MAX_RETRY_DELAY = 60.0
+
+
+class TokenBucket:
+    """Async token bucket: `rate` requests per second with bursts up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(rate, 1))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        if self.rate <= 0:
+            return
+
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds"""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max((parsedate_to_datetime(value) - datetime.now().astimezone()).total_seconds(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class AsyncOdooWebhookConnector(OdooWebhookConnector):
+    """
+    Concurrent Odoo webhook connector built on aiohttp
+
+    Same push_lead / push_leads_batch contract as OdooWebhookConnector, plus
+    push_leads for sending many single-lead POSTs concurrently. Requests are
+    limited to max_in_flight at a time, paced by a token bucket (rate_limit
+    requests per second) and retried with backoff that honours Retry-After.
+
+    The event loop, aiohttp session and limiter live as long as the
+    connector, so connections stay pooled across calls (per-lead pushes
+    included); close() releases them and runs at interpreter exit.
+    """
+
+    def __init__(self, webhook_url: str, auth_header: str = None,
+                 push_settings: Dict = None, webhook_settings: Dict = None):
+        """
+        Initialize async webhook connector
+
+        Args:
+            webhook_url: Odoo webhook URL
+            auth_header: Optional authorization header
+            push_settings: crm_config.json push_settings (max_retries, retry_on_failure, retry_backoff)
+            webhook_settings: crm_config.json webhook_settings; additionally reads
+                rate_limit (requests/sec, 0 = unpaced) and burst
+        """
+        if aiohttp is None:
+            raise ImportError("aiohttp is required for the async webhook connector (pip install aiohttp)")
+
+        super().__init__(webhook_url, auth_header, push_settings=push_settings,
+                         webhook_settings=webhook_settings)
+
+        push_settings = push_settings or {}
+        webhook_settings = webhook_settings or {}
+        self.max_attempts = max(push_settings.get('max_retries', 3), 1)
+        if not push_settings.get('retry_on_failure', True):
+            self.max_attempts = 1
+        self.retry_backoff = push_settings.get('retry_backoff', 1.0)
+        self.rate_limit = float(webhook_settings.get('rate_limit', 10))
+        self.burst = webhook_settings.get('burst')
+
+        self._loop = None
+        self._session = None
+        self._limiter = None
+        self._client_loop = None
+        atexit.register(self.close)
+
+    # ------------------------------------------------------------------
+    # Sync facades
+    # ------------------------------------------------------------------
+
+    def push_lead(self, lead_data: Dict) -> bool:
+        """Push single lead to Odoo via webhook"""
+        return self.push_leads([lead_data])['success'] == 1
+
+    def push_leads(self, leads: List[Dict]) -> Dict:
+        """Push leads as individual POSTs, concurrently"""
+        return self._run(self.push_leads_async(leads))
+
+    def push_leads_batch(self, leads: List[Dict]) -> Dict:
+        """Push leads as batch_size chunks, concurrently"""
+        return self._run(self.push_leads_batch_async(leads))
+
+    def _build_session(self, push_settings: Dict = None):
+        """Requests go through the aiohttp session of _client(), not a requests.Session"""
+        return None
+
+    def _run(self, coroutine):
+        """Run a coroutine on the connector's own long-lived event loop"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+            return self._loop.run_until_complete(coroutine)
+        coroutine.close()
+        raise RuntimeError("Called from a running event loop; await the *_async method instead")
+
+    def close(self):
+        """Close the pooled session and the event loop"""
+        if self._session is not None and not self._session.closed:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(self._close_session(self._session, self._client_loop))
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.close()
+        self._session = None
+        self._limiter = None
+
+    # ------------------------------------------------------------------
+    # Async API
+    # ------------------------------------------------------------------
+
+    async def push_leads_async(self, leads: List[Dict]) -> Dict:
+        """Push leads one per POST; returns success/failed counts and per-lead delivered flags"""
+        session, limiter = await self._client()
+        outcomes = await asyncio.gather(*[
+            self._send(session, limiter, self._format_lead_for_odoo(lead), 1)
+            for lead in leads
+        ])
+
+        delivered = [not outcome['failed'] for outcome in outcomes]
+        success = sum(delivered)
+        logger.info(f"✓ Pushed {success}/{len(leads)} leads to Odoo webhook")
+        return {"success": success, "failed": len(leads) - success, "delivered": delivered}
+
+    async def push_leads_batch_async(self, leads: List[Dict]) -> Dict:
+        """Push leads in batch_size chunks; returns counts and a per-chunk report"""
+        chunks = [leads[start:start + self.batch_size]
+                  for start in range(0, len(leads), self.batch_size)]
+
+        session, limiter = await self._client()
+        reports = await asyncio.gather(*[
+            self._send(session, limiter, {
+                "leads": [self._format_lead_for_odoo(lead) for lead in chunk],
+                "batch": True,
+                "count": len(chunk),
+                "timestamp": datetime.now().isoformat()
+            }, len(chunk))
+            for chunk in chunks
+        ])
+
+        for index, report in enumerate(reports):
+            report.update({"chunk": index + 1, "size": len(chunks[index])})
+
+        results = {
+            "success": sum(report["success"] for report in reports),
+            "failed": sum(report["failed"] for report in reports),
+            "chunks": reports
+        }
+        logger.info(f"✓ Batch push: {results['success']} sent, {results['failed']} failed "
+                    f"across {len(chunks)} chunk(s) of up to {self.batch_size}")
+        return results
+
+    async def _client(self):
+        """
+        Pooled session plus (semaphore, token bucket) limiter, created on first use
+
+        Both are bound to the loop that created them; awaiting the *_async
+        methods from another loop closes the previous session and creates a
+        fresh pair for that loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._client_loop is not loop:
+            if self._session is not None and not self._session.closed:
+                # Release its pooled connections instead of leaking them with the old loop
+                await self._close_session(self._session, self._client_loop)
+            self._client_loop = loop
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                connector=aiohttp.TCPConnector(limit=self.max_in_flight,
+                                               ssl=None if self.verify_ssl else False)
+            )
+            self._limiter = (asyncio.Semaphore(self.max_in_flight),
+                             TokenBucket(self.rate_limit, self.burst))
+        return self._session, self._limiter
+
+    @staticmethod
+    async def _close_session(session, loop):
+        """Close an aiohttp session on the loop its connections belong to"""
+        if loop is asyncio.get_running_loop() or loop.is_closed():
+            # Nothing runs on a closed loop anymore: closing from here drops the pool,
+            # its sockets are released when the transports are collected
+            await session.close()
+        elif loop.is_running():
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(session.close(), loop))
+        else:
+            # An idle loop, e.g. the one behind the sync facades
+            await asyncio.to_thread(loop.run_until_complete, session.close())
+
+    async def _post(self, session, payload: Dict):
+        """POST a payload, compressed when configured; returns (status, text, headers)"""
+        encoding = self.compression
+        body, headers = encode_json_body(payload, encoding, self.compress_min_bytes)
+        headers.update(self._idempotency_headers(payload))
+        async with session.post(self.webhook_url, data=body, headers=headers) as response:
+            status, text, response_headers = response.status, await response.text(), response.headers
+
+        # Endpoints without decompression support answer 415: stop compressing
+        if status == 415 and 'Content-Encoding' in headers:
+            logger.warning(f"Webhook does not accept {encoding} bodies, sending uncompressed from now on")
+            self.compression = ''
+            return await self._post(session, payload)
+        return status, text, response_headers
+
+    async def _send(self, session, limiter, payload: Dict, size: int) -> Dict:
+        """POST one payload with pacing and retries; returns its outcome"""
+        semaphore, bucket = limiter
+        error = None
+        status = None
+
+        for attempt in range(1, self.max_attempts + 1):
+            delay = None
+            async with semaphore:
+                await bucket.acquire()
+                try:
+                    status, text, headers = await self._post(session, payload)
+                    if status in (200, 201, 202):
+                        try:
+                            rejected = self._rejected_count(json.loads(text))
+                        except ValueError:
+                            rejected = 0
+                        return {"success": size - rejected, "failed": rejected,
+                                "status": status, "error": None, "attempts": attempt}
+                    if status == 422:
+                        # Every lead was rejected: resending would not change that
+                        logger.error(f"Odoo webhook rejected all {size} lead(s): {text[:200]}")
+                        return {"success": 0, "failed": size, "status": status,
+                                "error": None, "attempts": attempt}
+
+                    error = text[:200] or f"HTTP {status}"
+                    if status not in RETRY_STATUS_CODES:
+                        break
+                    delay = retry_after_seconds(headers.get('Retry-After'))
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    error = str(e) or e.__class__.__name__
+
+            if attempt < self.max_attempts:
+                # Sleep outside the semaphore so other requests keep flowing
+                if delay is None:
+                    delay = self.retry_backoff * (2 ** (attempt - 1)) + random.uniform(0, 0.5)
+                await asyncio.sleep(min(delay, MAX_RETRY_DELAY))
+
+        logger.error(f"Odoo webhook push failed after {attempt} attempt(s): {error}")
+        return {"success": 0, "failed": size, "status": status, "error": error, "attempts": attempt}
+
+
+def get_async_webhook_connector(webhook_url: str, auth_header: str = None,
+                                push_settings: Dict = None,
+                                webhook_settings: Dict = None) -> AsyncOdooWebhookConnector:
+    """Factory function to get async webhook connector"""
+    return AsyncOdooWebhookConnector(webhook_url, auth_header, push_settings=push_settings,
+                                     webhook_settings=webhook_settings)
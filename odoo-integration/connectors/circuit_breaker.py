@@ -0,0 +1,192 @@
+import logging
+import time
+from typing import Dict, List
+
+from lead_outbox import LeadOutbox, OutboxConnector
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker
+
+    Closed: requests flow. After failure_threshold consecutive failures it
+    opens and refuses requests for reset_timeout seconds, then lets a single
+    probe through (half-open). A successful probe closes it, a failed one
+    opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60):
+        self.failure_threshold = max(failure_threshold, 1)
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.times_opened = 0
+
+    def allow_request(self) -> bool:
+        """Whether a request may be sent now"""
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = HALF_OPEN
+            logger.info("Circuit half-open, probing the CRM endpoint")
+            return True
+        return self.state == CLOSED
+
+    def record_success(self) -> bool:
+        """Record a successful request; returns True when this closed the circuit"""
+        reopened = self.state != CLOSED
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        if reopened:
+            logger.info("✓ Circuit closed, CRM endpoint recovered")
+        return reopened
+
+    def record_failure(self):
+        """Record a failed request, opening the circuit at the threshold"""
+        self.consecutive_failures += 1
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self.times_opened += 1
+                logger.warning(f"⚡ Circuit open after {self.consecutive_failures} consecutive failure(s), "
+                               f"next probe in {self.reset_timeout}s")
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+
+class CircuitBreakerConnector:
+    """
+    Wraps an OutboxConnector with a CircuitBreaker
+
+    While the circuit is open leads are only spooled to the outbox, so an
+    outage costs no timeouts. When a probe succeeds the spool is drained.
+    """
+
+    def __init__(self, connector: OutboxConnector, breaker: CircuitBreaker):
+        self.connector = connector
+        self.outbox = connector.outbox
+        self.breaker = breaker
+        self.spooled = 0
+
+    def __getattr__(self, name):
+        if name == 'connector':
+            raise AttributeError(name)
+        return getattr(self.connector, name)
+
+    def push_lead(self, lead_data: Dict) -> bool:
+        """Push a single lead, or spool it while the circuit is open"""
+        if not self.breaker.allow_request():
+            self._spool([lead_data])
+            return False
+
+        try:
+            pushed = self.connector.push_lead(lead_data)
+        except Exception as e:
+            logger.error(f"Error pushing to CRM: {e}")
+            pushed = False
+
+        self._record(pushed)
+        return pushed
+
+    def push_leads_batch(self, leads: List[Dict]) -> Dict:
+        """
+        Spool leads, then send them chunk by chunk while the circuit allows
+
+        Each chunk counts as one request for the breaker, so an outage stops
+        the batch after failure_threshold chunks and the rest stays spooled.
+        """
+        keys = list(dict.fromkeys(self.outbox.enqueue(leads)))
+        results = {"success": 0, "failed": 0}
+
+        while self.breaker.allow_request():
+            chunk = self.connector.drain(limit=self.connector.batch_size, keys=keys)
+            if not chunk['success'] and not chunk['failed']:
+                break
+            results["success"] += chunk['success']
+            results["failed"] += chunk['failed']
+            self._record(chunk['success'] > 0 or not chunk['failed'])
+
+        results["undelivered"] = self.outbox.undelivered()
+        if self.breaker.state != CLOSED:
+            logger.info(f"📮 Circuit {self.breaker.state}, {results['undelivered']} lead(s) left spooled")
+        return results
+
+    def stats(self) -> Dict:
+        """Circuit state and spool depth for the run stats"""
+        return {
+            "circuit": self.breaker.state,
+            "consecutive_failures": self.breaker.consecutive_failures,
+            "times_opened": self.breaker.times_opened,
+            "spooled": self.spooled,
+            "spool_depth": self.outbox.undelivered()
+        }
+
+    def _spool(self, leads: List[Dict]):
+        self.outbox.enqueue(leads)
+        self.spooled += len(leads)
+        logger.info(f"📮 Circuit open, spooled {len(leads)} lead(s) to the CRM outbox")
+
+    def _record(self, succeeded: bool):
+        if not succeeded:
+            self.breaker.record_failure()
+            return
+
+        if self.breaker.record_success():
+            self._drain_spool()
+
+    def _drain_spool(self) -> Dict:
+        """
+        Send the spool after recovery, one batch_size chunk per breaker request
+
+        Stops at the first chunk with failures, so a backlog built up during
+        the outage does not hit an endpoint that is still struggling, and a
+        relapse counts towards reopening the circuit.
+        """
+        results = {"success": 0, "failed": 0}
+        while self.breaker.allow_request():
+            # The backoff of leads that failed during the outage no longer applies
+            chunk = self.connector.drain(limit=self.connector.batch_size, ignore_schedule=True)
+            if not chunk['success'] and not chunk['failed']:
+                break
+            results["success"] += chunk['success']
+            results["failed"] += chunk['failed']
+
+            if chunk['failed']:
+                self.breaker.record_failure()
+                break
+            self.breaker.record_success()
+
+        results["undelivered"] = self.outbox.undelivered()
+        logger.info(f"📮 Drained spool: {results['success']} delivered, {results['failed']} failed, "
+                    f"{results['undelivered']} still undelivered")
+        return results
+
+
+def with_circuit_breaker(connector, push_settings: Dict = None):
+    """
+    Wrap a connector in a CircuitBreakerConnector per push_settings.circuit_breaker
+
+    The connector is put behind an outbox first (push_settings.outbox_path,
+    default 'results/.crm_outbox.db') so there is somewhere to spool to.
+    """
+    push_settings = push_settings or {}
+    settings = push_settings.get('circuit_breaker', {})
+    if settings.get('enabled', True) is False:
+        return connector
+
+    if not isinstance(connector, OutboxConnector):
+        connector = OutboxConnector(connector, LeadOutbox(
+            push_settings.get('outbox_path') or 'results/.crm_outbox.db',
+            max_attempts=push_settings.get('outbox_max_attempts', 5),
+            lease_timeout=push_settings.get('outbox_lease_timeout', 300)
+        ))
+
+    return CircuitBreakerConnector(connector, CircuitBreaker(
+        failure_threshold=settings.get('failure_threshold', 5),
+        reset_timeout=settings.get('reset_timeout', 60)
+    ))
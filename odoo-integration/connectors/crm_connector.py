@@ -2,6 +2,7 @@ import requests
 import logging
 from typing import Dict, List
 import json
+from http_session import build_session
 
 logger = logging.getLogger(__name__)
 
@@ -19,17 +20,21 @@ class CRMConnector:
 class GenericWebhookConnector(CRMConnector):
     """Generic webhook connector for Odoo and other CRMs"""
     
-    def __init__(self, webhook_url: str, auth_header: str = None):
+    def __init__(self, webhook_url: str, auth_header: str = None,
+                 push_settings: Dict = None, session: requests.Session = None):
         self.webhook_url = webhook_url
         self.headers = {"Content-Type": "application/json"}
         
         if auth_header:
             self.headers["Authorization"] = auth_header
+        
+        # Pooled keep-alive session reused for every push
+        self.session = session or build_session(push_settings)
     
     def push_lead(self, lead_data: Dict) -> bool:
         """Push single lead via webhook"""
         try:
-            response = requests.post(self.webhook_url, headers=self.headers, json=lead_data, timeout=30)
+            response = self.session.post(self.webhook_url, headers=self.headers, json=lead_data, timeout=30)
             
             if response.status_code in [200, 201, 202]:
                 logger.info(f"✓ Pushed via webhook: {lead_data.get('Name')}")
@@ -46,7 +51,7 @@ class GenericWebhookConnector(CRMConnector):
         """Push multiple leads via webhook"""
         try:
             payload = {"leads": leads, "batch": True, "count": len(leads)}
-            response = requests.post(self.webhook_url, headers=self.headers, json=payload, timeout=60)
+            response = self.session.post(self.webhook_url, headers=self.headers, json=payload, timeout=60)
             
             if response.status_code in [200, 201, 202]:
                 logger.info(f"✓ Pushed {len(leads)} leads via webhook batch")
@@ -68,12 +73,14 @@ def get_crm_connector(crm_type: str, **credentials):
             url=credentials.get('url'),
             db=credentials.get('db'),
             username=credentials.get('username'),
-            password=credentials.get('password')
+            password=credentials.get('password'),
+            state_path=credentials.get('state_path')
         )
     elif crm_type.lower() == 'webhook':
         return GenericWebhookConnector(
             webhook_url=credentials.get('webhook_url'),
-            auth_header=credentials.get('auth_header')
+            auth_header=credentials.get('auth_header'),
+            push_settings=credentials.get('push_settings')
         )
     
     raise ValueError(f"Unsupported CRM type: {crm_type}")
@@ -234,17 +241,21 @@ class ZohoCRMConnector(CRMConnector):
 class GenericWebhookConnector(CRMConnector):
     """Generic webhook connector for custom CRMs"""
     
-    def __init__(self, webhook_url: str, auth_header: str = None):
+    def __init__(self, webhook_url: str, auth_header: str = None,
+                 push_settings: Dict = None, session: requests.Session = None):
         self.webhook_url = webhook_url
         self.headers = {"Content-Type": "application/json"}
         
         if auth_header:
             self.headers["Authorization"] = auth_header
+        
+        # Pooled keep-alive session reused for every push
+        self.session = session or build_session(push_settings)
     
     def push_lead(self, lead_data: Dict) -> bool:
         """Push single lead via webhook"""
         try:
-            response = requests.post(self.webhook_url, headers=self.headers, json=lead_data)
+            response = self.session.post(self.webhook_url, headers=self.headers, json=lead_data)
             
             if response.status_code in [200, 201, 202]:
                 logger.info(f"✓ Pushed via webhook: {lead_data.get('Name')}")
@@ -260,7 +271,7 @@ class GenericWebhookConnector(CRMConnector):
     def push_leads_batch(self, leads: List[Dict]) -> Dict:
         """Push multiple leads via webhook"""
         try:
-            response = requests.post(self.webhook_url, headers=self.headers, json={"leads": leads})
+            response = self.session.post(self.webhook_url, headers=self.headers, json={"leads": leads})
             
             if response.status_code in [200, 201, 202]:
                 logger.info(f"✓ Pushed {len(leads)} leads via webhook")
@@ -283,7 +294,8 @@ def get_crm_connector(crm_type: str, **credentials):
             url=credentials.get('url'),
             db=credentials.get('db'),
             username=credentials.get('username'),
-            password=credentials.get('password')
+            password=credentials.get('password'),
+            state_path=credentials.get('state_path')
         )
     
     connectors = {
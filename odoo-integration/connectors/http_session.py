@@ -0,0 +1,118 @@
+import gzip
+import json
+import logging
+from typing import Dict, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional, gzip is always available
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Responses worth retrying: rate limiting and transient server/gateway errors
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Content-Encoding values the dubai_sme_webhook controller can decode
+SUPPORTED_ENCODINGS = ('gzip', 'zstd')
+
+
+def build_retry(push_settings: Dict = None) -> Retry:
+    """
+    urllib3 retry policy from crm_config.json push_settings
+
+    POSTs are only retried when the connection could not be opened (nothing
+    was sent). Failed lead pushes are resent one layer up - chunk_retries,
+    the lead outbox and the circuit breaker - so a flaky webhook is not hit
+    by both layers' retries at once.
+    """
+    push_settings = push_settings or {}
+
+    # max_retries counts attempts in push_settings; urllib3 counts retries after the first
+    retries = max(push_settings.get('max_retries', 3) - 1, 0)
+    if not push_settings.get('retry_on_failure', True):
+        retries = 0
+
+    return Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=push_settings.get('retry_backoff', 1.0),
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=frozenset(['GET']),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+
+
+def build_session(push_settings: Dict = None, pool_size: int = 10, headers: Dict = None) -> requests.Session:
+    """
+    Create a keep-alive requests.Session shared by a connector
+
+    Args:
+        push_settings: crm_config.json push_settings (max_retries, retry_on_failure, retry_backoff)
+        pool_size: Connections kept open per host
+        headers: Default headers sent with every request
+
+    Returns:
+        Session whose connections are reused across pushes
+    """
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=build_retry(push_settings)
+    )
+
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({'Connection': 'keep-alive'})
+    if headers:
+        session.headers.update(headers)
+
+    return session
+
+
+def resolve_compression(compression: str) -> str:
+    """Content-Encoding to use for a configured compression, '' for none"""
+    compression = (compression or '').lower()
+    if compression in ('', 'none', 'identity'):
+        return ''
+    if compression not in SUPPORTED_ENCODINGS:
+        logger.warning(f"Unknown compression '{compression}', sending uncompressed bodies")
+        return ''
+    if compression == 'zstd' and zstandard is None:
+        logger.warning("zstandard is not installed, falling back to gzip")
+        return 'gzip'
+    return compression
+
+
+def encode_json_body(payload, encoding: str = '', min_bytes: int = 1024) -> Tuple[bytes, Dict]:
+    """
+    Serialize a JSON payload, compressing it when it is worth it
+
+    Args:
+        payload: JSON-serializable request payload
+        encoding: 'gzip', 'zstd' or '' (see resolve_compression)
+        min_bytes: Bodies smaller than this are sent as-is
+
+    Returns:
+        (body, headers) where headers carries Content-Type and any Content-Encoding
+    """
+    body = json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8')
+    headers = {'Content-Type': 'application/json'}
+
+    if not encoding or len(body) < min_bytes:
+        return body, headers
+
+    if encoding == 'zstd':
+        body = zstandard.ZstdCompressor(level=3).compress(body)
+    else:
+        body = gzip.compress(body, compresslevel=6)
+    headers['Content-Encoding'] = encoding
+    return body, headers
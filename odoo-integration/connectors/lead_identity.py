@@ -0,0 +1,181 @@
+import hashlib
+import json
+import re
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+# Placeholder values the scrapers write when a contact field is missing
+MISSING_VALUES = {'', 'contact via website', 'not available', 'n/a', 'none', 'null'}
+
+# Legal-form suffixes dropped before comparing business names
+NAME_SUFFIXES = {
+    'llc', 'fze', 'fzco', 'fzc', 'fz llc', 'dmcc', 'ltd', 'limited',
+    'co', 'company', 'est', 'establishment', 'trading', 'group', 'inc', 'plc'
+}
+
+EXTERNAL_ID_MODULE = 'dubai_sme_scraper'
+
+# Timestamp and provenance fields that change between pushes without the lead itself changing
+VOLATILE_FIELDS = {'Timestamp', 'timestamp', 'scraped_at', 'created_at', 'Import Date', 'Import Source'}
+
+
+def clean_value(value) -> str:
+    """Return a stripped string, or '' for missing/placeholder values"""
+    if value is None:
+        return ''
+    value = str(value).strip().strip('"')
+    return '' if value.lower() in MISSING_VALUES else value
+
+
+def normalize_phone(phone) -> str:
+    """Normalize a UAE phone number to E.164 (+971XXXXXXXX), '' if unusable"""
+    digits = re.sub(r'\D', '', clean_value(phone))
+    if not digits:
+        return ''
+
+    if digits.startswith('00'):
+        digits = digits[2:]
+    elif digits.startswith('0'):
+        digits = '971' + digits[1:]
+    elif not digits.startswith('971') and len(digits) <= 9:
+        digits = '971' + digits
+
+    # Local UAE numbers are 8-9 digits after the country code
+    if len(digits) < 10 or len(digits) > 15:
+        return ''
+    return f'+{digits}'
+
+
+def website_domain(website) -> str:
+    """Extract the bare registrable host from a website URL, '' if unusable"""
+    website = clean_value(website).lower()
+    if not website:
+        return ''
+
+    if '://' not in website:
+        website = f'http://{website}'
+    host = urlparse(website).hostname or ''
+    if host.startswith('www.'):
+        host = host[4:]
+
+    # Maps and social profiles are shared hosts, not business identities
+    if not host or '.' not in host or any(
+        shared in host for shared in ('google.', 'facebook.com', 'instagram.com', 'linktr.ee', 'wa.me')
+    ):
+        return ''
+    return host
+
+
+def normalize_name(name) -> str:
+    """Reduce a business name to a comparable slug without legal-form suffixes"""
+    name = clean_value(name).lower().replace('&', ' and ').replace('.', '')
+    words = re.sub(r'[^a-z0-9\u0600-\u06ff]+', ' ', name).split()
+
+    stripped = list(words)
+    while stripped:
+        if len(stripped) >= 2 and ' '.join(stripped[-2:]) in NAME_SUFFIXES:
+            stripped = stripped[:-2]
+        elif stripped[-1] in NAME_SUFFIXES:
+            stripped = stripped[:-1]
+        else:
+            break
+
+    # A name made only of suffixes ("Trading Co") is its own identity
+    words = stripped or words
+    return '-'.join(words)
+
+
+def identity_keys(lead_data: Dict) -> List[Tuple[str, str]]:
+    """
+    Every identity key a lead carries, strongest first
+
+    Order: Google Maps place ID, E.164 phone, website domain, name slug.
+    """
+    keys = []
+    place_id = clean_value(lead_data.get('Place ID') or lead_data.get('placeId'))
+    if place_id:
+        keys.append(('place', place_id))
+
+    phone = normalize_phone(lead_data.get('Phone'))
+    if phone:
+        keys.append(('phone', phone))
+
+    domain = website_domain(lead_data.get('Website'))
+    if domain:
+        keys.append(('domain', domain))
+
+    name = normalize_name(lead_data.get('Name'))
+    if name:
+        keys.append(('name', name))
+
+    return keys
+
+
+def canonical_identity(lead_data: Dict) -> Optional[Tuple[str, str]]:
+    """
+    Pick the strongest available identity key for a lead
+
+    Returns (kind, value) or None when the lead carries no usable identity.
+    """
+    keys = identity_keys(lead_data)
+    return keys[0] if keys else None
+
+
+def _key_hash(kind: str, value: str) -> str:
+    return hashlib.sha1(f'{kind}:{value}'.encode('utf-8')).hexdigest()[:24]
+
+
+def identity_hash(lead_data: Dict) -> Optional[str]:
+    """Deterministic hex digest of a lead's canonical identity"""
+    identity = canonical_identity(lead_data)
+    if not identity:
+        return None
+    return _key_hash(*identity)
+
+
+def external_id_name(lead_data: Dict, prefix: str) -> Optional[str]:
+    """ir.model.data name for a lead's record of the given kind ('partner' or 'lead')"""
+    digest = identity_hash(lead_data)
+    return f'{prefix}_{digest}' if digest else None
+
+
+def external_id_names(lead_data: Dict, prefix: str) -> List[Tuple[str, str]]:
+    """
+    (kind, ir.model.data name) for every identity key of a lead, strongest first
+
+    A record is bound to all of them, so it is still found after the lead
+    gains a stronger key (e.g. a phone number) on a later scrape.
+    """
+    return [(kind, f'{prefix}_{_key_hash(kind, value)}') for kind, value in identity_keys(lead_data)]
+
+
+def contacts_conflict(lead_data: Dict, phone, website) -> bool:
+    """
+    True when a lead and a record disagree on phone or website domain
+
+    Only values present on both sides count, so a name match between a lead
+    and a record missing a phone is not treated as a conflict.
+    """
+    lead_phone, other_phone = normalize_phone(lead_data.get('Phone')), normalize_phone(phone)
+    lead_domain, other_domain = website_domain(lead_data.get('Website')), website_domain(website)
+    return bool((lead_phone and other_phone and lead_phone != other_phone) or
+                (lead_domain and other_domain and lead_domain != other_domain))
+
+
+def idempotency_key(lead_data: Dict) -> str:
+    """
+    Deterministic key of a lead push: canonical identity plus content digest
+
+    Re-sending the same lead with the same content yields the same key, so the
+    Odoo controller can drop repeats; any content change yields a new key.
+    """
+    content = {key: value for key, value in lead_data.items() if key not in VOLATILE_FIELDS}
+    digest = hashlib.sha256(
+        json.dumps(content, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8')
+    ).hexdigest()[:16]
+    return f'{identity_hash(lead_data) or "anon"}-{digest}'
+
+
+def batch_idempotency_key(keys: List[str]) -> str:
+    """Idempotency key of a batch POST made of leads with the given keys"""
+    return 'batch-' + hashlib.sha256('\n'.join(keys).encode('utf-8')).hexdigest()[:40]
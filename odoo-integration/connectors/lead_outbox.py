@@ -0,0 +1,345 @@
+import json
+import logging
+import os
+import sqlite3
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from lead_identity import identity_hash
+from push_state import content_hash
+
+logger = logging.getLogger(__name__)
+
+PENDING = 'pending'
+IN_FLIGHT = 'in_flight'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+
+# Seconds to wait before re-sending a failed lead, by attempt number
+RETRY_DELAYS = [30, 120, 600, 1800, 3600]
+
+
+class LeadOutbox:
+    """
+    Durable SQLite outbox of leads waiting to be pushed to the CRM
+
+    Every lead is written here before it is sent, keyed by its canonical
+    identity, and moves pending -> in_flight -> succeeded | failed. Failed
+    leads are retried with backoff until max_attempts, after which they stay
+    failed until reset_failed() is called. A claim is a lease: a lead left
+    in_flight longer than lease_timeout (its sender crashed) is claimable again.
+    """
+
+    def __init__(self, db_path: str, max_attempts: int = 5, lease_timeout: int = 300):
+        """
+        Open (or create) the outbox
+
+        Args:
+            db_path: SQLite file path, e.g. 'results/.crm_outbox.db'
+            max_attempts: Sends per lead before it is left in state failed
+            lease_timeout: Seconds after which an in_flight lead is considered abandoned
+        """
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+        self.lease_timeout = lease_timeout
+        # Autocommit; multi-statement updates use explicit BEGIN IMMEDIATE
+        self.conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS outbox (
+                lead_key TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                state TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                next_attempt_at REAL NOT NULL DEFAULT 0,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+        """)
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS outbox_state_due ON outbox (state, next_attempt_at)"
+        )
+
+    @staticmethod
+    def lead_key(lead_data: Dict) -> str:
+        """Outbox key of a lead: its identity hash, or a content hash without one"""
+        return identity_hash(lead_data) or content_hash(lead_data)[:24]
+
+    def enqueue(self, leads: List[Dict]) -> List[str]:
+        """
+        Record leads as pending
+
+        A lead already in the outbox with identical content is left alone, so a
+        failed lead keeps its attempts and backoff and still ends up dead after
+        max_attempts. Changed content resets it to pending with fresh attempts.
+
+        Returns:
+            Keys of the leads, in input order
+        """
+        now = datetime.now().isoformat()
+        keys = []
+        rows = []
+        for lead in leads:
+            key = self.lead_key(lead)
+            keys.append(key)
+            rows.append((key, json.dumps(lead, ensure_ascii=False, default=str), content_hash(lead), now, now))
+
+        self.conn.execute("BEGIN IMMEDIATE")
+        self.conn.executemany("""
+            INSERT INTO outbox (lead_key, payload, content_hash, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (lead_key) DO UPDATE SET
+                payload = excluded.payload,
+                content_hash = excluded.content_hash,
+                state = 'pending',
+                attempts = 0,
+                last_error = NULL,
+                next_attempt_at = 0,
+                updated_at = excluded.updated_at
+            WHERE outbox.content_hash != excluded.content_hash
+        """, rows)
+        self.conn.execute("COMMIT")
+        return keys
+
+    def claim(self, limit: int, keys: List[str] = None, ignore_schedule: bool = False) -> List[Tuple[str, Dict]]:
+        """
+        Move up to `limit` due leads to in_flight and return them
+
+        Args:
+            limit: Maximum number of leads to claim
+            keys: Only claim among these lead keys
+            ignore_schedule: Also claim failed leads whose retry is not due yet
+
+        Returns:
+            List of (lead_key, lead_data)
+        """
+        query = """
+            SELECT lead_key, payload FROM outbox
+            WHERE ((state = 'pending' OR (state = 'failed' AND attempts < ?)) AND next_attempt_at <= ?
+                   OR (state = 'in_flight' AND updated_at < ? AND attempts < ?))
+        """
+        lease_cutoff = datetime.fromtimestamp(time.time() - self.lease_timeout).isoformat()
+        params = [self.max_attempts, float('inf') if ignore_schedule else time.time(),
+                  lease_cutoff, self.max_attempts]
+        if keys is not None:
+            if not keys:
+                return []
+            query += f" AND lead_key IN ({','.join('?' * len(keys))})"
+            params.extend(keys)
+        query += " ORDER BY next_attempt_at, created_at LIMIT ?"
+        params.append(limit)
+
+        self.conn.execute("BEGIN IMMEDIATE")
+        rows = self.conn.execute(query, params).fetchall()
+        self.conn.executemany(
+            "UPDATE outbox SET state = 'in_flight', attempts = attempts + 1, updated_at = ? WHERE lead_key = ?",
+            [(datetime.now().isoformat(), key) for key, _ in rows]
+        )
+        self.conn.execute("COMMIT")
+        return [(key, json.loads(payload)) for key, payload in rows]
+
+    def state(self, key: str) -> Optional[str]:
+        """Current state of a lead, None when it is not in the outbox"""
+        row = self.conn.execute("SELECT state FROM outbox WHERE lead_key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def mark_succeeded(self, keys: List[str]):
+        """Record leads as delivered"""
+        self.conn.executemany(
+            "UPDATE outbox SET state = 'succeeded', last_error = NULL, updated_at = ? WHERE lead_key = ?",
+            [(datetime.now().isoformat(), key) for key in keys]
+        )
+
+    def mark_failed(self, keys: List[str], error: str = None):
+        """Record a failed send and schedule the next attempt"""
+        now = datetime.now().isoformat()
+        self.conn.execute("BEGIN IMMEDIATE")
+        for key in keys:
+            row = self.conn.execute("SELECT attempts FROM outbox WHERE lead_key = ?", (key,)).fetchone()
+            attempts = row[0] if row else 1
+            delay = RETRY_DELAYS[min(attempts, len(RETRY_DELAYS)) - 1]
+            self.conn.execute(
+                "UPDATE outbox SET state = 'failed', last_error = ?, next_attempt_at = ?, updated_at = ? "
+                "WHERE lead_key = ?",
+                ((error or '')[:500], time.time() + delay, now, key)
+            )
+        self.conn.execute("COMMIT")
+
+    def recover_in_flight(self, older_than: int = 300) -> int:
+        """Return leads stuck in_flight (e.g. after a crash) to pending"""
+        cutoff = datetime.fromtimestamp(time.time() - older_than).isoformat()
+        cursor = self.conn.execute(
+            "UPDATE outbox SET state = 'pending', next_attempt_at = 0 WHERE state = 'in_flight' AND updated_at < ?",
+            (cutoff,)
+        )
+        return cursor.rowcount
+
+    def reset_failed(self) -> int:
+        """Give leads that exhausted their attempts a fresh set of retries"""
+        cursor = self.conn.execute(
+            "UPDATE outbox SET state = 'pending', attempts = 0, next_attempt_at = 0 WHERE state = 'failed'"
+        )
+        return cursor.rowcount
+
+    def purge_succeeded(self, older_than_days: int = 30) -> int:
+        """Delete delivered leads older than the given age"""
+        cutoff = datetime.fromtimestamp(time.time() - older_than_days * 86400).isoformat()
+        cursor = self.conn.execute(
+            "DELETE FROM outbox WHERE state = 'succeeded' AND updated_at < ?", (cutoff,)
+        )
+        return cursor.rowcount
+
+    def counts(self) -> Dict[str, int]:
+        """Number of leads per state, plus 'dead' for failed leads out of attempts"""
+        counts = {PENDING: 0, IN_FLIGHT: 0, SUCCEEDED: 0, FAILED: 0}
+        for state, count in self.conn.execute("SELECT state, COUNT(*) FROM outbox GROUP BY state"):
+            counts[state] = count
+        counts['dead'] = self.conn.execute(
+            "SELECT COUNT(*) FROM outbox WHERE state = 'failed' AND attempts >= ?", (self.max_attempts,)
+        ).fetchone()[0]
+        return counts
+
+    def undelivered(self) -> int:
+        """Leads that still have to be sent (pending, in flight or retryable)"""
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM outbox WHERE state IN ('pending', 'in_flight') "
+            "OR (state = 'failed' AND attempts < ?)", (self.max_attempts,)
+        ).fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+
+class OutboxConnector:
+    """
+    Wraps a CRM connector so every push goes through a LeadOutbox
+
+    Leads are recorded before sending and marked succeeded or failed after,
+    so a push that fails is retried by drain() / replay_outbox.py instead of
+    being lost.
+    """
+
+    def __init__(self, connector, outbox: LeadOutbox):
+        self.connector = connector
+        self.outbox = outbox
+        self.batch_size = getattr(connector, 'batch_size', 50)
+
+    def __getattr__(self, name):
+        # Everything else (stats, formatting helpers) is the wrapped connector's
+        if name == 'connector':
+            raise AttributeError(name)
+        return getattr(self.connector, name)
+
+    def push_lead(self, lead_data: Dict) -> bool:
+        """Record and push a single lead"""
+        key = self.outbox.enqueue([lead_data])[0]
+        # An explicit push does not wait for the backoff, but still counts
+        # towards max_attempts
+        claimed = self.outbox.claim(1, keys=[key], ignore_schedule=True)
+        if not claimed:
+            # Identical content already delivered; a lead in flight elsewhere or
+            # out of attempts has not been delivered
+            return self.outbox.state(key) == SUCCEEDED
+
+        try:
+            pushed = self.connector.push_lead(lead_data)
+        except Exception as e:
+            self.outbox.mark_failed([key], str(e))
+            raise
+
+        if pushed:
+            self.outbox.mark_succeeded([key])
+        else:
+            self.outbox.mark_failed([key], 'push_lead returned False')
+        return pushed
+
+    def push_leads_batch(self, leads: List[Dict]) -> Dict:
+        """Record leads and push those not yet delivered"""
+        keys = self.outbox.enqueue(leads)
+        results = self.drain(keys=list(dict.fromkeys(keys)))
+        results['skipped'] = len(leads) - results['success'] - results['failed']
+        return results
+
+    def drain(self, limit: int = None, rate: float = None, keys: List[str] = None,
+              ignore_schedule: bool = False) -> Dict:
+        """
+        Send due leads from the outbox in batch_size chunks
+
+        Args:
+            limit: Stop after this many leads (None = until nothing is due)
+            rate: Maximum leads per second (None = as fast as the connector goes)
+            keys: Only send these lead keys
+            ignore_schedule: Don't wait for failed leads' backoff (endpoint known to be back)
+
+        Returns:
+            Dict with success/failed counts for this drain and leads still undelivered
+        """
+        results = {"success": 0, "failed": 0}
+        sent = 0
+
+        while limit is None or sent < limit:
+            size = self.batch_size if limit is None else min(self.batch_size, limit - sent)
+            claimed = self.outbox.claim(size, keys=keys, ignore_schedule=ignore_schedule)
+            if not claimed:
+                break
+
+            started = time.monotonic()
+            succeeded, failed, error = self._send_claimed(claimed)
+            self.outbox.mark_succeeded(succeeded)
+            if failed:
+                self.outbox.mark_failed(failed, error)
+
+            results["success"] += len(succeeded)
+            results["failed"] += len(failed)
+            sent += len(claimed)
+
+            if rate:
+                pause = len(claimed) / rate - (time.monotonic() - started)
+                if pause > 0:
+                    time.sleep(pause)
+
+        results["undelivered"] = self.outbox.undelivered()
+        return results
+
+    def _send_claimed(self, claimed: List[Tuple[str, Dict]]) -> Tuple[List[str], List[str], str]:
+        """Push one claimed chunk; returns (succeeded keys, failed keys, error)"""
+        keys = [key for key, _ in claimed]
+        try:
+            outcome = self.connector.push_leads_batch([lead for _, lead in claimed])
+        except Exception as e:
+            return [], keys, str(e)
+
+        # One chunk per claim: a POST that got a success response delivered the
+        # chunk, leads the server rejected would be rejected again on replay
+        chunks = outcome.get('chunks')
+        if chunks:
+            errors = [chunk['error'] for chunk in chunks if chunk.get('error')]
+            return ([], keys, errors[0]) if errors else (keys, [], None)
+
+        # Connectors without chunk reports: resend unless everything went through
+        # (webhook upserts are idempotent, so a resend never duplicates a lead)
+        if outcome.get('failed'):
+            return [], keys, f"{outcome['failed']} of {len(keys)} failed"
+        return keys, [], None
+
+
+def with_outbox(connector, push_settings: Dict = None):
+    """Wrap a connector in an OutboxConnector when push_settings.outbox_path is set"""
+    push_settings = push_settings or {}
+    outbox_path = push_settings.get('outbox_path')
+    if not outbox_path:
+        return connector
+
+    outbox = LeadOutbox(outbox_path, max_attempts=push_settings.get('outbox_max_attempts', 5),
+                        lease_timeout=push_settings.get('outbox_lease_timeout', 300))
+    recovered = outbox.recover_in_flight(older_than=outbox.lease_timeout)
+    if recovered:
+        logger.info(f"Recovered {recovered} lead(s) left in flight by a previous run")
+    return OutboxConnector(connector, outbox)
@@ -1,14 +1,16 @@
 import xmlrpc.client
 import logging
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
+from lead_identity import EXTERNAL_ID_MODULE, contacts_conflict, external_id_name, external_id_names
+from push_state import PushStateStore, content_hash
 
 logger = logging.getLogger(__name__)
 
 class OdooCRMConnector:
     """Odoo 17/18 CRM connector using XML-RPC API"""
     
-    def __init__(self, url: str, db: str, username: str, password: str):
+    def __init__(self, url: str, db: str, username: str, password: str, state_path: str = None):
         """
         Initialize Odoo connection
         
@@ -17,6 +19,8 @@ class OdooCRMConnector:
             db: Database name
             username: Odoo username (usually 'admin')
             password: Odoo API key or password
+            state_path: Optional SQLite file tracking last pushed values, so
+                        unchanged leads are skipped on re-push
         """
         # Ensure URL has protocol
         if not url.startswith('http'):
@@ -28,6 +32,8 @@ class OdooCRMConnector:
         self.password = password
         self.uid = None
         self.models = None
+        self._source_ids = {}
+        self.state_store = PushStateStore(state_path) if state_path else None
         
         self._authenticate()
     
@@ -53,19 +59,107 @@ class OdooCRMConnector:
             logger.error(f"Odoo authentication error: {e}")
             raise
     
-    def _find_or_create_partner(self, lead_data: Dict) -> int:
-        """Find existing partner or create new one"""
-        try:
-            # Search for existing partner by name
+    def _lookup_external_ids(self, names: List[str]) -> Dict[str, int]:
+        """Resolve many ir.model.data names to record ids in one indexed query"""
+        names = [name for name in set(names) if name]
+        if not names:
+            return {}
+        
+        rows = self.models.execute_kw(
+            self.db, self.uid, self.password,
+            'ir.model.data', 'search_read',
+            [[['module', '=', EXTERNAL_ID_MODULE], ['name', 'in', names]]],
+            {'fields': ['name', 'res_id']}
+        )
+        return {row['name']: row['res_id'] for row in rows}
+    
+    def _register_external_id(self, name: str, model: str, res_id: int):
+        """Bind a deterministic external ID to a newly created record"""
+        self.models.execute_kw(
+            self.db, self.uid, self.password,
+            'ir.model.data', 'create',
+            [{'module': EXTERNAL_ID_MODULE, 'name': name, 'model': model,
+              'res_id': res_id, 'noupdate': True}]
+        )
+    
+    def _bind_external_ids(self, names: List[Tuple[str, str]], model: str, res_id: int,
+                           known_ids: Dict[str, int]):
+        """Bind every still-unbound external ID name of a lead to the record"""
+        for _, name in names:
+            if name not in known_ids:
+                self._register_external_id(name, model, res_id)
+                known_ids[name] = res_id
+    
+    def _partner_conflicts(self, lead_data: Dict, partner_id: int) -> bool:
+        """True when the partner's phone or website belongs to another business"""
+        partners = self.models.execute_kw(
+            self.db, self.uid, self.password,
+            'res.partner', 'read',
+            [[partner_id]], {'fields': ['phone', 'website']}
+        )
+        return bool(partners) and contacts_conflict(lead_data, partners[0]['phone'], partners[0]['website'])
+    
+    def _find_legacy_partner(self, lead_data: Dict) -> Optional[int]:
+        """
+        Partner created before external IDs existed, matched on phone then name
+        
+        A name match is refused when the partner's phone or website differs
+        from the lead's, so same-named businesses are not merged.
+        """
+        phone = lead_data.get('Phone', '')
+        if phone not in ['Contact via website', 'Not available', '']:
             partner_ids = self.models.execute_kw(
                 self.db, self.uid, self.password,
                 'res.partner', 'search',
-                [[['name', '=', lead_data.get('Name')]]]
+                [[['phone', '=', phone]]], {'limit': 1}
             )
-            
             if partner_ids:
-                logger.info(f"Found existing partner: {lead_data.get('Name')}")
                 return partner_ids[0]
+        
+        partners = self.models.execute_kw(
+            self.db, self.uid, self.password,
+            'res.partner', 'search_read',
+            [[['name', '=', lead_data.get('Name')]]],
+            {'fields': ['phone', 'website'], 'limit': 10}
+        )
+        for partner in partners:
+            if not contacts_conflict(lead_data, partner['phone'], partner['website']):
+                return partner['id']
+        return None
+    
+    def _resolve_partner(self, lead_data: Dict, names: List[Tuple[str, str]],
+                         known_ids: Dict[str, int]) -> Optional[int]:
+        """Existing partner bound to the lead's strongest known key, or found by the legacy lookup"""
+        for kind, name in names:
+            if name not in known_ids:
+                continue
+            # Another business may own the name key; only trust it when contacts agree
+            if kind == 'name' and self._partner_conflicts(lead_data, known_ids[name]):
+                continue
+            return known_ids[name]
+        
+        return self._find_legacy_partner(lead_data)
+    
+    def _find_or_create_partner(self, lead_data: Dict, known_ids: Dict[str, int] = None) -> Tuple[Optional[int], bool]:
+        """
+        Find the lead's partner or create one, binding all its external IDs
+        
+        Returns (partner_id, created); partner_id is None on failure.
+        """
+        try:
+            names = external_id_names(lead_data, 'partner')
+            if not names:
+                logger.error(f"No usable identity (phone, website or name) for: {lead_data.get('Name')}")
+                return None, False
+            
+            if known_ids is None:
+                known_ids = self._lookup_external_ids([name for _, name in names])
+            
+            partner_id = self._resolve_partner(lead_data, names, known_ids)
+            if partner_id:
+                logger.info(f"Found existing partner: {lead_data.get('Name')}")
+                self._bind_external_ids(names, 'res.partner', partner_id, known_ids)
+                return partner_id, False
             
             # Prepare phone
             phone = lead_data.get('Phone', '')
@@ -101,13 +195,14 @@ class OdooCRMConnector:
                 'res.partner', 'create',
                 [partner_data]
             )
+            self._bind_external_ids(names, 'res.partner', partner_id, known_ids)
             
             logger.info(f"✓ Created new partner: {lead_data.get('Name')}")
-            return partner_id
+            return partner_id, True
             
         except Exception as e:
             logger.error(f"Error managing partner: {e}")
-            return None
+            return None, False
     
     def _get_country_id(self, country_name: str) -> int:
         """Get country ID from Odoo"""
@@ -142,6 +237,32 @@ class OdooCRMConnector:
         except:
             return False
     
+    def _get_or_create_source(self, search_term: str) -> int:
+        """Get or create the UTM source recording a lead's search term"""
+        if not search_term:
+            return False
+        
+        if search_term in self._source_ids:
+            return self._source_ids[search_term]
+        
+        try:
+            source_ids = self.models.execute_kw(
+                self.db, self.uid, self.password,
+                'utm.source', 'search',
+                [[['name', '=', search_term]]], {'limit': 1}
+            )
+            source_id = source_ids[0] if source_ids else self.models.execute_kw(
+                self.db, self.uid, self.password,
+                'utm.source', 'create',
+                [{'name': search_term}]
+            )
+        except Exception as e:
+            logger.error(f"Error managing UTM source: {e}")
+            return False
+        
+        self._source_ids[search_term] = source_id
+        return source_id
+    
     def _map_priority(self, priority: str) -> str:
         """Map priority to Odoo priority values (Odoo 17/18 uses 0-3)"""
         priority_map = {
@@ -182,33 +303,59 @@ class OdooCRMConnector:
         
         return tag_ids
     
-    def push_lead(self, lead_data: Dict) -> bool:
-        """Push single lead to Odoo CRM"""
-        try:
-            # Create or find partner
-            partner_id = self._find_or_create_partner(lead_data)
-            
-            if not partner_id:
-                logger.error(f"Failed to create/find partner for: {lead_data.get('Name')}")
-                return False
-            
-            # Check if lead already exists
-            existing_lead = self.models.execute_kw(
-                self.db, self.uid, self.password,
-                'crm.lead', 'search',
-                [[['partner_id', '=', partner_id]]]
-            )
-            
-            if existing_lead:
-                logger.info(f"Lead already exists for: {lead_data.get('Name')} - Updating...")
-                # Update existing lead
-                update_data = {
-                    'description': f"""Updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+    def _external_id_names(self, lead_data: Dict) -> List[str]:
+        """Partner and lead external ID names for every identity key of a lead"""
+        return [name for prefix in ('partner', 'lead') for _, name in external_id_names(lead_data, prefix)]
+    
+    def _resolve_lead(self, lead_names: List[Tuple[str, str]], partner_id: int,
+                      known_ids: Dict[str, int]) -> Optional[int]:
+        """
+        Existing lead bound to one of the lead's keys, else the partner's lead
+        
+        Name keys are not trusted here: the partner lookup already settled
+        which business the lead is, and its leads are found through partner_id.
+        """
+        for kind, name in lead_names:
+            if kind != 'name' and name in known_ids:
+                return known_ids[name]
+        
+        lead_ids = self.models.execute_kw(
+            self.db, self.uid, self.password,
+            'crm.lead', 'search',
+            [[['partner_id', '=', partner_id]]], {'limit': 1}
+        )
+        return lead_ids[0] if lead_ids else None
+    
+    def _tracked_values(self, lead_data: Dict) -> Dict:
+        """
+        crm.lead field values derived from the scraped lead that re-pushes keep in sync
+        
+        Volatile inputs (scrape timestamp, push time) are left out so that an
+        unchanged business always produces identical values.
+        """
+        phone = lead_data.get('Phone', '')
+        if phone in ['Contact via website', 'Not available', '']:
+            phone = False
+        
+        email = lead_data.get('Email', '')
+        if email in ['Not available', '']:
+            email = False
+        
+        website = lead_data.get('Website', '')
+        if website in ['Not available', '']:
+            website = False
+        
+        return {
+            'phone': phone,
+            'email_from': email,
+            'website': website,
+            'street': lead_data.get('Address', ''),
+            'priority': self._map_priority(lead_data.get('Priority', 'MEDIUM')),
+            'description': f"""Lead from Google Maps Scraper
 
 Category: {lead_data.get('Category')}
 Search Term: {lead_data.get('Search Term')}
 Quality Score: {lead_data.get('Quality Score')}/10
-Priority: {lead_data.get('Priority')}
 
 Contact Details:
 Phone: {lead_data.get('Phone')}
@@ -216,31 +363,124 @@ Email: {lead_data.get('Email')}
 Website: {lead_data.get('Website')}
 Address: {lead_data.get('Address')}
 
-Source: {lead_data.get('Data Source')}
-Scraped At: {lead_data.get('Timestamp')}
-"""
-                }
+Data Source: {lead_data.get('Data Source')}
+""",
+        }
+    
+    # Fields re-pushes always refresh; every other tracked field (contact
+    # details, address, priority) is only filled in where the CRM has none,
+    # so edits made by sales staff in Odoo are kept
+    SCRAPER_OWNED_FIELDS = ('description',)
+    
+    def _is_unchanged(self, lead_data: Dict, state: Dict = None) -> bool:
+        """True when the lead's tracked values match what was last pushed"""
+        if not self.state_store:
+            return False
+        
+        if state is None:
+            state = self.state_store.get(external_id_name(lead_data, 'lead'))
+        return bool(state) and state['hash'] == content_hash(self._tracked_values(lead_data))
+    
+    def _verified_state(self, lead_xml_name: str, state: Optional[Dict], known_ids: Dict[str, int]) -> Optional[Dict]:
+        """
+        The push state if its crm.lead still exists, else None
+
+        Deleting a record in Odoo deletes its external IDs, so a lead whose
+        external ID no longer resolves to the recorded id is forgotten and
+        resolved from scratch.
+        """
+        if state and state.get('res_id') and known_ids.get(lead_xml_name) != state['res_id']:
+            self.state_store.forget(lead_xml_name)
+            return None
+        return state
+    
+    def _update_lead(self, lead_id: int, values: Dict, previous: Dict = None) -> Dict:
+        """
+        Write a re-pushed lead onto an existing crm.lead
+
+        Only fields that changed since `previous` (the last pushed values) are
+        considered. SCRAPER_OWNED_FIELDS are overwritten; the others are
+        written only where the CRM record is still empty.
+
+        Returns:
+            The values actually written
+        """
+        changed = {field: value for field, value in values.items()
+                   if previous is None or previous.get(field) != value}
+        updates = {field: value for field, value in changed.items() if field in self.SCRAPER_OWNED_FIELDS}
+        fillable = [field for field, value in changed.items() if field not in self.SCRAPER_OWNED_FIELDS and value]
+        
+        if fillable:
+            current = self.models.execute_kw(
+                self.db, self.uid, self.password,
+                'crm.lead', 'read',
+                [[lead_id]], {'fields': fillable}
+            )
+            if current:
+                updates.update({field: changed[field] for field in fillable if not current[0].get(field)})
+        
+        if updates:
+            self.models.execute_kw(
+                self.db, self.uid, self.password,
+                'crm.lead', 'write',
+                [[lead_id], updates]
+            )
+        return updates
+    
+    def push_lead(self, lead_data: Dict, known_ids: Dict[str, int] = None, state: Dict = None) -> bool:
+        """
+        Upsert a single lead into Odoo CRM keyed on its canonical identity
+        
+        With a state store, unchanged leads are skipped once their recorded
+        crm.lead is confirmed to still exist, and changed ones only write the
+        fields that differ from the last push (see _update_lead).
+        
+        Args:
+            lead_data: Scraped lead
+            known_ids: Pre-resolved external IDs (see push_leads_batch); looked up when omitted
+            state: Pre-loaded push state for the lead; read from the state store when omitted
+        """
+        lead_xml_name = external_id_name(lead_data, 'lead')
+        values = self._tracked_values(lead_data)
+        
+        try:
+            if known_ids is None:
+                known_ids = self._lookup_external_ids(self._external_id_names(lead_data))
+            
+            if self.state_store and lead_xml_name:
+                if state is None:
+                    state = self.state_store.get(lead_xml_name)
+                state = self._verified_state(lead_xml_name, state, known_ids)
                 
-                self.models.execute_kw(
-                    self.db, self.uid, self.password,
-                    'crm.lead', 'write',
-                    [existing_lead, update_data]
-                )
-                logger.info(f"✓ Updated existing lead for: {lead_data.get('Name')}")
-                return True
+                if state and state['hash'] == content_hash(values):
+                    logger.info(f"Unchanged since last push, skipping: {lead_data.get('Name')}")
+                    return True
+                
+                if state and state['res_id']:
+                    written = self._update_lead(state['res_id'], values, state['values'])
+                    self.state_store.record(lead_xml_name, values, state['res_id'])
+                    logger.info(f"✓ Updated {len(written)} changed field(s) for: {lead_data.get('Name')}")
+                    return True
             
-            # Prepare lead data for Odoo
-            phone = lead_data.get('Phone', '')
-            if phone in ['Contact via website', 'Not available', '']:
-                phone = False
+            # Create or find partner
+            partner_id, partner_created = self._find_or_create_partner(lead_data, known_ids)
             
-            email = lead_data.get('Email', '')
-            if email in ['Not available', '']:
-                email = False
+            if not partner_id:
+                logger.error(f"Failed to create/find partner for: {lead_data.get('Name')}")
+                return False
             
-            website = lead_data.get('Website', '')
-            if website in ['Not available', '']:
-                website = False
+            # A new partner means a new business, whatever its name key is bound to
+            lead_names = external_id_names(lead_data, 'lead')
+            existing_lead = None if partner_created else self._resolve_lead(lead_names, partner_id, known_ids)
+            
+            if existing_lead:
+                logger.info(f"Lead already exists for: {lead_data.get('Name')} - Updating...")
+                self._update_lead(existing_lead, values)
+                self._bind_external_ids(lead_names, 'crm.lead', existing_lead, known_ids)
+                if self.state_store:
+                    self.state_store.record(lead_xml_name, values, existing_lead)
+                logger.info(f"✓ Updated existing lead for: {lead_data.get('Name')}")
+                return True
             
             # Get tags
             tags = [
@@ -250,36 +490,17 @@ Scraped At: {lead_data.get('Timestamp')}
             ]
             tag_ids = self._get_or_create_tags(tags)
             
-            odoo_lead_data = {
+            odoo_lead_data = dict(values, **{
                 'name': f"{lead_data.get('Name')} - Dubai Lead",
                 'partner_id': partner_id,
                 'type': 'opportunity',
-                'phone': phone,
-                'email_from': email,
-                'website': website,
-                'street': lead_data.get('Address', ''),
                 'city': 'Dubai',
                 'country_id': self._get_country_id('United Arab Emirates'),
                 'stage_id': self._get_stage_id('New'),
-                'priority': self._map_priority(lead_data.get('Priority', 'MEDIUM')),
                 'tag_ids': [(6, 0, tag_ids)] if tag_ids else False,
-                'description': f"""Lead from Google Maps Scraper
-
-Category: {lead_data.get('Category')}
-Search Term: {lead_data.get('Search Term')}
-Quality Score: {lead_data.get('Quality Score')}/10
-
-Contact Details:
-Phone: {lead_data.get('Phone')}
-Email: {lead_data.get('Email')}
-Website: {lead_data.get('Website')}
-Address: {lead_data.get('Address')}
-
-Data Source: {lead_data.get('Data Source')}
-Scraped At: {lead_data.get('Timestamp')}
-""",
+                'source_id': self._get_or_create_source(lead_data.get('Search Term')),
                 'user_id': self.uid,
-            }
+            })
             
             # Create lead in Odoo
             lead_id = self.models.execute_kw(
@@ -288,65 +509,181 @@ Scraped At: {lead_data.get('Timestamp')}
                 [odoo_lead_data]
             )
             
+            self._bind_external_ids(lead_names, 'crm.lead', lead_id, known_ids)
+            if self.state_store:
+                self.state_store.record(lead_xml_name, values, lead_id)
+            
             logger.info(f"✓ Created Odoo lead #{lead_id}: {lead_data.get('Name')}")
             return True
             
         except Exception as e:
             logger.error(f"Error pushing lead to Odoo: {e}")
             logger.exception("Full traceback:")
+            # The lead may have been removed in Odoo; re-resolve it on the next push
+            if self.state_store and lead_xml_name:
+                self.state_store.forget(lead_xml_name)
             return False
     
     def push_leads_batch(self, leads: List[Dict]) -> Dict:
         """Push multiple leads to Odoo"""
-        results = {"success": 0, "failed": 0}
+        results = {"success": 0, "failed": 0, "skipped": 0}
         
         logger.info(f"Starting batch push of {len(leads)} leads to Odoo...")
         
+        # One indexed ir.model.data lookup resolves the whole batch and confirms
+        # that leads recorded in the state store still exist in Odoo
+        try:
+            known_ids = self._lookup_external_ids(
+                [name for lead in leads for name in self._external_id_names(lead)]
+            )
+        except Exception as e:
+            logger.error(f"Error resolving external IDs: {e}")
+            results["failed"] = len(leads)
+            return results
+        
+        states = {}
+        if self.state_store:
+            states = self.state_store.get_many([external_id_name(lead, 'lead') for lead in leads])
+            pending = []
+            for lead in leads:
+                lead_xml_name = external_id_name(lead, 'lead')
+                state = self._verified_state(lead_xml_name, states.get(lead_xml_name), known_ids)
+                states[lead_xml_name] = state or {}
+                if self._is_unchanged(lead, state or {}):
+                    results["skipped"] += 1
+                else:
+                    pending.append(lead)
+            if results["skipped"]:
+                logger.info(f"Skipping {results['skipped']} leads unchanged since their last push")
+            leads = pending
+        
         for idx, lead in enumerate(leads, 1):
             logger.info(f"Processing lead {idx}/{len(leads)}: {lead.get('Name')}")
-            if self.push_lead(lead):
+            state = states.get(external_id_name(lead, 'lead'), {})
+            if self.push_lead(lead, known_ids, state):
                 results["success"] += 1
             else:
                 results["failed"] += 1
         
         return results
     
-    def get_yesterday_stats(self) -> Dict:
-        """Get statistics from yesterday's scraping run"""
-        try:
-            yesterday = datetime.now() - timedelta(days=1)
-            yesterday_start = yesterday.replace(hour=0, minute=0, second=0).strftime('%Y-%m-%d %H:%M:%S')
-            yesterday_end = yesterday.replace(hour=23, minute=59, second=59).strftime('%Y-%m-%d %H:%M:%S')
-            
-            # Search for leads created yesterday
-            lead_ids = self.models.execute_kw(
+    # Report group-by aliases -> crm.lead fields understood by read_group
+    REPORT_GROUPBY_FIELDS = {
+        'priority': 'priority',
+        'stage': 'stage_id',
+        'tag': 'tag_ids',
+        'search_term': 'source_id',
+        'day': 'create_date:day',
+        'week': 'create_date:week',
+        'month': 'create_date:month',
+    }
+    
+    def _date_window_domain(self, date_from: datetime, date_to: datetime) -> List:
+        """Build a create_date domain for the half-open window [date_from, date_to)"""
+        return [
+            ['create_date', '>=', date_from.strftime('%Y-%m-%d %H:%M:%S')],
+            ['create_date', '<', date_to.strftime('%Y-%m-%d %H:%M:%S')]
+        ]
+    
+    def get_lead_report(self, date_from: datetime, date_to: datetime,
+                        groupby: List[str] = None, domain: List = None) -> Dict:
+        """
+        Aggregate leads created in a date window, computed server-side with read_group
+        
+        Args:
+            date_from: Window start (inclusive)
+            date_to: Window end (exclusive)
+            groupby: Aliases from REPORT_GROUPBY_FIELDS (e.g. ['priority', 'stage'])
+            domain: Extra crm.lead domain terms
+        
+        Returns:
+            Dict with the number of distinct leads and one row per group combination
+        """
+        groupby = groupby or []
+        unknown = [g for g in groupby if g not in self.REPORT_GROUPBY_FIELDS]
+        if unknown:
+            raise ValueError(f"Unsupported report group-by: {', '.join(unknown)}")
+        
+        fields = [self.REPORT_GROUPBY_FIELDS[g] for g in groupby]
+        full_domain = self._date_window_domain(date_from, date_to) + (domain or [])
+        
+        # lazy=False groups on every field at once, so any combination of
+        # group-bys is answered by a single round trip
+        groups = self.models.execute_kw(
+            self.db, self.uid, self.password,
+            'crm.lead', 'read_group',
+            [full_domain, ['expected_revenue:sum', 'probability:avg'], fields],
+            {'lazy': False}
+        )
+        
+        rows = []
+        for group in groups:
+            row = {'count': group.get('__count', 0)}
+            for alias, field in zip(groupby, fields):
+                value = group.get(field)
+                # Many2one groups come back as [id, display_name]
+                row[alias] = value[1] if isinstance(value, (list, tuple)) else value
+            row['expected_revenue'] = group.get('expected_revenue') or 0.0
+            row['avg_probability'] = group.get('probability') or 0.0
+            rows.append(row)
+        
+        if groupby:
+            # Many2many group-bys (tag) put a lead in one group per tag, so
+            # the group counts are a breakdown and do not sum to the total
+            total = self.models.execute_kw(
                 self.db, self.uid, self.password,
-                'crm.lead', 'search',
-                [[
-                    ['create_date', '>=', yesterday_start],
-                    ['create_date', '<=', yesterday_end]
-                ]]
+                'crm.lead', 'search_count',
+                [full_domain]
             )
+        else:
+            total = sum(row['count'] for row in rows)
+        
+        return {
+            'date_from': date_from.strftime('%Y-%m-%d %H:%M:%S'),
+            'date_to': date_to.strftime('%Y-%m-%d %H:%M:%S'),
+            'groupby': groupby,
+            'total_leads': total,
+            'groups': rows
+        }
+    
+    def search_leads_page(self, date_from: datetime, date_to: datetime,
+                          offset: int = 0, limit: int = 100,
+                          order: str = 'create_date desc',
+                          fields: List[str] = None, domain: List = None) -> List[Dict]:
+        """Fetch one page of leads from a date window with search_read"""
+        return self.models.execute_kw(
+            self.db, self.uid, self.password,
+            'crm.lead', 'search_read',
+            [self._date_window_domain(date_from, date_to) + (domain or [])],
+            {
+                'fields': fields or ['name', 'partner_id', 'priority', 'stage_id', 'create_date'],
+                'offset': offset,
+                'limit': limit,
+                'order': order
+            }
+        )
+    
+    def get_yesterday_stats(self, top: int = 10) -> Dict:
+        """Get statistics from yesterday's scraping run"""
+        try:
+            today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+            yesterday = today - timedelta(days=1)
             
-            if lead_ids:
-                leads = self.models.execute_kw(
-                    self.db, self.uid, self.password,
-                    'crm.lead', 'read',
-                    [lead_ids],
-                    {'fields': ['name', 'partner_id', 'priority', 'stage_id', 'create_date']}
-                )
-            else:
-                leads = []
+            report = self.get_lead_report(yesterday, today, groupby=['priority', 'stage'])
+            leads = self.search_leads_page(
+                yesterday, today, limit=top, order='priority desc, create_date desc'
+            ) if report['total_leads'] else []
             
             stats = {
-                'total_leads': len(leads),
+                'total_leads': report['total_leads'],
                 'date': yesterday.strftime('%Y-%m-%d'),
+                'groups': report['groups'],
                 'leads': leads
             }
             
-            logger.info(f"📊 Yesterday's stats ({stats['date']}): {len(leads)} leads found in Odoo")
+            logger.info(f"📊 Yesterday's stats ({stats['date']}): {stats['total_leads']} leads found in Odoo")
             return stats
             
         except Exception as e:
             logger.error(f"Error getting yesterday's stats: {e}")
-            return {'total_leads': 0, 'date': 'N/A', 'leads': []}
+            return {'total_leads': 0, 'date': 'N/A', 'groups': [], 'leads': []}
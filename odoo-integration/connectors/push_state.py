@@ -0,0 +1,85 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+from datetime import datetime
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(values: Dict) -> str:
+    """Stable digest of a dict of field values"""
+    payload = json.dumps(values, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class PushStateStore:
+    """SQLite record of the field values last pushed to the CRM for each lead"""
+
+    def __init__(self, db_path: str):
+        """
+        Open (or create) the state store
+
+        Args:
+            db_path: SQLite file path, e.g. 'results/.crm_push_state.db'
+        """
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS pushed_leads (
+                external_id TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                field_values TEXT NOT NULL,
+                res_id INTEGER,
+                pushed_at TEXT NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    def get(self, external_id: str) -> Optional[Dict]:
+        """Last pushed state for one lead, or None if it was never pushed"""
+        return self.get_many([external_id]).get(external_id)
+
+    def get_many(self, external_ids: List[str]) -> Dict[str, Dict]:
+        """Last pushed state for many leads, keyed by external ID"""
+        states = {}
+        ids = [external_id for external_id in set(external_ids) if external_id]
+
+        # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT external_id, content_hash, field_values, res_id FROM pushed_leads "
+                f"WHERE external_id IN ({','.join('?' * len(chunk))})",
+                chunk
+            )
+            for external_id, digest, values, res_id in rows:
+                states[external_id] = {
+                    'hash': digest,
+                    'values': json.loads(values),
+                    'res_id': res_id
+                }
+        return states
+
+    def record(self, external_id: str, values: Dict, res_id: int = None):
+        """Store the field values that were just pushed for a lead"""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO pushed_leads VALUES (?, ?, ?, ?, ?)",
+            (external_id, content_hash(values), json.dumps(values, sort_keys=True, default=str),
+             res_id, datetime.now().isoformat())
+        )
+        self.conn.commit()
+
+    def forget(self, external_id: str):
+        """Drop a lead's state so its next push is a full upsert"""
+        self.conn.execute("DELETE FROM pushed_leads WHERE external_id = ?", (external_id,))
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
@@ -2,20 +2,29 @@ import requests
 import logging
 from typing import Dict, List
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from http_session import build_session, encode_json_body, resolve_compression
+from lead_identity import batch_idempotency_key, idempotency_key
 
 logger = logging.getLogger(__name__)
 
 class OdooWebhookConnector:
     """Odoo webhook connector for lead management"""
     
-    def __init__(self, webhook_url: str, auth_header: str = None):
+    def __init__(self, webhook_url: str, auth_header: str = None,
+                 push_settings: Dict = None, session: requests.Session = None,
+                 webhook_settings: Dict = None):
         """
         Initialize Odoo webhook connector
         
         Args:
             webhook_url: Odoo webhook URL
             auth_header: Optional authorization header
+            push_settings: crm_config.json push_settings, drives the transport retry policy
+            session: Optional shared session; a pooled keep-alive session is created otherwise
+            webhook_settings: crm_config.json webhook_settings (timeout, verify_ssl,
+                batch_size, max_in_flight, chunk_retries, compression, compress_min_bytes)
         """
         self.webhook_url = webhook_url
         self.headers = {"Content-Type": "application/json"}
@@ -23,19 +32,36 @@ class OdooWebhookConnector:
         if auth_header:
             self.headers["Authorization"] = auth_header
         
+        webhook_settings = webhook_settings or {}
+        self.timeout = webhook_settings.get('timeout', 30)
+        self.verify_ssl = webhook_settings.get('verify_ssl', True)
+        self.batch_size = max(int(webhook_settings.get('batch_size', 50)), 1)
+        self.max_in_flight = max(int(webhook_settings.get('max_in_flight', 2)), 1)
+        self.chunk_retries = max(int(webhook_settings.get('chunk_retries', 1)), 0)
+        # Content-Encoding for batch bodies: 'gzip', 'zstd' or none
+        self.compression = resolve_compression(webhook_settings.get('compression'))
+        self.compress_min_bytes = int(webhook_settings.get('compress_min_bytes', 1024))
+        
+        self.session = session or self._build_session(push_settings)
+        
         logger.info(f"✓ Odoo webhook connector initialized: {webhook_url}")
     
+    def _build_session(self, push_settings: Dict = None) -> requests.Session:
+        """Pooled keep-alive session used when no shared session is passed"""
+        return build_session(push_settings, pool_size=max(self.max_in_flight, 10))
+    
     def push_lead(self, lead_data: Dict) -> bool:
         """Push single lead to Odoo via webhook"""
         try:
             # Format lead data for Odoo webhook
             formatted_lead = self._format_lead_for_odoo(lead_data)
             
-            response = requests.post(
+            response = self.session.post(
                 self.webhook_url, 
-                headers=self.headers, 
+                headers={**self.headers, **self._idempotency_headers(formatted_lead)}, 
                 json=formatted_lead, 
-                timeout=30
+                timeout=self.timeout,
+                verify=self.verify_ssl
             )
             
             if response.status_code in [200, 201, 202]:
@@ -56,9 +82,47 @@ class OdooWebhookConnector:
             return False
     
     def push_leads_batch(self, leads: List[Dict]) -> Dict:
-        """Push multiple leads to Odoo via webhook"""
-        results = {"success": 0, "failed": 0}
+        """
+        Push multiple leads to Odoo via webhook in batch_size chunks
+        
+        Up to max_in_flight chunks are on the wire at once, and only chunks whose
+        POST failed are sent again (chunk_retries extra rounds).
+        
+        Returns:
+            Dict with success/failed lead counts and a per-chunk report
+        """
+        chunks = [leads[start:start + self.batch_size]
+                  for start in range(0, len(leads), self.batch_size)]
+        reports = [None] * len(chunks)
+        pending = list(range(len(chunks)))
         
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            for attempt in range(1, self.chunk_retries + 2):
+                if not pending:
+                    break
+                if attempt > 1:
+                    logger.info(f"Retrying {len(pending)} failed chunk(s) (round {attempt})...")
+                
+                outcomes = executor.map(lambda index: self._push_chunk(chunks[index]), pending)
+                for index, outcome in zip(pending, outcomes):
+                    outcome.update({"chunk": index + 1, "size": len(chunks[index]), "attempts": attempt})
+                    reports[index] = outcome
+                
+                # Leads the controller rejected would be rejected again; only resend
+                # chunks that never got a success response
+                pending = [index for index in pending if reports[index]["error"]]
+        
+        results = {
+            "success": sum(report["success"] for report in reports),
+            "failed": sum(report["failed"] for report in reports),
+            "chunks": reports
+        }
+        logger.info(f"✓ Batch push: {results['success']} sent, {results['failed']} failed "
+                    f"across {len(chunks)} chunk(s) of up to {self.batch_size}")
+        return results
+    
+    def _push_chunk(self, leads: List[Dict]) -> Dict:
+        """POST one chunk of leads and return its outcome"""
         try:
             # Format all leads for batch processing
             formatted_leads = [self._format_lead_for_odoo(lead) for lead in leads]
@@ -70,25 +134,71 @@ class OdooWebhookConnector:
                 "timestamp": datetime.now().isoformat()
             }
             
-            response = requests.post(
-                self.webhook_url, 
-                headers=self.headers, 
-                json=batch_payload, 
-                timeout=60
-            )
+            response = self._post_batch(batch_payload)
             
-            if response.status_code in [200, 201, 202]:
-                results["success"] = len(leads)
-                logger.info(f"✓ Pushed {len(leads)} leads to Odoo webhook (batch)")
-            else:
-                results["failed"] = len(leads)
+            # Every lead was rejected: resending the chunk would not change that
+            if response.status_code == 422:
+                logger.error(f"Odoo webhook rejected all {len(leads)} lead(s) of a chunk: {response.text[:200]}")
+                return {"success": 0, "failed": len(leads), "status": response.status_code, "error": None}
+            
+            if response.status_code not in [200, 201, 202]:
                 logger.error(f"Odoo webhook batch error: {response.status_code}")
+                return {"success": 0, "failed": len(leads), "status": response.status_code,
+                        "error": response.text[:200] or f"HTTP {response.status_code}"}
+            
+            try:
+                rejected = self._rejected_count(response.json())
+            except ValueError:
+                rejected = 0
+            return {"success": len(leads) - rejected, "failed": rejected,
+                    "status": response.status_code, "error": None}
                 
         except Exception as e:
             logger.error(f"Error pushing batch to Odoo webhook: {e}")
-            results["failed"] = len(leads)
+            return {"success": 0, "failed": len(leads), "status": None, "error": str(e)}
+    
+    def _post_batch(self, batch_payload: Dict) -> requests.Response:
+        """POST a batch body, compressed when configured"""
+        encoding = self.compression
+        body, headers = encode_json_body(batch_payload, encoding, self.compress_min_bytes)
+        response = self.session.post(
+            self.webhook_url,
+            headers={**self.headers, **headers, **self._idempotency_headers(batch_payload)},
+            data=body,
+            timeout=self.timeout,
+            verify=self.verify_ssl
+        )
         
-        return results
+        # Endpoints without decompression support answer 415: stop compressing
+        if response.status_code == 415 and 'Content-Encoding' in headers:
+            logger.warning(f"Webhook does not accept {encoding} bodies, sending uncompressed from now on")
+            self.compression = ''
+            return self._post_batch(batch_payload)
+        
+        if 'Content-Encoding' in headers:
+            logger.debug(f"Batch body {encoding}-compressed to {len(body)} bytes")
+        return response
+    
+    @staticmethod
+    def _idempotency_headers(payload: Dict) -> Dict:
+        """Idempotency-Key header for a single-lead or batch payload"""
+        if 'leads' in payload:
+            key = batch_idempotency_key([lead['idempotency_key'] for lead in payload['leads']])
+        else:
+            key = payload['idempotency_key']
+        return {'Idempotency-Key': key}
+    
+    @staticmethod
+    def _rejected_count(body) -> int:
+        """Leads the dubai_sme_webhook controller reported as rejected in a response body, 0 if unknown"""
+        # type='json' routes wrap the summary in a JSON-RPC envelope
+        if isinstance(body, dict) and isinstance(body.get('result'), dict):
+            body = body['result']
+        if not isinstance(body, dict):
+            return 0
+        
+        rejected = body.get('rejected') or []
+        return len(rejected) if isinstance(rejected, list) else int(rejected)
     
     def _format_lead_for_odoo(self, lead_data: Dict) -> Dict:
         """Format lead data for Odoo CRM webhook"""
@@ -152,7 +262,10 @@ Source: {lead_data.get('Data Source')}
             
             # Timestamps
             "scraped_at": lead_data.get('Timestamp'),
-            "created_at": datetime.now().isoformat()
+            "created_at": datetime.now().isoformat(),
+            
+            # Same lead and content -> same key, lets Odoo drop repeated pushes
+            "idempotency_key": idempotency_key(lead_data)
         }
         
         return formatted
@@ -166,6 +279,13 @@ Source: {lead_data.get('Data Source')}
             'note': 'Stats not available via webhook - check Odoo CRM directly'
         }
 
-def get_webhook_connector(webhook_url: str, auth_header: str = None) -> OdooWebhookConnector:
-    """Factory function to get webhook connector"""
-    return OdooWebhookConnector(webhook_url, auth_header)
\ No newline at end of file
+def get_webhook_connector(webhook_url: str, auth_header: str = None,
+                          push_settings: Dict = None,
+                          webhook_settings: Dict = None) -> OdooWebhookConnector:
+    """Factory function to get webhook connector (aiohttp-based when webhook_settings.async is set)"""
+    if (webhook_settings or {}).get('async'):
+        from async_webhook_connector import AsyncOdooWebhookConnector
+        return AsyncOdooWebhookConnector(webhook_url, auth_header, push_settings=push_settings,
+                                         webhook_settings=webhook_settings)
+    return OdooWebhookConnector(webhook_url, auth_header, push_settings=push_settings,
+                                webhook_settings=webhook_settings)
\ No newline at end of file
@@ -0,0 +1,21 @@
+# =================================================================
+# 🧪 TEST SETUP - import paths for the connector and utility modules
+# =================================================================
+
+import importlib.util
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+REPO = os.path.dirname(os.path.dirname(HERE))
+
+# Connectors and utilities import each other by bare module name
+sys.path.insert(0, os.path.join(REPO, 'scripts', 'utilities'))
+sys.path.insert(0, os.path.join(REPO, 'odoo-integration', 'connectors'))
+
+# match_keys and tag_cache only use the standard library, so load them without the Odoo addon package
+ADDON_MODELS = os.path.join(REPO, 'odoo-integration', 'addons', 'dubai_sme_webhook', 'models')
+for _name in ('match_keys', 'tag_cache'):
+    _spec = importlib.util.spec_from_file_location(_name, os.path.join(ADDON_MODELS, f'{_name}.py'))
+    sys.modules[_name] = importlib.util.module_from_spec(_spec)
+    _spec.loader.exec_module(sys.modules[_name])
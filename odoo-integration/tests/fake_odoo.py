@@ -0,0 +1,65 @@
+# =================================================================
+# 🧪 FAKE ODOO - in-memory XML-RPC endpoint shared by the connector tests
+# =================================================================
+
+from odoo_crm_connector import OdooCRMConnector
+
+
+class FakeOdoo:
+    """In-memory stand-in for the XML-RPC object endpoint"""
+
+    def __init__(self, partners=None, leads=None):
+        self.records = {'res.partner': dict(partners or {}), 'crm.lead': dict(leads or {})}
+        self.xml_ids = {}
+        self.next_id = 100
+        self.calls = []
+
+    def delete(self, model, res_id):
+        """Delete a record from the Odoo UI: its external IDs go with it"""
+        del self.records[model][res_id]
+        self.xml_ids = {name: bound for name, bound in self.xml_ids.items() if bound != res_id}
+
+    def execute_kw(self, db, uid, password, model, method, args, kwargs=None):
+        kwargs = kwargs or {}
+        self.calls.append((model, method, args))
+        if model == 'ir.model.data':
+            if method == 'search_read':
+                names = args[0][1][2]
+                return [{'name': name, 'res_id': res_id} for name, res_id in self.xml_ids.items() if name in names]
+            if method == 'create':
+                assert args[0]['name'] not in self.xml_ids, 'external ID registered twice'
+                self.xml_ids[args[0]['name']] = args[0]['res_id']
+                return len(self.xml_ids)
+
+        table = self.records.get(model)
+        if table is None:
+            return [] if method == 'search' else False
+
+        if method == 'create':
+            self.next_id += 1
+            table[self.next_id] = dict(args[0])
+            return self.next_id
+        if method == 'write':
+            for res_id in args[0]:
+                table[res_id].update(args[1])
+            return True
+        if method == 'read':
+            return [dict(table[res_id], id=res_id) for res_id in args[0] if res_id in table]
+
+        matches = [res_id for res_id, record in table.items()
+                   if all(record.get(field) == value for field, _, value in args[0])]
+        if method == 'search':
+            return matches[:kwargs.get('limit') or len(matches)]
+        if method == 'search_read':
+            return [dict(table[res_id], id=res_id) for res_id in matches]
+        raise AssertionError(f'unexpected call {model}.{method}')
+
+
+def make_connector(odoo, state_store=None):
+    """OdooCRMConnector wired to a fake endpoint, without logging in"""
+    connector = OdooCRMConnector.__new__(OdooCRMConnector)
+    connector.db, connector.uid, connector.password = 'db', 1, 'key'
+    connector.models = odoo
+    connector._source_ids = {}
+    connector.state_store = state_store
+    return connector
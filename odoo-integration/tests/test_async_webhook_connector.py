@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# =================================================================
+# 🧪 TEST ASYNC WEBHOOK CONNECTOR - pooled session, 415 fallback
+# =================================================================
+
+import asyncio
+
+import pytest
+
+pytest.importorskip('aiohttp')
+pytest.importorskip('requests')
+
+from async_webhook_connector import AsyncOdooWebhookConnector, TokenBucket, retry_after_seconds
+from webhook_server import WebhookServer
+
+LEAD = {'Name': 'Al Noor Trading LLC', 'Phone': '04 123 4567', 'Category': 'Trading'}
+
+
+@pytest.fixture
+def server():
+    server = WebhookServer()
+    yield server
+    server.stop()
+
+
+def make_connector(url, **webhook_settings):
+    return AsyncOdooWebhookConnector(url, push_settings={'max_retries': 1},
+                                     webhook_settings=dict({'rate_limit': 0}, **webhook_settings))
+
+
+def test_per_lead_pushes_reuse_one_session(server):
+    connector = make_connector(server.url, max_in_flight=1)
+    try:
+        assert all(connector.push_lead(dict(LEAD, Name=f'Lead {i}')) for i in range(5))
+        session = connector._session
+        assert connector.push_leads_batch([LEAD] * 3)['success'] == 3
+        assert connector._session is session
+    finally:
+        connector.close()
+
+    assert len(server.requests) == 6
+    assert len(server.connections) == 1
+    assert session.closed
+
+
+def test_async_api_replaces_the_session_of_a_previous_loop(server):
+    connector = make_connector(server.url)
+    try:
+        assert connector.push_lead(LEAD)
+        first = connector._session
+        assert asyncio.run(connector.push_leads_async([LEAD]))['success'] == 1
+        second = connector._session
+        assert asyncio.run(connector.push_leads_async([LEAD]))['success'] == 1
+    finally:
+        connector.close()
+
+    assert connector.session is None
+    assert first is not second and first.closed and second.closed
+
+
+def test_compressed_batch_falls_back_on_415():
+    server = WebhookServer(accept_compressed=False)
+    connector = make_connector(server.url, compression='gzip', compress_min_bytes=0, batch_size=2)
+    try:
+        results = connector.push_leads_batch([LEAD] * 4)
+    finally:
+        connector.close()
+        server.stop()
+
+    assert results['success'] == 4
+    assert connector.compression == ''
+    assert server.requests[0] == 'gzip'
+    assert server.requests[-1] is None
+
+
+def test_fully_rejected_chunk_is_not_resent():
+    server = WebhookServer(reject_all=True)
+    connector = make_connector(server.url, batch_size=2)
+    try:
+        results = connector.push_leads_batch([dict(LEAD, Name='')] * 4)
+    finally:
+        connector.close()
+        server.stop()
+
+    assert (results['success'], results['failed']) == (0, 4)
+    assert [chunk['attempts'] for chunk in results['chunks']] == [1, 1]
+    assert len(server.requests) == 2
+
+
+def test_retry_after_seconds():
+    assert retry_after_seconds('3') == 3.0
+    assert retry_after_seconds('-5') == 0.0
+    assert retry_after_seconds('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+    assert retry_after_seconds('soon') is None
+    assert retry_after_seconds(None) is None
+
+
+def test_token_bucket_paces_requests():
+    async def take(count):
+        bucket = TokenBucket(rate=50, capacity=1)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        for _ in range(count):
+            await bucket.acquire()
+        return loop.time() - started
+
+    assert asyncio.run(take(6)) >= 0.09
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# =================================================================
+# 🧪 TEST BULK IMPORT LEADS - per-file completion in the manifest
+# =================================================================
+
+import pytest
+
+pytest.importorskip('requests')
+pytest.importorskip('numpy')
+
+from bulk_import_leads import DubaiLeadsBulkImporter
+
+HEADER = 'Name,Category,Phone,Email,Website,Priority,Quality Score\n'
+
+
+@pytest.fixture
+def importer(tmp_path):
+    (tmp_path / 'fresh-dubai-businesses-a.csv').write_text(
+        HEADER + 'Al Noor Trading,Trading,04 123 4567,,,,\nGulf Group,Holding,04 222 3333,,,,\n', encoding='utf-8')
+    (tmp_path / 'fresh-dubai-businesses-b.csv').write_text(
+        HEADER + 'Broken Lead,Trading,04 777 8888,,,,\n', encoding='utf-8')
+
+    importer = DubaiLeadsBulkImporter(webhook_url='https://crm.example/hook/a', results_dir=str(tmp_path))
+    importer.sent = []
+
+    def send(lead):
+        if lead['Name'] == 'Broken Lead':
+            return False, 'HTTP 500: boom'
+        importer.sent.append(lead['Name'])
+        return True, 'Success'
+
+    importer.send_lead_to_webhook = send
+    yield importer
+    importer.manifest.close()
+
+
+def test_only_files_with_failed_leads_stay_pending(importer, tmp_path):
+    importer.run_bulk_import()
+
+    assert sorted(importer.sent) == ['Al Noor Trading', 'Gulf Group']
+    assert importer.manifest.pending_files(importer.get_all_csv_files()) == [
+        str(tmp_path / 'fresh-dubai-businesses-b.csv')]
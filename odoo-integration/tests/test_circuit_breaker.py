@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# =================================================================
+# 🧪 TEST CIRCUIT BREAKER - open, half-open and closed transitions
+# =================================================================
+
+import pytest
+
+import circuit_breaker
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitBreakerConnector
+from lead_outbox import LeadOutbox, OutboxConnector
+
+LEADS = [{'Name': f'Business {i}', 'Phone': f'04 123 45{i:02d}'} for i in range(7)]
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(circuit_breaker.time, 'monotonic', clock)
+    return clock
+
+
+class FlakyConnector:
+    """Batch pushes succeed while `up`; `fail_after` lets that many batches through first"""
+
+    batch_size = 2
+
+    def __init__(self):
+        self.up = True
+        self.fail_after = None
+        self.batches = []
+
+    def push_lead(self, lead):
+        return self.up
+
+    def push_leads_batch(self, leads):
+        if not self.up or (self.fail_after is not None and len(self.batches) >= self.fail_after):
+            raise ConnectionError('CRM unreachable')
+        self.batches.append([lead['Name'] for lead in leads])
+        return {'success': len(leads), 'failed': 0}
+
+
+@pytest.fixture
+def guarded(tmp_path, clock):
+    crm = FlakyConnector()
+    outbox = LeadOutbox(str(tmp_path / 'outbox.db'))
+    connector = CircuitBreakerConnector(OutboxConnector(crm, outbox),
+                                        CircuitBreaker(failure_threshold=2, reset_timeout=30))
+    yield crm, connector
+    outbox.close()
+
+
+def test_breaker_transitions(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+    assert breaker.state == CLOSED and breaker.allow_request()
+
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    assert breaker.consecutive_failures == 0
+
+    for _ in range(3):
+        breaker.record_failure()
+    assert breaker.state == OPEN and not breaker.allow_request()
+
+    clock.now += 30
+    assert breaker.allow_request() and breaker.state == HALF_OPEN
+
+    breaker.record_failure()
+    assert breaker.state == OPEN and breaker.times_opened == 2
+    assert not breaker.allow_request()
+
+    clock.now += 30
+    assert breaker.allow_request()
+    assert breaker.record_success() is True
+    assert breaker.state == CLOSED
+
+
+def test_open_circuit_spools_without_calling_the_crm(guarded, clock):
+    crm, connector = guarded
+    crm.up = False
+
+    assert not connector.push_lead(LEADS[0])
+    assert not connector.push_lead(LEADS[1])
+    assert connector.breaker.state == OPEN
+
+    assert not connector.push_lead(LEADS[2])
+    assert connector.stats()['spooled'] == 1
+    assert connector.stats()['spool_depth'] == 3
+
+
+def test_recovery_drains_spool_in_chunks(guarded, clock):
+    crm, connector = guarded
+    crm.up = False
+    for lead in LEADS:
+        connector.push_lead(lead)
+    assert connector.breaker.state == OPEN
+
+    crm.up = True
+    clock.now += 30
+    assert connector.push_lead(LEADS[0])
+
+    assert connector.breaker.state == CLOSED
+    assert all(len(batch) <= crm.batch_size for batch in crm.batches)
+    assert sorted(name for batch in crm.batches for name in batch) == [lead['Name'] for lead in LEADS[1:]]
+    assert connector.outbox.undelivered() == 0
+
+
+def test_relapse_during_drain_stops_and_counts(guarded, clock):
+    crm, connector = guarded
+    crm.up = False
+    for lead in LEADS:
+        connector.push_lead(lead)
+
+    crm.up, crm.fail_after = True, 1
+    clock.now += 30
+    connector.push_lead(LEADS[0])
+
+    assert len(crm.batches) == 1
+    assert connector.breaker.consecutive_failures == 1
+    assert connector.outbox.undelivered() == len(LEADS) - 1 - crm.batch_size
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# =================================================================
+# 🧪 TEST IMPORT MANIFEST - file and row skip state across runs
+# =================================================================
+
+import os
+import shutil
+import sqlite3
+
+import pytest
+
+from import_manifest import ImportManifest, row_hash
+
+LEAD = {'Name': 'Al Noor Trading LLC', 'Phone': '04 123 4567', 'Email': 'info@alnoor.ae',
+        'Timestamp': '2025-01-01T10:00:00'}
+
+
+@pytest.fixture
+def leads_csv(tmp_path):
+    path = tmp_path / 'leads.csv'
+    path.write_text('Name,Phone\nAl Noor Trading LLC,04 123 4567\n', encoding='utf-8')
+    return str(path)
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    manifest = ImportManifest(str(tmp_path / 'manifest' / 'import.db'), flush_every=2)
+    yield manifest
+    manifest.close()
+
+
+def test_row_hash_excludes_timestamps():
+    assert row_hash(dict(LEAD, Timestamp='2025-03-01T08:00:00')) == row_hash(LEAD)
+    assert row_hash(dict(LEAD, Email='sales@alnoor.ae')) != row_hash(LEAD)
+
+
+def test_complete_file_and_its_copies_are_skipped(manifest, leads_csv, tmp_path):
+    assert manifest.pending_files([leads_csv]) == [leads_csv]
+    manifest.mark_file(leads_csv, complete=False)
+    assert manifest.pending_files([leads_csv]) == [leads_csv]
+
+    manifest.mark_file(leads_csv)
+    assert manifest.pending_files([leads_csv]) == []
+
+    copy = str(tmp_path / 'copy.csv')
+    shutil.copy(leads_csv, copy)
+    assert manifest.pending_files([copy]) == []
+
+
+def test_changed_file_is_pending_again(manifest, leads_csv):
+    manifest.pending_files([leads_csv])
+    manifest.mark_file(leads_csv)
+
+    with open(leads_csv, 'a', encoding='utf-8') as f:
+        f.write('Gulf Group,04 222 3333\n')
+    stat = os.stat(leads_csv)
+    os.utime(leads_csv, (stat.st_atime, stat.st_mtime + 5))
+
+    assert manifest.pending_files([leads_csv]) == [leads_csv]
+
+
+def test_rows_are_buffered_and_sent_is_sticky(manifest):
+    manifest.record(LEAD, True)
+    assert not manifest.is_delivered(LEAD), 'buffered until flush_every rows'
+
+    manifest.record(dict(LEAD, Name='Gulf Group', Phone='04 222 3333'), False)
+    assert manifest.is_delivered(LEAD)
+    assert not manifest.is_delivered(dict(LEAD, Name='Gulf Group', Phone='04 222 3333'))
+
+    manifest.record(LEAD, False)
+    manifest.flush()
+    assert manifest.is_delivered(LEAD), 'a later failure does not undo a delivery'
+
+
+def test_state_survives_reopen(tmp_path, leads_csv):
+    path = str(tmp_path / 'import.db')
+    first = ImportManifest(path)
+    first.pending_files([leads_csv])
+    first.record(LEAD, True)
+    first.mark_file(leads_csv)
+    first.close()
+
+    reopened = ImportManifest(path)
+    assert reopened.is_delivered(LEAD)
+    assert reopened.pending_files([leads_csv]) == []
+    reopened.close()
+
+
+def test_destinations_are_tracked_separately(tmp_path, leads_csv):
+    path = str(tmp_path / 'import.db')
+    first = ImportManifest(path, destination='https://crm.example/hook/a')
+    first.pending_files([leads_csv])
+    first.record(LEAD, True)
+    first.mark_file(leads_csv)
+    first.close()
+
+    other = ImportManifest(path, destination='https://crm.example/hook/b')
+    assert other.pending_files([leads_csv]) == [leads_csv]
+    assert not other.is_delivered(LEAD)
+    other.close()
+
+    same = ImportManifest(path, destination='https://crm.example/hook/a')
+    assert same.pending_files([leads_csv]) == []
+    assert same.is_delivered(LEAD)
+    same.close()
+
+
+def test_legacy_manifest_without_destination_starts_afresh(tmp_path, leads_csv):
+    path = str(tmp_path / 'import.db')
+    legacy = sqlite3.connect(path)
+    legacy.executescript("""
+        CREATE TABLE files (path TEXT PRIMARY KEY, sha256 TEXT NOT NULL, size INTEGER NOT NULL,
+                            mtime REAL NOT NULL, complete INTEGER NOT NULL DEFAULT 0, imported_at TEXT);
+        CREATE TABLE rows (row_hash TEXT PRIMARY KEY, status TEXT NOT NULL, updated_at TEXT NOT NULL);
+    """)
+    legacy.close()
+
+    manifest = ImportManifest(path, destination='https://crm.example/hook/a')
+    assert manifest.pending_files([leads_csv]) == [leads_csv]
+    manifest.close()
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+# =================================================================
+# 🧪 TEST IMPORT OLD LEADS - concurrent pushes through the async connector
+# =================================================================
+
+import pytest
+
+pytest.importorskip('aiohttp')
+pytest.importorskip('requests')
+
+from import_old_leads import OldLeadsImporter
+from webhook_server import WebhookServer
+
+HEADER = 'Name,Category,Phone,Email,Website,Priority,Quality Score\n'
+
+
+def test_file_is_pushed_once_and_recorded(tmp_path):
+    csv_file = tmp_path / 'fresh-dubai-businesses-a.csv'
+    csv_file.write_text(HEADER + ''.join(f'Business {i},Trading,04 123 45{i:02d},,,,\n' for i in range(6)),
+                        encoding='utf-8')
+    server = WebhookServer()
+    importer = OldLeadsImporter(server.url, results_dir=str(tmp_path),
+                                webhook_settings={'rate_limit': 0, 'max_in_flight': 4})
+    try:
+        assert importer.run(file_count=1)
+        assert importer.manifest.pending_files([str(csv_file)]) == []
+        assert importer.run(file_count=1)
+    finally:
+        importer.connector.close()
+        importer.manifest.close()
+        server.stop()
+
+    assert (importer.imported_count, importer.failed_count) == (6, 0)
+    assert len(server.requests) == 6
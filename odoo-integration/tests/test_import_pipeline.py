@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# =================================================================
+# 🧪 TEST IMPORT PIPELINE - AIMD rate window and streaming stages
+# =================================================================
+
+import threading
+
+from import_pipeline import AdaptiveRateController, ImportPipeline
+from lead_dedup import LeadDeduplicator
+
+
+def test_window_grows_one_slot_per_window_of_fast_requests():
+    controller = AdaptiveRateController(initial=4, max_limit=5, target_latency=0.5)
+    for _ in range(4):
+        controller.acquire()
+        controller.release(0.1, True)
+    assert 4.9 < controller.limit < 5
+
+    for _ in range(20):
+        controller.acquire()
+        controller.release(0.1, True)
+    assert controller.limit == 5
+
+
+def test_window_halves_once_per_burst_and_respects_floor():
+    controller = AdaptiveRateController(initial=8, min_limit=2, target_latency=0.5)
+    controller.since_decrease = 8
+
+    controller.release(0.1, False)
+    assert controller.limit == 4
+    for _ in range(3):
+        controller.release(0.1, False)
+    assert controller.limit == 4, 'a burst of errors within one window halves only once'
+
+    controller.release(2.0, True)
+    assert controller.limit == 2
+    controller.since_decrease = 10
+    controller.release(0.1, False)
+    assert controller.limit == 2
+
+
+def test_slow_but_successful_requests_hold_the_window():
+    controller = AdaptiveRateController(initial=4, target_latency=0.5)
+    controller.release(0.8, True)
+    assert controller.limit == 4
+
+
+def test_acquire_blocks_at_the_limit():
+    controller = AdaptiveRateController(initial=1)
+    controller.acquire()
+    acquired = threading.Event()
+    waiter = threading.Thread(target=lambda: (controller.acquire(), acquired.set()))
+    waiter.start()
+
+    assert not acquired.wait(0.1)
+    controller.release(0.1, True)
+    assert acquired.wait(1)
+    waiter.join()
+
+
+def test_pipeline_runs_every_stage(tmp_path):
+    rows = [
+        {'Name': 'Al Noor Trading', 'Phone': '04 123 4567'},
+        {'Name': 'Al Noor Trading LLC', 'Phone': '+971 4 123 4567', 'Email': 'info@alnoor.ae'},
+        {'Name': '', 'Phone': '04 000 0000'},
+        {'Name': 'Gulf Group', 'Phone': '04 222 3333'},
+        {'Name': 'Smith & Sons', 'Phone': '04 555 6666'},
+        {'Name': 'Broken Lead', 'Phone': '04 777 8888'},
+    ]
+    sent, results = [], []
+    lock = threading.Lock()
+
+    def send(lead):
+        if lead['Name'] == 'Broken Lead':
+            raise ConnectionError('CRM unreachable')
+        with lock:
+            sent.append(lead['Name'])
+        return True, 'ok'
+
+    pipeline = ImportPipeline(
+        send,
+        normalize=lambda row: row if row['Name'] else None,
+        skip=lambda lead: lead['Name'] == 'Gulf Group',
+        dedup=LeadDeduplicator(),
+        max_workers=4,
+        on_result=lambda lead, ok, message: results.append((lead['Name'], ok, message)),
+    )
+    counts = pipeline.run([], rows=(('leads.csv', row) for row in rows))
+
+    assert sorted(sent) == ['Al Noor Trading LLC', 'Smith & Sons']
+    assert ('Broken Lead', False, 'Exception: CRM unreachable') in results
+    assert {key: counts[key] for key in ('read', 'invalid', 'duplicates', 'unchanged', 'sent', 'failed')} == {
+        'read': 6, 'invalid': 1, 'duplicates': 1, 'unchanged': 1, 'sent': 2, 'failed': 1}
+    assert pipeline.controller.in_flight == 0
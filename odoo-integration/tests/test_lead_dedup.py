@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# =================================================================
+# 🧪 TEST LEAD DEDUP - linking, conflict refusal and merging
+# =================================================================
+
+from lead_dedup import LeadDeduplicator, dedup_leads, lead_keys, merge_group
+from lead_identity import clean_value, identity_keys
+
+
+def test_clean_value_drops_placeholders():
+    assert clean_value('  "Al Noor"  ') == 'Al Noor'
+    assert clean_value('Not available') == ''
+    assert clean_value(None) == ''
+
+
+def test_lead_keys_are_identity_keys_without_short_names():
+    lead = {'Name': 'Al Noor Trading LLC', 'Phone': '04 123 4567', 'Website': 'alnoor.ae'}
+    assert lead_keys(lead) == identity_keys(lead)
+    assert lead_keys({'Name': 'ABC LLC'}) == []
+
+
+def test_shared_phone_or_domain_links_records():
+    leads = [
+        {'Name': 'Al Noor Trading LLC', 'Phone': '04 123 4567'},
+        {'Name': 'Al-Noor Trading Co.', 'Phone': '+971 4 123 4567', 'Website': 'alnoor.ae'},
+        {'Name': 'Noor Group', 'Website': 'https://www.alnoor.ae/about'},
+    ]
+    assert len(dedup_leads(leads)) == 1
+
+
+def test_name_only_link_refused_when_phone_conflicts():
+    dedup = LeadDeduplicator()
+    dedup.add({'Name': 'Al Noor Trading LLC', 'Phone': '04 123 4567'})
+    dedup.add({'Name': 'Al Noor Trading', 'Phone': '04 765 4321'})
+    assert dedup.businesses == 2
+
+
+def test_name_only_link_refused_when_domain_conflicts():
+    dedup = LeadDeduplicator()
+    dedup.add({'Name': 'Al Noor Trading LLC', 'Website': 'alnoor.ae'})
+    dedup.add({'Name': 'Al Noor Trading', 'Website': 'alnoor-gold.ae'})
+    assert dedup.businesses == 2
+
+
+def test_name_link_kept_without_conflicting_contacts():
+    dedup = LeadDeduplicator()
+    dedup.add({'Name': 'Al Noor Trading LLC', 'Phone': '04 123 4567'})
+    dedup.add({'Name': 'Al Noor Trading', 'Website': 'alnoor.ae'})
+    assert dedup.businesses == 1 and dedup.duplicates == 1
+
+
+def test_merge_fills_gaps_and_keeps_best_rating():
+    merged = merge_group([
+        {'Name': 'Al Noor Trading', 'Phone': '04 123 4567', 'Email': 'Not available',
+         'Priority': 'MEDIUM', 'Quality Score': '6'},
+        {'Name': 'Al Noor Trading LLC', 'Phone': '04 123 4567', 'Email': 'info@alnoor.ae',
+         'Website': 'alnoor.ae', 'Priority': 'HIGH', 'Quality Score': '5'},
+        {'Name': 'Al Noor', 'Address': 'Deira, Dubai', 'Priority': 'unknown', 'Quality Score': 'n/a'},
+    ])
+
+    assert merged['Name'] == 'Al Noor Trading LLC'
+    assert merged['Email'] == 'info@alnoor.ae'
+    assert merged['Address'] == 'Deira, Dubai'
+    assert merged['Priority'] == 'HIGH'
+    assert merged['Quality Score'] == '6'
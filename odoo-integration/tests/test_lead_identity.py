@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# =================================================================
+# 🧪 TEST LEAD IDENTITY - identity keys, idempotency and Odoo upserts
+# =================================================================
+
+from fake_odoo import FakeOdoo, make_connector
+from lead_identity import (canonical_identity, contacts_conflict, external_id_name, external_id_names,
+                           idempotency_key, identity_keys, normalize_name, normalize_phone, website_domain)
+
+LEAD = {
+    'Name': 'Al Noor Trading LLC',
+    'Category': 'Trading',
+    'Phone': '04 123 4567',
+    'Email': 'info@alnoor.ae',
+    'Website': 'https://www.alnoor.ae/contact',
+    'Address': 'Deira, Dubai',
+    'Priority': 'HIGH',
+    'Quality Score': '8',
+    'Timestamp': '2025-01-01T10:00:00',
+}
+
+
+def test_normalizers():
+    assert normalize_phone('04 123 4567') == '+97141234567'
+    assert normalize_phone('+971 4 123 4567') == '+97141234567'
+    assert normalize_phone('00971 50 123 4567') == '+971501234567'
+    assert normalize_phone('Not available') == ''
+    assert website_domain('https://www.alnoor.ae/contact') == 'alnoor.ae'
+    assert website_domain('https://facebook.com/alnoor') == ''
+    assert normalize_name('Al Noor Trading LLC') == 'al-noor'
+    assert normalize_name('Trading Co') == 'trading-co'
+
+
+def test_identity_keys_strongest_first():
+    assert identity_keys(LEAD) == [('phone', '+97141234567'), ('domain', 'alnoor.ae'), ('name', 'al-noor')]
+    assert canonical_identity(dict(LEAD, **{'Place ID': 'ChIJ123'})) == ('place', 'ChIJ123')
+    assert canonical_identity({'Phone': 'Not available'}) is None
+
+
+def test_external_ids_survive_a_stronger_key():
+    name_only = {'Name': LEAD['Name']}
+    with_phone = dict(name_only, Phone=LEAD['Phone'])
+
+    assert external_id_name(name_only, 'lead') != external_id_name(with_phone, 'lead')
+    assert external_id_names(name_only, 'lead')[0] in external_id_names(with_phone, 'lead')
+
+
+def test_idempotency_key_ignores_volatile_fields():
+    rescraped = dict(LEAD, Timestamp='2025-02-01T09:30:00', scraped_at='2025-02-01', **{'Import Source': 'x.csv'})
+    assert idempotency_key(rescraped) == idempotency_key(LEAD)
+
+
+def test_idempotency_key_changes_with_content():
+    assert idempotency_key(dict(LEAD, Email='sales@alnoor.ae')) != idempotency_key(LEAD)
+
+
+def test_contacts_conflict_needs_both_sides():
+    assert contacts_conflict(LEAD, '+971 4 999 9999', False)
+    assert contacts_conflict(LEAD, False, 'https://other.ae')
+    assert not contacts_conflict(LEAD, False, False)
+    assert not contacts_conflict(LEAD, '04-1234567', 'alnoor.ae')
+
+
+def test_push_adopts_records_created_before_external_ids():
+    odoo = FakeOdoo(
+        partners={1: {'name': LEAD['Name'], 'phone': LEAD['Phone'], 'website': LEAD['Website']}},
+        leads={2: {'name': 'Al Noor Trading LLC - Dubai Lead', 'partner_id': 1}},
+    )
+    connector = make_connector(odoo)
+
+    assert connector.push_lead(dict(LEAD))
+    assert set(odoo.records['res.partner']) == {1}
+    assert set(odoo.records['crm.lead']) == {2}
+    assert {odoo.xml_ids[name] for _, name in external_id_names(LEAD, 'partner')} == {1}
+    assert {odoo.xml_ids[name] for _, name in external_id_names(LEAD, 'lead')} == {2}
+
+
+def test_lead_that_gains_a_phone_is_not_duplicated():
+    odoo = FakeOdoo()
+    connector = make_connector(odoo)
+    name_only = {'Name': LEAD['Name'], 'Category': 'Trading'}
+
+    assert connector.push_lead(dict(name_only))
+    assert connector.push_lead(dict(name_only, Phone=LEAD['Phone']))
+    assert len(odoo.records['res.partner']) == 1
+    assert len(odoo.records['crm.lead']) == 1
+
+
+def test_same_name_with_different_phone_is_a_new_business():
+    odoo = FakeOdoo()
+    connector = make_connector(odoo)
+
+    assert connector.push_lead(dict(LEAD))
+    assert connector.push_lead(dict(LEAD, Phone='04 765 4321', Website=''))
+    assert len(odoo.records['res.partner']) == 2
+    assert len(odoo.records['crm.lead']) == 2
+    assert [partner['phone'] for partner in odoo.records['res.partner'].values()] == [LEAD['Phone'], '04 765 4321']
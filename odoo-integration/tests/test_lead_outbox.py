@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# =================================================================
+# 🧪 TEST LEAD OUTBOX - claim, send and retry states
+# =================================================================
+
+import time
+from datetime import datetime
+
+import pytest
+
+from lead_outbox import FAILED, IN_FLIGHT, PENDING, SUCCEEDED, LeadOutbox, OutboxConnector
+
+LEADS = [{'Name': f'Business {i}', 'Phone': f'04 123 45{i:02d}'} for i in range(4)]
+
+
+class FakeConnector:
+    """Records pushes; fails while `down` is set"""
+
+    batch_size = 2
+
+    def __init__(self):
+        self.down = False
+        self.pushed = []
+
+    def push_lead(self, lead):
+        if self.down:
+            return False
+        self.pushed.append(lead['Name'])
+        return True
+
+    def push_leads_batch(self, leads):
+        if self.down:
+            raise ConnectionError('CRM unreachable')
+        self.pushed.extend(lead['Name'] for lead in leads)
+        return {'success': len(leads), 'failed': 0}
+
+
+@pytest.fixture
+def outbox(tmp_path):
+    outbox = LeadOutbox(str(tmp_path / 'outbox.db'), max_attempts=3, lease_timeout=60)
+    yield outbox
+    outbox.close()
+
+
+def backdate(outbox, key, seconds):
+    stamp = datetime.fromtimestamp(time.time() - seconds).isoformat()
+    outbox.conn.execute("UPDATE outbox SET updated_at = ? WHERE lead_key = ?", (stamp, key))
+
+
+def test_claim_moves_pending_to_in_flight(outbox):
+    keys = outbox.enqueue(LEADS)
+    claimed = outbox.claim(2)
+
+    assert [key for key, _ in claimed] == keys[:2]
+    assert claimed[0][1] == LEADS[0]
+    assert outbox.state(keys[0]) == IN_FLIGHT
+    assert outbox.state(keys[2]) == PENDING
+    assert outbox.claim(10, keys=keys[:2]) == []
+
+
+def test_success_and_unchanged_reenqueue(outbox):
+    key = outbox.enqueue(LEADS[:1])[0]
+    outbox.claim(1)
+    outbox.mark_succeeded([key])
+    assert outbox.state(key) == SUCCEEDED
+
+    outbox.enqueue(LEADS[:1])
+    assert outbox.state(key) == SUCCEEDED
+    outbox.enqueue([dict(LEADS[0], Email='info@business0.ae')])
+    assert outbox.state(key) == PENDING
+
+
+def test_failed_lead_waits_for_backoff_then_dies(outbox):
+    key = outbox.enqueue(LEADS[:1])[0]
+
+    for attempt in range(1, 4):
+        assert outbox.claim(1, ignore_schedule=True), f'attempt {attempt} not claimable'
+        outbox.mark_failed([key], 'HTTP 503')
+        assert outbox.state(key) == FAILED
+        assert outbox.claim(1) == []
+
+    assert outbox.claim(1, ignore_schedule=True) == []
+    assert outbox.counts()['dead'] == 1
+    assert outbox.undelivered() == 0
+
+    assert outbox.reset_failed() == 1
+    assert outbox.claim(1)
+
+
+def test_reenqueue_keeps_attempts_until_content_changes(outbox):
+    key = outbox.enqueue(LEADS[:1])[0]
+    for _ in range(3):
+        outbox.enqueue(LEADS[:1])
+        outbox.claim(1, ignore_schedule=True)
+        outbox.mark_failed([key], 'HTTP 503')
+
+    # Scraping the same lead again does not revive it
+    outbox.enqueue(LEADS[:1])
+    assert outbox.counts()['dead'] == 1
+    assert outbox.claim(1, ignore_schedule=True) == []
+
+    # New content is a new delivery with its own attempts
+    outbox.enqueue([dict(LEADS[0], Email='info@business0.ae')])
+    assert outbox.state(key) == PENDING
+    assert outbox.claim(1)
+
+
+def test_abandoned_in_flight_lease_is_reclaimed(outbox):
+    key = outbox.enqueue(LEADS[:1])[0]
+    outbox.claim(1)
+    assert outbox.claim(1) == []
+
+    backdate(outbox, key, 120)
+    assert [claimed_key for claimed_key, _ in outbox.claim(1)] == [key]
+
+
+def test_push_lead_reports_only_delivered_leads(outbox):
+    connector = OutboxConnector(FakeConnector(), outbox)
+    assert connector.push_lead(LEADS[0])
+    assert connector.push_lead(LEADS[0])
+    assert connector.connector.pushed == ['Business 0']
+
+    # Another process claimed the lead and has not finished sending it
+    key = outbox.enqueue(LEADS[1:2])[0]
+    outbox.claim(1, keys=[key])
+    assert connector.push_lead(LEADS[1]) is False
+
+    # Its sender crashed: once the lease expires the lead is sent again
+    backdate(outbox, key, 120)
+    assert connector.push_lead(LEADS[1])
+    assert outbox.state(key) == SUCCEEDED
+
+
+def test_push_lead_failure_is_not_reported_as_delivered(outbox):
+    connector = OutboxConnector(FakeConnector(), outbox)
+    connector.connector.down = True
+
+    for _ in range(outbox.max_attempts):
+        assert connector.push_lead(LEADS[0]) is False
+    assert outbox.counts()['dead'] == 1
+
+    # Out of attempts: pushing the same lead again does not call the CRM
+    connector.connector.down = False
+    assert connector.push_lead(LEADS[0]) is False
+    assert connector.connector.pushed == []
+
+
+def test_drain_retries_failed_chunks(outbox):
+    connector = OutboxConnector(FakeConnector(), outbox)
+    connector.connector.down = True
+    results = connector.push_leads_batch(LEADS)
+    assert results['failed'] == 4 and results['undelivered'] == 4
+
+    connector.connector.down = False
+    results = connector.drain(ignore_schedule=True)
+    assert results == {'success': 4, 'failed': 0, 'undelivered': 0}
+    assert sorted(connector.connector.pushed) == [lead['Name'] for lead in LEADS]
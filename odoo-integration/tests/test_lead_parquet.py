@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+# =================================================================
+# 🧪 TEST LEAD PARQUET - typed columns and run-date partitions
+# =================================================================
+
+from datetime import date
+
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from lead_parquet import load_history, write_leads_parquet
+
+LEADS = [
+    {'Name': 'Al Noor Trading', 'Category': 'Trading', 'Phone': '04 123 4567', 'Priority': 'HIGH',
+     'Quality Score': '85', 'Timestamp': '2025-01-01T10:00:00Z'},
+    {'Name': 'Gulf Group', 'Category': 'Holding', 'Priority': 'LOW', 'Quality Score': 'n/a',
+     'Timestamp': 'yesterday'},
+]
+
+
+def test_write_and_load_partitions(tmp_path):
+    dataset = str(tmp_path / 'parquet')
+    first = write_leads_parquet(LEADS, dataset, run_date=date(2025, 1, 1), basename='run-1')
+    write_leads_parquet(LEADS[:1], dataset, run_date=date(2025, 1, 2), basename='run-2')
+
+    assert first.endswith('run_date=2025-01-01/run-1.parquet')
+    assert write_leads_parquet([], dataset) is None
+
+    table = load_history(dataset)
+    assert table.num_rows == 3
+
+    rows = load_history(dataset, columns=['Name', 'Quality Score', 'Timestamp'],
+                        since=date(2025, 1, 1), priority='low').to_pylist()
+    assert rows == [{'Name': 'Gulf Group', 'Quality Score': None, 'Timestamp': None}]
+
+    recent = load_history(dataset, columns=['Quality Score'], since=date(2025, 1, 2)).to_pylist()
+    assert recent == [{'Quality Score': 8}]
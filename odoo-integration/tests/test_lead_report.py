@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# =================================================================
+# 🧪 TEST LEAD REPORT - read_group breakdowns and distinct totals
+# =================================================================
+
+from datetime import datetime
+
+from odoo_crm_connector import OdooCRMConnector
+
+# Two leads; the first carries two tags, so a tag breakdown has three rows' worth of counts
+TAG_GROUPS = [
+    {'tag_ids': [1, 'Google Maps'], '__count': 2, 'expected_revenue': 0.0, 'probability': 10.0},
+    {'tag_ids': [2, 'Priority: HIGH'], '__count': 1, 'expected_revenue': 0.0, 'probability': 10.0},
+]
+
+
+class ReportModels:
+    def __init__(self, groups, count):
+        self.groups, self.count = groups, count
+        self.calls = []
+
+    def execute_kw(self, db, uid, password, model, method, args, kwargs=None):
+        self.calls.append(method)
+        if method == 'read_group':
+            return self.groups
+        if method == 'search_count':
+            return self.count
+        raise AssertionError(f'unexpected call {model}.{method}')
+
+
+def make_connector(models):
+    connector = OdooCRMConnector.__new__(OdooCRMConnector)
+    connector.db, connector.uid, connector.password = 'db', 1, 'key'
+    connector.models = models
+    return connector
+
+
+def test_many2many_breakdown_does_not_inflate_the_total():
+    connector = make_connector(ReportModels(TAG_GROUPS, count=2))
+    report = connector.get_lead_report(datetime(2025, 1, 1), datetime(2025, 1, 2), groupby=['tag'])
+
+    assert report['total_leads'] == 2
+    assert [(row['tag'], row['count']) for row in report['groups']] == [('Google Maps', 2), ('Priority: HIGH', 1)]
+
+
+def test_ungrouped_report_needs_one_round_trip():
+    models = ReportModels([{'__count': 5, 'expected_revenue': 100.0, 'probability': 20.0}], count=None)
+    report = make_connector(models).get_lead_report(datetime(2025, 1, 1), datetime(2025, 1, 2))
+
+    assert report['total_leads'] == 5
+    assert models.calls == ['read_group']
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# =================================================================
+# 🧪 TEST LEAD SCHEMA - column mapping, coercion and header rows
+# =================================================================
+
+from lead_schema import (LeadSchema, as_dict, coerce_priority, coerce_score, is_header_row, read_leads,
+                         record_from_mapping)
+
+HEADER = ['Name', 'Category', 'Phone', 'Email', 'Website', 'Priority', 'Quality Score']
+
+
+def write_csv(tmp_path, rows):
+    path = tmp_path / 'leads.csv'
+    path.write_text('\n'.join(','.join(row) for row in rows) + '\n', encoding='utf-8')
+    return str(path)
+
+
+def test_coercers():
+    assert coerce_score('8') == 8
+    assert coerce_score('85') == 8
+    assert coerce_score('-3') == 0
+    assert coerce_score('n/a') is None
+    assert coerce_priority(' very high ') == 'URGENT'
+    assert coerce_priority('medium') == 'MEDIUM'
+    assert coerce_priority('someday') == ''
+
+
+def test_schema_maps_aliases_and_placeholders():
+    schema = LeadSchema(['﻿Company Name', 'Industry', 'Contact Number', 'Emails', 'URL', 'Lead Score'])
+    record = schema.record(['Al Noor Trading', 'Trading', 'Not available', 'info', 'alnoor.ae', '72'])
+
+    assert record.name == 'Al Noor Trading'
+    assert record.category == 'Trading'
+    assert record.phone == '' and record.email == ''
+    assert record.quality_score == 7
+    assert record.priority == ''
+    assert 'Priority' in schema.missing
+
+
+def test_record_from_mapping_takes_first_list_entry():
+    record = record_from_mapping({'businessName': 'Gulf Group', 'additionalEmails': ['a@gulf.ae', 'b@gulf.ae'],
+                                  'phone': None, 'leadScore': 9})
+    assert as_dict(record)['Email'] == 'a@gulf.ae'
+    assert record.phone == ''
+    assert record.quality_score == 9
+
+
+def test_is_header_row():
+    assert is_header_row(list(HEADER), HEADER)
+    assert is_header_row(['company', 'industry', 'phone number', ''], HEADER)
+    assert not is_header_row(['Company', 'Trading', '04 123 4567', '', '', 'HIGH', '8'], HEADER)
+    assert not is_header_row(['Company', '', '', '', '', '', ''], HEADER)
+
+
+def test_business_named_company_is_kept(tmp_path):
+    path = write_csv(tmp_path, [
+        HEADER,
+        ['Company', 'Trading', '04 123 4567', 'info@company.ae', '', 'HIGH', '8'],
+        ['Al Noor Trading', 'Trading', '04 765 4321', '', 'alnoor.ae', 'VERY HIGH', '90'],
+    ])
+
+    records = list(read_leads(path))
+    assert [record.name for record in records] == ['Company', 'Al Noor Trading']
+    assert records[1].priority == 'URGENT' and records[1].quality_score == 9
+
+
+def test_repeated_and_new_section_headers(tmp_path):
+    path = write_csv(tmp_path, [
+        HEADER,
+        ['Al Noor Trading', 'Trading', '04 123 4567', '', '', 'HIGH', '8'],
+        HEADER,
+        ['Gulf Group', 'Holding', '04 222 3333', '', '', 'LOW', '3'],
+        ['Company', 'Phone Number', 'Industry'],
+        ['Smith & Sons', '050 123 4567', 'Retail'],
+    ])
+
+    records = list(read_leads(path))
+    assert [record.name for record in records] == ['Al Noor Trading', 'Gulf Group', 'Smith & Sons']
+    assert records[2].phone == '050 123 4567' and records[2].category == 'Retail'
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# =================================================================
+# 🧪 TEST LEAD SCORING - parity with the old per-lead scalar rules
+# =================================================================
+# The reference functions below are the scalar rules lead_scoring
+# replaced (google_maps_scraper.calculate_priority / calculate_quality_score
+# and the bulk importer's clean_lead_data), run over every combination of
+# the values and placeholders the scrapers write.
+
+from itertools import product
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from lead_scoring import (CONTACT_COUNT, EMAIL_WEIGHTED, lead_priority, lead_quality_score, score_leads,
+                          score_summary)
+
+PHONES = ['04 123 4567', 'Contact via website', 'Not available']
+WEBSITES = ['https://alnoor.ae', 'Not available', '']
+EMAILS = ['info@alnoor.ae', 'Not available', '']
+CATEGORIES = ['Trading', 'N/A', '']
+
+COMBINATIONS = list(product(PHONES, WEBSITES, EMAILS, CATEGORIES))
+
+
+def scraper_priority(phone, website, email):
+    has_phone = phone not in ["Contact via website", "Not available"]
+    has_website = website not in ["Not available", ""]
+    has_email = email not in ["Not available", ""]
+    return ['LOW', 'MEDIUM', 'HIGH', 'URGENT'][min(sum([has_phone, has_website, has_email]), 3)]
+
+
+def scraper_quality_score(phone, website, category, email):
+    score = 4
+    if phone not in ["Contact via website", "Not available"]:
+        score += 2
+    if website not in ["Not available", ""]:
+        score += 2
+    if email not in ["Not available", ""]:
+        score += 1
+    if category and category != "N/A":
+        score += 1
+    return min(score, 10)
+
+
+def importer_priority(phone, website, email):
+    # clean_lead_data worked on values already blanked of placeholders
+    phone, website, email = (value if value not in ('Contact via website', 'Not available', 'N/A') else ''
+                             for value in (phone, website, email))
+    if email and website and phone:
+        return 'URGENT'
+    if email and (website or phone):
+        return 'HIGH'
+    if email or website:
+        return 'MEDIUM'
+    return 'LOW'
+
+
+@pytest.mark.parametrize('phone,website,email,category', COMBINATIONS)
+def test_scalar_wrappers_match_old_rules(phone, website, email, category):
+    assert lead_priority(phone, website, email) == scraper_priority(phone, website, email)
+    assert lead_priority(phone, website, email, EMAIL_WEIGHTED) == importer_priority(phone, website, email)
+    assert lead_quality_score(phone, website, category, email) == scraper_quality_score(phone, website, category, email)
+
+
+@pytest.mark.parametrize('rule,reference', [(CONTACT_COUNT, scraper_priority), (EMAIL_WEIGHTED, importer_priority)])
+def test_vectorized_batch_matches_old_rules(rule, reference):
+    leads = [{'Phone': phone, 'Website': website, 'Email': email, 'Category': category}
+             for phone, website, email, category in COMBINATIONS]
+    score_leads(leads, rule)
+
+    for lead, (phone, website, email, category) in zip(leads, COMBINATIONS):
+        assert lead['Priority'] == reference(phone, website, email)
+        assert lead['Quality Score'] == scraper_quality_score(phone, website, category, email)
+
+
+def test_fill_missing_only_keeps_existing_values():
+    leads = [{'Phone': '04 123 4567', 'Priority': 'LOW', 'Quality Score': ''},
+             {'Phone': 'Not available', 'Priority': '', 'Quality Score': 9}]
+    score_leads(leads, fill_missing_only=True)
+
+    assert leads[0]['Priority'] == 'LOW' and leads[0]['Quality Score'] == 6
+    assert leads[1]['Priority'] == 'LOW' and leads[1]['Quality Score'] == 9
+
+
+def test_unknown_rule_is_rejected():
+    with pytest.raises(ValueError):
+        lead_priority('04 123 4567', '', '', rule='bogus')
+
+
+def test_score_summary():
+    leads = [
+        {'Priority': 'URGENT', 'Quality Score': '10', 'Email': 'a@b.ae', 'Website': 'b.ae'},
+        {'Priority': 'HIGH', 'Quality Score': '7.5', 'Email': 'Not available', 'Website': 'c.ae'},
+        {'Priority': 'LOW', 'Quality Score': 'n/a', 'Email': '', 'Website': ''},
+    ]
+    assert score_summary(leads) == {'total': 3, 'urgent': 1, 'high': 1, 'with_email': 1, 'with_website': 2,
+                                    'avg_quality': 8.75}
+    assert score_summary([])['avg_quality'] == 0.0
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# =================================================================
+# 🧪 TEST LEAD STORE - ingestion, cross-file merging and queries
+# =================================================================
+
+import json
+import os
+
+import pytest
+
+from lead_store import RESULTS_DIR, LeadStore, fts_query, json_items
+
+CSV = """Name,Category,Phone,Email,Website,Priority,Quality Score
+Al Noor Trading LLC,Trading,04 123 4567,Not available,,MEDIUM,6
+Al Noor Trading,Trading,04 765 4321,,,LOW,4
+Gulf Group Holding,Holding,04 222 3333,info@gulfgroup.ae,gulfgroup.ae,HIGH,8
+"""
+
+APOLLO = [{
+    'company': {'name': 'Al Noor Trading LLC', 'phone': '+971 4 123 4567', 'website': 'https://alnoor.ae',
+                'industry': 'Trading', 'city': 'Dubai'},
+    'executives': [{'name': 'Sara Ahmed', 'email': 'sara@alnoor.ae', 'position': 'CEO'}],
+    'scrapedAt': '2025-01-02T09:00:00Z',
+}, {'name': 'Omar Khalid', 'position': 'CFO', 'email': 'omar@gulfgroup.ae', 'company': 'undefined'}]
+
+
+@pytest.fixture
+def store(tmp_path):
+    (tmp_path / 'leads.csv').write_text(CSV, encoding='utf-8')
+    (tmp_path / 'apollo.json').write_text(json.dumps(APOLLO), encoding='utf-8')
+    store = LeadStore(str(tmp_path / 'store' / 'leads.db'))
+    store.paths = [str(tmp_path / 'leads.csv'), str(tmp_path / 'apollo.json')]
+    yield store
+    store.close()
+
+
+def test_default_results_dir_is_the_one_lead_store_js_reads():
+    repo = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    assert RESULTS_DIR == os.path.join(repo, 'results')
+
+
+def test_fts_query_quotes_and_prefixes():
+    assert fts_query('al "noor') == '"al"* """noor"*'
+
+
+def test_json_items_classifies_objects():
+    assert [kind for kind, _ in json_items({'results': APOLLO})] == ['company', 'executive']
+
+
+def test_ingest_merges_copies_across_files(store):
+    totals = store.ingest(store.paths)
+    assert totals == {'files': 2, 'skipped': 0, 'leads': 4, 'executives': 2}
+
+    # The Apollo company merged into the CSV row sharing its phone; the namesake branch stayed apart
+    assert store.stats()['leads'] == 3
+    al_noor = store.lookup(phone='04 123 4567')
+    assert al_noor['website'] == 'https://alnoor.ae'
+    assert al_noor['priority'] == 'MEDIUM' and al_noor['quality_score'] == 6
+    assert store.lookup(phone='04 765 4321')['id'] != al_noor['id']
+
+    assert store.ingest(store.paths) == {'files': 0, 'skipped': 2, 'leads': 0, 'executives': 0}
+
+
+def test_executives_are_linked_to_their_company(store):
+    store.ingest(store.paths)
+    al_noor = store.lookup(website='alnoor.ae')
+    gulf = store.lookup(name='Gulf Group Holding')
+
+    assert [executive['name'] for executive in store.executives(al_noor['id'])] == ['Sara Ahmed']
+    assert [executive['name'] for executive in store.executives(gulf['id'])] == ['Omar Khalid']
+    assert store.stats()['linked_executives'] == 2
+
+
+def test_queries(store):
+    store.ingest(store.paths)
+
+    assert [lead['name'] for lead in store.find(has_email=True)] == ['Gulf Group Holding']
+    assert [lead['priority'] for lead in store.find()] == ['HIGH', 'MEDIUM', 'LOW']
+    assert [lead['name'] for lead in store.find(category='trading', min_score=5)] == ['Al Noor Trading LLC']
+    assert {lead['name'] for lead in store.search('noor trad')} == {'Al Noor Trading LLC', 'Al Noor Trading'}
+    assert store.search('  ') == []
+    assert len(list(store.iter_leads())) == 3
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# =================================================================
+# 🧪 TEST MATCH KEYS PARITY - addon match keys agree with lead_identity
+# =================================================================
+# The dubai_sme_webhook addon ships its own copy of the key normalization
+# (Odoo cannot import the connectors). These fixtures run through both
+# copies so the server-side matching cannot drift from the client keys
+# (conftest.py loads match_keys without the Odoo addon package).
+
+import pytest
+
+import match_keys
+from lead_identity import normalize_name, normalize_phone, website_domain
+
+PHONES = [
+    '04 123 4567', '+971 4 123 4567', '00971-4-1234567', '971501234567', '050 123 4567',
+    '501234567', '+44 20 7946 0958', '123', '', None, 'Not available', 'Contact via website',
+    'N/A', '"+971 4 555 0000"',
+]
+
+WEBSITES = [
+    'https://www.alnoor.ae/contact', 'alnoor.ae', 'HTTP://WWW.ALNOOR.AE', 'www.shop.alnoor.ae/',
+    'https://www.facebook.com/alnoor', 'https://maps.google.com/?cid=1', 'https://linktr.ee/x',
+    'localhost', '', None, 'Not available', 'none',
+]
+
+NAMES = [
+    'Al Noor Trading LLC', 'AL NOOR TRADING L.L.C.', 'Al-Noor Trading Co.', 'Smith & Sons FZ LLC',
+    'Trading Co', 'Gulf Group Holding Ltd', 'مؤسسة النور للتجارة', 'ABC DMCC', 'Est.', '', None,
+]
+
+
+@pytest.mark.parametrize('phone', PHONES)
+def test_phone_key_parity(phone):
+    assert match_keys.phone_key(phone) == normalize_phone(phone)
+
+
+@pytest.mark.parametrize('website', WEBSITES)
+def test_domain_key_parity(website):
+    assert match_keys.domain_key(website) == website_domain(website)
+
+
+@pytest.mark.parametrize('name', NAMES)
+def test_name_key_parity(name):
+    assert match_keys.name_key(name) == normalize_name(name)
+
+
+def test_lead_match_keys_parity():
+    lead = {'Name': 'Al Noor Trading LLC', 'Phone': '04 123 4567', 'Website': 'www.alnoor.ae'}
+    assert match_keys.lead_match_keys(lead) == {
+        'phone': normalize_phone(lead['Phone']),
+        'domain': website_domain(lead['Website']),
+        'name': normalize_name(lead['Name']),
+    }
+
+
+def test_server_only_rules():
+    # Odoo stores missing values as False and lead names carry the webhook suffix
+    assert match_keys.phone_key(False) == ''
+    assert match_keys.domain_key('false') == ''
+    assert match_keys.name_key('Al Noor Trading LLC - Dubai SME Lead') == normalize_name('Al Noor Trading LLC')
+
+
+def partner(name, phone='', website=''):
+    return {'sme_name_key': match_keys.name_key(name), 'sme_phone_key': match_keys.phone_key(phone),
+            'sme_domain_key': match_keys.domain_key(website), 'label': name}
+
+
+def test_pick_prefers_phone_then_domain_then_name():
+    records = [partner('Al Noor Trading'), partner('Other Name', website='alnoor.ae'),
+               partner('Third', phone='04 123 4567')]
+    index = match_keys.index_by_keys(records)
+
+    keys = match_keys.lead_match_keys({'Name': 'Al Noor Trading LLC', 'Phone': '04 123 4567', 'Website': 'alnoor.ae'})
+    assert match_keys.pick_by_keys(index, keys) is records[2]
+    assert match_keys.pick_by_keys(index, dict(keys, phone='')) is records[1]
+    assert match_keys.pick_by_keys(index, dict(keys, phone='', domain='')) is records[0]
+
+
+def test_name_match_refused_when_phone_or_domain_conflicts():
+    branch = partner('Al Noor Trading LLC', phone='04 123 4567', website='alnoor.ae')
+    index = match_keys.index_by_keys([branch])
+
+    other_phone = match_keys.lead_match_keys({'Name': 'Al Noor Trading', 'Phone': '04 765 4321'})
+    other_site = match_keys.lead_match_keys({'Name': 'Al Noor Trading', 'Website': 'alnoor-gold.ae'})
+    name_only = match_keys.lead_match_keys({'Name': 'Al Noor Trading'})
+
+    assert match_keys.pick_by_keys(index, other_phone) is None
+    assert match_keys.pick_by_keys(index, other_site) is None
+    assert match_keys.pick_by_keys(index, name_only) is branch
+
+
+def test_name_match_skips_to_a_compatible_partner():
+    first = partner('Al Noor Trading', phone='04 123 4567')
+    second = partner('Al Noor Trading')
+    index = match_keys.index_by_keys([first, second])
+
+    keys = match_keys.lead_match_keys({'Name': 'Al Noor Trading', 'Phone': '04 765 4321'})
+    assert match_keys.pick_by_keys(index, keys) is second
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# =================================================================
+# 🧪 TEST PUSH STATE - last pushed values and delta writes
+# =================================================================
+
+import pytest
+
+from fake_odoo import FakeOdoo, make_connector
+from lead_identity import external_id_name
+from push_state import PushStateStore, content_hash
+
+LEAD = {'Name': 'Al Noor Trading LLC', 'Category': 'Trading', 'Phone': '04 123 4567',
+        'Email': 'info@alnoor.ae', 'Priority': 'HIGH', 'Quality Score': '8'}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = PushStateStore(str(tmp_path / 'state' / 'push_state.db'))
+    yield store
+    store.close()
+
+
+def test_content_hash_ignores_key_order():
+    assert content_hash({'a': 1, 'b': 'x'}) == content_hash({'b': 'x', 'a': 1})
+    assert content_hash({'a': 1}) != content_hash({'a': 2})
+
+
+def test_record_get_and_forget(store):
+    assert store.get('lead_1') is None
+
+    store.record('lead_1', {'phone': '04 123 4567'}, res_id=7)
+    store.record('lead_2', {'phone': '04 765 4321'})
+    assert store.get('lead_1') == {'hash': content_hash({'phone': '04 123 4567'}),
+                                   'values': {'phone': '04 123 4567'}, 'res_id': 7}
+    assert set(store.get_many(['lead_1', 'lead_2', 'lead_3', ''])) == {'lead_1', 'lead_2'}
+
+    store.record('lead_1', {'phone': '04 999 9999'}, res_id=7)
+    assert store.get('lead_1')['values'] == {'phone': '04 999 9999'}
+
+    store.forget('lead_1')
+    assert store.get('lead_1') is None
+
+
+def test_state_survives_reopen(tmp_path):
+    path = str(tmp_path / 'push_state.db')
+    first = PushStateStore(path)
+    first.record('lead_1', {'phone': '04 123 4567'}, res_id=7)
+    first.close()
+
+    reopened = PushStateStore(path)
+    assert reopened.get('lead_1')['res_id'] == 7
+    reopened.close()
+
+
+def test_get_many_spans_parameter_chunks(store):
+    for i in range(1200):
+        store.record(f'lead_{i}', {'n': i}, res_id=i)
+    assert len(store.get_many([f'lead_{i}' for i in range(1200)])) == 1200
+
+
+def pushed(store):
+    odoo = FakeOdoo()
+    connector = make_connector(odoo, store)
+    assert connector.push_lead(dict(LEAD))
+    [lead_id] = odoo.records['crm.lead']
+    odoo.calls.clear()
+    return odoo, connector, lead_id
+
+
+def test_unchanged_lead_is_skipped_while_it_exists(store):
+    odoo, connector, _ = pushed(store)
+
+    assert connector.push_lead(dict(LEAD))
+    assert connector.push_leads_batch([dict(LEAD)])['skipped'] == 1
+    assert {(model, method) for model, method, _ in odoo.calls} == {('ir.model.data', 'search_read')}
+
+
+def test_lead_deleted_in_odoo_is_pushed_again(store):
+    odoo, connector, lead_id = pushed(store)
+    odoo.delete('crm.lead', lead_id)
+
+    assert connector.push_leads_batch([dict(LEAD)]) == {'success': 1, 'failed': 0, 'skipped': 0}
+    [new_id] = odoo.records['crm.lead']
+    assert new_id != lead_id
+    assert store.get(external_id_name(LEAD, 'lead'))['res_id'] == new_id
+
+
+def test_repush_keeps_contact_edits_made_in_odoo(store):
+    odoo, connector, lead_id = pushed(store)
+    odoo.records['crm.lead'][lead_id].update(phone='+971 50 999 9999', priority='3', website=False)
+
+    assert connector.push_lead(dict(LEAD, Email='sales@alnoor.ae', Priority='LOW', Website='alnoor.ae',
+                                    Category='Wholesale'))
+    lead = odoo.records['crm.lead'][lead_id]
+    assert lead['phone'] == '+971 50 999 9999'
+    assert lead['email_from'] == LEAD['Email']
+    assert lead['priority'] == '3'
+    assert lead['website'] == 'alnoor.ae'
+    assert 'Category: Wholesale' in lead['description']
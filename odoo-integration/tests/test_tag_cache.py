@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# =================================================================
+# 🧪 TEST TAG CACHE - webhook tag resolver and its invalidation
+# =================================================================
+# Drives the addon's tag_cache the way crm_tag.py does, against an
+# in-memory crm_tag table (conftest.py loads it without Odoo).
+
+from tag_cache import TagCache, normalize_tag_name, resolve_tags
+
+
+class TagTable:
+    """crm_tag rows plus the fingerprint query crm_tag.py runs"""
+
+    def __init__(self, names=()):
+        self.rows = {}
+        self.clock = 0
+        self.next_id = 0
+        self.loads = 0
+        self.creates = []
+        for name in names:
+            self.insert(name)
+
+    def insert(self, name):
+        self.clock += 1
+        self.next_id += 1
+        tag_id = self.next_id
+        self.rows[tag_id] = {'name': name, 'write_date': self.clock}
+        return tag_id
+
+    def rename(self, tag_id, name):
+        self.clock += 1
+        self.rows[tag_id] = {'name': name, 'write_date': self.clock}
+
+    def fingerprint(self):
+        return (len(self.rows), max((row['write_date'] for row in self.rows.values()), default=None),
+                max(self.rows, default=None))
+
+    def load(self):
+        self.loads += 1
+        return [(tag_id, row['name']) for tag_id, row in self.rows.items()]
+
+    def create(self, names):
+        self.creates.append(list(names))
+        for name in names:
+            self.insert(name)
+
+
+def resolver(table, cache):
+    lookup = lambda: cache.get('db', table.fingerprint(), table.load)
+    return lambda names: resolve_tags(names, lookup, table.create)
+
+
+def test_normalize_tag_name():
+    assert normalize_tag_name('  Google   Maps ') == 'google maps'
+    assert normalize_tag_name('PRIORITY: HIGH') == normalize_tag_name('Priority: high')
+    assert normalize_tag_name(None) == ''
+
+
+def test_resolves_existing_and_creates_missing_in_one_call():
+    table = TagTable(['Google Maps', 'Trading'])
+    resolve = resolver(table, TagCache())
+
+    tag_ids = resolve(['google maps', 'Priority: HIGH', ' Priority:  high ', 'Retail', '', '  '])
+
+    assert table.creates == [['Priority: HIGH', 'Retail']]
+    assert set(tag_ids) == {'google maps', 'priority: high', 'retail'}
+    assert tag_ids['google maps'] == 1
+    assert table.rows[tag_ids['retail']]['name'] == 'Retail'
+
+
+def test_steady_state_is_served_from_the_cache():
+    table = TagTable(['Google Maps', 'Trading'])
+    resolve = resolver(table, TagCache())
+
+    for _ in range(5):
+        resolve(['Google Maps', 'Trading'])
+    assert table.loads == 1
+    assert table.creates == []
+
+
+def test_changes_by_other_workers_invalidate_the_cache():
+    table = TagTable(['Google Maps'])
+    cache = TagCache()
+    resolve = resolver(table, cache)
+    assert resolve(['Google Maps']) == {'google maps': 1}
+
+    # Another worker renames the tag and adds one this worker has never seen
+    table.rename(1, 'Maps')
+    added = table.insert('Google Maps')
+
+    assert resolve(['Google Maps']) == {'google maps': added}
+    assert table.creates == []
+    assert table.loads == 2
+
+
+def test_deleted_tag_is_not_served_from_the_cache():
+    table = TagTable(['Google Maps', 'Trading'])
+    resolve = resolver(table, TagCache())
+    resolve(['Trading'])
+
+    del table.rows[2]
+    tag_ids = resolve(['Trading'])
+
+    assert table.creates == [['Trading']]
+    assert tag_ids['trading'] != 2
+
+
+def test_caches_are_per_database():
+    cache = TagCache()
+    first, second = TagTable(['Google Maps']), TagTable(['Trading', 'Google Maps'])
+
+    assert cache.get('db1', first.fingerprint(), first.load) == {'google maps': 1}
+    assert cache.get('db2', second.fingerprint(), second.load) == {'trading': 1, 'google maps': 2}
+    cache.clear('db1')
+    assert cache.get('db2', second.fingerprint(), second.load) == {'trading': 1, 'google maps': 2}
+    assert (first.loads, second.loads) == (1, 1)
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# =================================================================
+# 🧪 TEST WEBHOOK CRM CONNECTOR - chunked batch pushes
+# =================================================================
+
+import pytest
+
+pytest.importorskip('aiohttp')
+pytest.importorskip('requests')
+
+from webhook_crm_connector import OdooWebhookConnector
+from webhook_server import WebhookServer
+
+LEAD = {'Name': 'Al Noor Trading LLC', 'Phone': '04 123 4567', 'Category': 'Trading'}
+
+
+def test_batch_is_pushed_in_chunks():
+    server = WebhookServer()
+    connector = OdooWebhookConnector(server.url, webhook_settings={'batch_size': 2})
+    try:
+        results = connector.push_leads_batch([LEAD] * 5)
+    finally:
+        server.stop()
+
+    assert (results['success'], results['failed']) == (5, 0)
+    assert [chunk['size'] for chunk in results['chunks']] == [2, 2, 1]
+
+
+def test_fully_rejected_chunk_is_not_resent():
+    server = WebhookServer(reject_all=True)
+    connector = OdooWebhookConnector(server.url, webhook_settings={'batch_size': 2, 'chunk_retries': 2})
+    try:
+        results = connector.push_leads_batch([dict(LEAD, Name='')] * 4)
+    finally:
+        server.stop()
+
+    assert (results['success'], results['failed']) == (0, 4)
+    assert [chunk['attempts'] for chunk in results['chunks']] == [1, 1]
+    assert len(server.requests) == 2
+
+
+def test_failed_chunk_is_retried_by_chunk_retries_only():
+    server = WebhookServer(fail_status=503)
+    connector = OdooWebhookConnector(server.url, push_settings={'max_retries': 3, 'retry_backoff': 0},
+                                     webhook_settings={'batch_size': 2, 'chunk_retries': 1})
+    try:
+        results = connector.push_leads_batch([LEAD] * 2)
+    finally:
+        server.stop()
+
+    assert (results['success'], results['failed']) == (0, 2)
+    assert results['chunks'][0]['attempts'] == 2
+    assert len(server.requests) == 2
@@ -3,6 +3,7 @@
 # 🔄 WEBHOOK MONITOR - Check when server comes back online
 # =================================================================
 
+import os
 import requests
 import time
 from datetime import datetime
@@ -21,6 +22,20 @@ def check_webhook_status(url):
     except Exception as e:
         return None, f"Error: {str(e)}"
 
+def report_outbox(outbox_path="results/.crm_outbox.db"):
+    """Show how many leads are waiting in the CRM outbox"""
+    if not os.path.exists(outbox_path):
+        return
+    
+    from lead_outbox import LeadOutbox
+    outbox = LeadOutbox(outbox_path)
+    undelivered = outbox.undelivered()
+    outbox.close()
+    
+    if undelivered:
+        print(f"📮 {undelivered} lead(s) waiting in the CRM outbox")
+        print("📋 Re-send them with: python replay_outbox.py --rate 5")
+
 def monitor_webhook():
     """Monitor webhook status until it comes back online"""
     webhook_url = "http://scholarixglobal.com/web/hook/aa6e5d99-5030-4128-864f-9d9a35725c0f"
@@ -43,6 +58,7 @@ def monitor_webhook():
                 print(f"✅ {timestamp} - Status {status_code}: WEBHOOK ONLINE!")
                 print("\n🎉 SERVER IS BACK ONLINE!")
                 print("📋 You can now run: python webhook_diagnostics.py")
+                report_outbox()
                 break
             elif status_code == 500:
                 print(f"⚠️ {timestamp} - Status {status_code}: Server online but webhook needs config")
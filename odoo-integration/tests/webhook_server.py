@@ -0,0 +1,58 @@
+# =================================================================
+# 🧪 WEBHOOK SERVER - local aiohttp webhook shared by the connector tests
+# =================================================================
+
+import asyncio
+import json
+import threading
+
+from aiohttp import web
+
+
+class WebhookServer:
+    """Local aiohttp webhook on a background loop that records what it receives"""
+
+    def __init__(self, accept_compressed=True, reject_all=False, fail_status=None):
+        self.accept_compressed = accept_compressed
+        self.reject_all = reject_all
+        self.fail_status = fail_status
+        self.requests = []
+        self.connections = set()
+        self.loop = asyncio.new_event_loop()
+        self.ready = threading.Event()
+        threading.Thread(target=self._serve, daemon=True).start()
+        self.ready.wait(5)
+
+    async def _handle(self, request):
+        self.connections.add(request.transport.get_extra_info('peername'))
+        encoding = request.headers.get('Content-Encoding')
+        self.requests.append(encoding)
+        if self.fail_status:
+            return web.Response(status=self.fail_status, text='Service Unavailable')
+        if encoding and not self.accept_compressed:
+            return web.Response(status=415, text='Unsupported Media Type')
+        body = await request.read()
+        if not encoding:
+            payload = json.loads(body)
+            if self.reject_all:
+                # The dubai_sme_webhook controller's answer when no lead has a company name
+                rejected = list(range(len(payload.get('leads') or [payload])))
+                return web.json_response({'status': 'error', 'message': 'Company name is required',
+                                          'rejected': rejected}, status=422)
+        return web.json_response({'result': {'status': 'success', 'rejected': []}})
+
+    def _serve(self):
+        asyncio.set_event_loop(self.loop)
+        app = web.Application()
+        app.router.add_post('/hook', self._handle)
+        self.runner = web.AppRunner(app)
+        self.loop.run_until_complete(self.runner.setup())
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        self.loop.run_until_complete(site.start())
+        self.url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/hook"
+        self.ready.set()
+        self.loop.run_forever()
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self.runner.cleanup(), self.loop).result(5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
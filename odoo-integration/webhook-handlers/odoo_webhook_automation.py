@@ -43,6 +43,12 @@ class DubaiSMEWebhookController(http.Controller):
             if not lead_data.get('Name'):
                 return {'status': 'error', 'message': 'Name is required'}
             
+            # With the dubai_sme_webhook addon installed, queue the payload and
+            # let its cron worker create the partner and lead
+            if 'dubai.sme.lead.staging' in request.env:
+                staged = request.env['dubai.sme.lead.staging'].sudo().enqueue([lead_data])
+                return {'status': 'queued', 'staging_ids': staged.ids}
+            
             # Find or create partner
             partner_id = self._find_or_create_partner(lead_data)
             
@@ -192,6 +198,11 @@ def process_webhook_lead(lead_data):
         # Log the incoming data
         _logger.info(f"Processing Dubai SME lead: {lead_data.get('Name')}")
         
+        # Queue instead of processing inline when the dubai_sme_webhook addon is installed
+        if 'dubai.sme.lead.staging' in env:
+            staged = env['dubai.sme.lead.staging'].sudo().enqueue([lead_data])
+            return {'status': 'queued', 'staging_ids': staged.ids}
+        
         # Find or create partner
         partner_obj = env['res.partner']
         existing_partner = partner_obj.search([('name', '=', lead_data.get('Name'))], limit=1)
@@ -318,6 +329,7 @@ User: {env.user.name}
 # Place in data folder if creating a custom module
 # ====================================================================
 
+"""
 <?xml version="1.0" encoding="utf-8"?>
 <odoo>
     <!-- Automated Action for Dubai SME Webhook -->
@@ -341,6 +353,7 @@ process_webhook_lead(records)
         <field name="csrf">False</field>
     </record>
 </odoo>
+"""
 
 
 # ====================================================================
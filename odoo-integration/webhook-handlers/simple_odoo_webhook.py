@@ -134,10 +134,32 @@ Created: {fields.Datetime.now()}
     ], limit=1)
     
     if existing_lead:
-        # Update existing lead
-        existing_lead.write({
-            'description': existing_lead.description + '\n\n--- UPDATED ---\n' + lead_description
-        })
+        # Update existing lead with current contact values only (the description is not re-appended)
+        current_values = {
+            'phone': partner_phone,
+            'email_from': partner_email,
+            'website': partner_website,
+            'street': partner_address,
+            'priority': priority_value,
+        }
+        changed_values = {}
+        for field_name, value in current_values.items():
+            if value and value != existing_lead[field_name]:
+                changed_values[field_name] = value
+        if changed_values:
+            existing_lead.write(changed_values)
+        
+        # Record the sighting as a compact history row (dubai_sme_webhook addon)
+        if 'dubai.sme.lead.observation' in env:
+            quality_digits = ''.join(ch for ch in str(lead_quality) if ch.isdigit())
+            env['dubai.sme.lead.observation'].create({
+                'lead_id': existing_lead.id,
+                'source': lead_source,
+                'search_term': lead_search,
+                'quality_score': int(quality_digits) if quality_digits else 0,
+                'priority': lead_priority,
+                'changed_fields': ','.join(sorted(changed_values)) or False,
+            })
         lead_id = existing_lead.id
     else:
         # Create new lead
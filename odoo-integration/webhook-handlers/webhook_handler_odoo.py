@@ -32,6 +32,12 @@ def process_webhook_lead(payload):
     """
     
     try:
+        # Queue instead of processing inline when the dubai_sme_webhook addon is installed;
+        # its cron worker does the partner/tag/lead work outside the HTTP request
+        if 'dubai.sme.lead.staging' in env:
+            staged = env['dubai.sme.lead.staging'].sudo().enqueue([payload])
+            return {"status": "queued", "staging_ids": staged.ids}
+        
         # Extract data from payload (NOT _model and _id)
         company_name = payload.get('Name', 'Unknown Company')
         company_phone = payload.get('Phone', '')
@@ -52,7 +58,7 @@ def process_webhook_lead(payload):
             company_website = False
         
         # Step 1: Create or find partner
-        partner =         env['crm.lead']env['res.partner'].search([('name', '=', company_name)], limit=1)
+        partner = env['res.partner'].search([('name', '=', company_name)], limit=1)
         
         if partner:
             # Update existing partner
@@ -4,19 +4,38 @@
 # ================================================================
 
 import os
-import csv
 import json
+import threading
 import requests
-import time
+from collections import defaultdict
+from http_session import build_session
+from import_pipeline import ImportPipeline
+from import_manifest import ImportManifest
+from lead_dedup import LeadDeduplicator, lead_keys
+from lead_scoring import EMAIL_WEIGHTED, lead_priority, lead_quality_score
+from lead_schema import iter_lead_rows
 from datetime import datetime
 
 class DubaiLeadsBulkImporter:
-    def __init__(self):
-        self.webhook_url = "http://scholarixglobal.com/web/hook/aa6e5d99-5030-4128-864f-9d9a35725c0f"
-        self.results_dir = "d:/apify/apify_actor/results"
+    def __init__(self, webhook_url="http://scholarixglobal.com/web/hook/aa6e5d99-5030-4128-864f-9d9a35725c0f",
+                 results_dir="d:/apify/apify_actor/results"):
+        self.webhook_url = webhook_url
+        self.results_dir = results_dir
         self.success_count = 0
         self.error_count = 0
         self.processed_leads = []
+        # Upper bound on concurrent POSTs; the pipeline adapts below it
+        self.max_workers = 64
+        # One keep-alive connection pool for the whole import
+        self.session = build_session(pool_size=self.max_workers)
+        # Files and rows already sent to this webhook by earlier runs
+        self.manifest = ImportManifest(os.path.join(self.results_dir, '.import_manifest.db'),
+                                       destination=self.webhook_url)
+        # Which files each identity key was read from, and files with a failed lead
+        self.csv_files = []
+        self.key_files = defaultdict(set)
+        self.failed_files = set()
+        self.failed_lock = threading.Lock()
         
     def get_all_csv_files(self):
         """Get all CSV files with Dubai business leads"""
@@ -49,56 +68,23 @@ class DubaiLeadsBulkImporter:
         return csv_files
     
     def clean_lead_data(self, lead_data):
-        """Clean and format lead data for webhook"""
+        """Fill in priority, quality score and import metadata for a lead read through lead_schema"""
         
-        # Map various field names to standard format
-        field_mapping = {
-            'Name': ['Name', 'Company Name', 'Business Name', 'name'],
-            'Category': ['Category', 'Business Category', 'Type', 'category'],
-            'Phone': ['Phone', 'Phone Number', 'Contact Number', 'phone'],
-            'Email': ['Email', 'Email Address', 'email'],
-            'Website': ['Website', 'Website URL', 'URL', 'website'],
-            'Address': ['Address', 'Location', 'Street', 'address'],
-            'Priority': ['Priority', 'Lead Priority', 'priority'],
-            'Quality Score': ['Quality Score', 'Score', 'Rating', 'quality']
-        }
+        # Columns were mapped and contact placeholders blanked when the file header was compiled
+        cleaned = dict(lead_data)
         
-        cleaned = {}
-        
-        # Extract data using field mapping
-        for standard_field, possible_fields in field_mapping.items():
-            value = ''
-            for field in possible_fields:
-                if field in lead_data and lead_data[field]:
-                    value = str(lead_data[field]).strip()
-                    break
-            cleaned[standard_field] = value
-        
-        # Clean contact fields
-        invalid_values = ['Contact via website', 'Not available', 'N/A', '', 'None']
-        for field in ['Phone', 'Email', 'Website']:
-            if cleaned[field] in invalid_values:
-                cleaned[field] = ''
-        
-        # Set intelligent priority if missing
-        if not cleaned['Priority'] or cleaned['Priority'] in invalid_values:
-            if cleaned['Email'] and cleaned['Website'] and cleaned['Phone']:
-                cleaned['Priority'] = 'URGENT'
-            elif cleaned['Email'] and (cleaned['Website'] or cleaned['Phone']):
-                cleaned['Priority'] = 'HIGH'
-            elif cleaned['Email'] or cleaned['Website']:
-                cleaned['Priority'] = 'MEDIUM'
-            else:
-                cleaned['Priority'] = 'LOW'
+        # Set intelligent priority if missing (email-led leads rank highest)
+        if not cleaned['Priority']:
+            cleaned['Priority'] = lead_priority(
+                cleaned['Phone'], cleaned['Website'], cleaned['Email'], rule=EMAIL_WEIGHTED
+            )
         
         # Calculate quality score if missing
-        if not cleaned['Quality Score'] or cleaned['Quality Score'] in invalid_values:
-            score = 4  # Base score
-            if cleaned['Phone']: score += 2
-            if cleaned['Website']: score += 2
-            if cleaned['Email']: score += 1
-            if cleaned['Category']: score += 1
-            cleaned['Quality Score'] = str(min(score, 10))
+        if cleaned['Quality Score'] is None:
+            cleaned['Quality Score'] = lead_quality_score(
+                cleaned['Phone'], cleaned['Website'], cleaned['Category'], cleaned['Email']
+            )
+        cleaned['Quality Score'] = str(cleaned['Quality Score'])
         
         # Add metadata
         cleaned['Data Source'] = 'Dubai SME Historical Import'
@@ -107,19 +93,30 @@ class DubaiLeadsBulkImporter:
         
         return cleaned
     
-    def send_lead_to_webhook(self, lead_data, source_file=""):
-        """Send individual lead to webhook"""
+    def read_rows(self, csv_files):
+        """Reader stage that remembers which files each business was read from"""
+        for path, row in iter_lead_rows(csv_files):
+            for key in lead_keys(row):
+                self.key_files[key].add(path)
+            yield path, row
+    
+    def source_files(self, lead):
+        """Files a (possibly merged) lead was read from; every file being imported when it has no key"""
+        files = set()
+        for key in lead_keys(lead):
+            files |= self.key_files.get(key, set())
+        return files or set(self.csv_files)
+    
+    def normalize_row(self, row):
+        """Pipeline normalize stage: cleaned lead, or None for rows without a company"""
+        return self.clean_lead_data(row) if row['Name'] else None
+    
+    def send_lead_to_webhook(self, cleaned_lead):
+        """Send individual cleaned lead to webhook (called from pipeline worker threads)"""
         
         try:
-            # Clean the lead data
-            cleaned_lead = self.clean_lead_data(lead_data)
-            
-            # Skip if no company name
-            if not cleaned_lead['Name']:
-                return False, "No company name"
-            
             # Send to webhook
-            response = requests.post(
+            response = self.session.post(
                 self.webhook_url,
                 json=cleaned_lead,
                 timeout=15,
@@ -130,7 +127,6 @@ class DubaiLeadsBulkImporter:
             )
             
             if response.status_code == 200:
-                self.success_count += 1
                 self.processed_leads.append({
                     'company': cleaned_lead['Name'],
                     'priority': cleaned_lead['Priority'],
@@ -140,54 +136,18 @@ class DubaiLeadsBulkImporter:
                 })
                 return True, "Success"
             else:
-                self.error_count += 1
                 return False, f"HTTP {response.status_code}: {response.text}"
                 
         except Exception as e:
-            self.error_count += 1
             return False, f"Exception: {str(e)}"
     
-    def process_csv_file(self, csv_file):
-        """Process individual CSV file"""
-        
-        print(f"\n📄 Processing: {os.path.basename(csv_file)}")
-        
-        try:
-            with open(csv_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                
-                leads_in_file = 0
-                successful_in_file = 0
-                
-                for row in reader:
-                    leads_in_file += 1
-                    
-                    # Skip empty rows
-                    if not any(row.values()) or not row.get('Name'):
-                        continue
-                    
-                    # Send to webhook
-                    success, message = self.send_lead_to_webhook(row, csv_file)
-                    
-                    if success:
-                        successful_in_file += 1
-                        company = row.get('Name', 'Unknown')[:35]
-                        priority = self.processed_leads[-1]['priority']
-                        quality = self.processed_leads[-1]['quality']
-                        print(f"✅ {company} | Priority: {priority} | Quality: {quality}/10")
-                    else:
-                        company = row.get('Name', 'Unknown')[:35]
-                        print(f"❌ {company} - {message[:30]}")
-                    
-                    # Small delay to avoid overwhelming webhook
-                    time.sleep(0.3)
-                
-                print(f"📊 File Summary: {successful_in_file}/{leads_in_file} leads sent successfully")
-                return leads_in_file, successful_in_file
-                
-        except Exception as e:
-            print(f"❌ Error processing {csv_file}: {e}")
-            return 0, 0
+    def record_result(self, lead, ok, message):
+        """Record the row in the manifest; print failures as they happen"""
+        self.manifest.record(lead, ok)
+        if not ok:
+            with self.failed_lock:
+                self.failed_files |= self.source_files(lead)
+            print(f"❌ {lead['Name'][:35]} - {message[:60]}")
     
     def run_bulk_import(self):
         """Main function to import all leads"""
@@ -199,11 +159,13 @@ class DubaiLeadsBulkImporter:
         print(f"📁 Results Directory: {self.results_dir}")
         print(f"⏰ Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         
-        # Get all CSV files
-        csv_files = self.get_all_csv_files()
+        # Get all CSV files, minus those fully imported before
+        all_files = self.get_all_csv_files()
+        csv_files = self.manifest.pending_files(all_files)
         
         if not csv_files:
-            print("❌ No CSV files found!")
+            print("❌ No CSV files found!" if not all_files else
+                  f"✅ All {len(all_files)} CSV files were already imported - nothing to send")
             return
         
         print(f"\n📋 Found {len(csv_files)} CSV files to process:")
@@ -213,12 +175,26 @@ class DubaiLeadsBulkImporter:
         
         print(f"\n🚀 Starting bulk import...")
         
-        total_leads = 0
-        
-        # Process each CSV file
+        # Stream all files through normalize -> merge copies across files -> skip imported -> concurrent sender
+        pipeline = ImportPipeline(
+            send=self.send_lead_to_webhook,
+            normalize=self.normalize_row,
+            skip=self.manifest.is_delivered,
+            dedup=LeadDeduplicator(),
+            max_workers=self.max_workers,
+            on_result=self.record_result
+        )
+        self.csv_files = csv_files
+        stats = pipeline.run(csv_files, rows=self.read_rows(csv_files))
+        
+        # Files with failed rows stay pending; their sent rows are skipped next time
         for csv_file in csv_files:
-            leads_count, success_count = self.process_csv_file(csv_file)
-            total_leads += leads_count
+            self.manifest.mark_file(csv_file, complete=csv_file not in self.failed_files)
+        self.manifest.flush()
+        
+        total_leads = stats['read']
+        self.success_count = stats['sent']
+        self.error_count = stats['failed']
         
         # Final summary
         print("\n" + "=" * 80)
@@ -228,6 +204,9 @@ class DubaiLeadsBulkImporter:
         print(f"📈 Total Leads Found: {total_leads}")
         print(f"✅ Successfully Sent: {self.success_count}")
         print(f"❌ Failed: {self.error_count}")
+        print(f"♻️  Duplicate Copies Merged: {stats['duplicates']}")
+        print(f"⏭️  Already Imported (unchanged): {stats['unchanged']}")
+        print(f"⚡ Throughput: {stats['rate']:.0f} leads/s over {stats['elapsed']:.1f}s")
         
         if total_leads > 0:
             success_rate = (self.success_count / total_leads * 100)
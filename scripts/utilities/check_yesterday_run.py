@@ -38,10 +38,16 @@ def check_yesterday_performance():
         print(f"Total Leads Scraped: {stats['total_leads']}")
         print("="*60)
         
+        if stats['groups']:
+            print("\nBreakdown by Priority / Stage:")
+            for group in stats['groups']:
+                print(f"   Priority {group.get('priority')} | {group.get('stage') or 'No stage'}: {group['count']}")
+        
         if stats['leads']:
             print("\nTop 10 Leads:")
-            for idx, lead in enumerate(stats['leads'][:10], 1):
-                print(f"{idx}. {lead.get('name')} - Stage: {lead.get('stage_id', ['N/A'])[1]} - Priority: {lead.get('priority')}")
+            for idx, lead in enumerate(stats['leads'], 1):
+                stage = lead.get('stage_id') or [None, 'N/A']
+                print(f"{idx}. {lead.get('name')} - Stage: {stage[1]} - Priority: {lead.get('priority')}")
         else:
             print("\nNo leads found from yesterday's run.")
         
@@ -13,6 +13,10 @@ import os
 import json
 import re
 from webhook_crm_connector import get_webhook_connector
+from lead_outbox import with_outbox
+from circuit_breaker import with_circuit_breaker
+from lead_parquet import write_leads_parquet
+from lead_scoring import lead_priority, lead_quality_score
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -27,6 +31,8 @@ class GoogleMapsLeadScraper:
         self.scraped_names = set()
         self.crm_connector = None
         self.crm_enabled = False
+        # CRM delivery per lead name (names are unique per run): 'delivered' or 'failed'
+        self.push_state = {}
         self.load_crm_config()
         
     def load_crm_config(self):
@@ -46,8 +52,14 @@ class GoogleMapsLeadScraper:
                     if crm_type.lower() == 'webhook':
                         self.crm_connector = get_webhook_connector(
                             webhook_url=credentials.get('webhook_url'),
-                            auth_header=credentials.get('auth_header')
+                            auth_header=credentials.get('auth_header'),
+                            push_settings=self.push_settings,
+                            webhook_settings=config.get('webhook_settings', {})
                         )
+                        # Record every push durably so failed ones can be replayed
+                        self.crm_connector = with_outbox(self.crm_connector, self.push_settings)
+                        # Stop hitting a failing endpoint, spool leads until it recovers
+                        self.crm_connector = with_circuit_breaker(self.crm_connector, self.push_settings)
                         self.crm_enabled = True
                         logger.info(f"✓ Webhook CRM integration enabled: {credentials.get('webhook_url')}")
                     else:
@@ -67,23 +79,51 @@ class GoogleMapsLeadScraper:
             return False
         
         try:
-            max_retries = self.push_settings.get('max_retries', 3)
-            retry_count = 0
-            
-            while retry_count < max_retries:
-                if self.crm_connector.push_lead(lead_data):
-                    return True
-                
-                retry_count += 1
-                if retry_count < max_retries and self.push_settings.get('retry_on_failure', True):
-                    logger.info(f"Retrying CRM push ({retry_count}/{max_retries})...")
-                    time.sleep(2)
-            
-            return False
+            # A failed push stays in the CRM outbox for a later retry, so one
+            # call here is one logical push
+            pushed = self.crm_connector.push_lead(lead_data)
             
         except Exception as e:
             logger.error(f"Error pushing to CRM: {e}")
-            return False
+            pushed = False
+        
+        self.push_state[lead_data.get('Name')] = 'delivered' if pushed else 'failed'
+        return pushed
+    
+    def undelivered_leads(self) -> list:
+        """Collected leads never pushed to the CRM, or whose push failed"""
+        return [lead for lead in self.results if self.push_state.get(lead.get('Name')) != 'delivered']
+    
+    def push_remaining_to_crm(self):
+        """End-of-run push of the leads real-time pushing did not deliver"""
+        pending = self.undelivered_leads()
+        skipped = len(self.results) - len(pending)
+        logger.info(f"📤 End-of-run CRM push: {len(pending)} undelivered lead(s), "
+                    f"{skipped} skipped as already delivered")
+        if not pending:
+            return
+        
+        results = self.crm_connector.push_leads_batch(pending)
+        if not results['failed'] and not results.get('undelivered'):
+            self.push_state.update((lead.get('Name'), 'delivered') for lead in pending)
+        
+        logger.info(f"CRM Push Results - Success: {results['success']}, Failed: {results['failed']}, "
+                    f"Skipped (already delivered): {skipped}")
+        if results.get('undelivered'):
+            logger.warning(f"📮 {results['undelivered']} lead(s) kept in the CRM outbox - "
+                           f"re-send them with replay_outbox.py")
+        for chunk in results.get('chunks', []):
+            if chunk['failed']:
+                logger.warning(f"  Chunk {chunk['chunk']} ({chunk['size']} leads, {chunk['attempts']} attempt(s)): "
+                               f"{chunk['failed']} failed - {chunk['error'] or 'rejected by Odoo'}")
+    
+    def crm_stats(self) -> str:
+        """Circuit state and spool depth of the CRM connector, '' without a breaker"""
+        if not self.crm_enabled or not hasattr(self.crm_connector, 'stats'):
+            return ''
+        stats = self.crm_connector.stats()
+        return (f"CRM circuit: {stats['circuit']} (opened {stats['times_opened']}x), "
+                f"spool depth: {stats['spool_depth']}")
     
     def should_push_to_crm(self, lead_data: dict) -> bool:
         """Check if lead should be pushed to CRM (must have either email OR phone)"""
@@ -204,36 +244,12 @@ class GoogleMapsLeadScraper:
             return "Dubai, UAE"
     
     def calculate_priority(self, phone, website, email):
-        """Calculate priority based on available data"""
-        has_phone = phone not in ["Contact via website", "Not available"]
-        has_website = website not in ["Not available", ""]
-        has_email = email not in ["Not available", ""]
-        
-        contact_count = sum([has_phone, has_website, has_email])
-        
-        if contact_count >= 3:
-            return "URGENT"
-        elif contact_count >= 2:
-            return "HIGH"
-        elif contact_count >= 1:
-            return "MEDIUM"
-        else:
-            return "LOW"
+        """Calculate priority based on available data (one level per contact channel)"""
+        return lead_priority(phone, website, email)
     
     def calculate_quality_score(self, phone, website, category, email):
         """Calculate quality score (1-10)"""
-        score = 4
-        
-        if phone not in ["Contact via website", "Not available"]:
-            score += 2
-        if website not in ["Not available", ""]:
-            score += 2
-        if email not in ["Not available", ""]:
-            score += 1
-        if category and category != "N/A":
-            score += 1
-        
-        return min(score, 10)
+        return lead_quality_score(phone, website, category, email)
     
     def scrape_business_details(self, business_name, search_term):
         """Extract detailed business information after clicking on a listing"""
@@ -385,6 +401,18 @@ class GoogleMapsLeadScraper:
             writer.writerows(self.results)
             
         logger.info(f"✓ Saved {len(self.results)} leads to {filename}")
+        
+        # Columnar copy for history scans: results/parquet/run_date=YYYY-MM-DD/
+        # The CSV is the record of the run; a failed Parquet write must not lose it
+        try:
+            write_leads_parquet(
+                self.results,
+                os.path.join(os.path.dirname(filename), 'parquet'),
+                run_date=self.start_time.date(),
+                basename=f"fresh-dubai-businesses-{timestamp}"
+            )
+        except Exception as e:
+            logger.warning(f"Parquet export failed, CSV kept at {filename}: {e}")
         return filename
     
     def run(self):
@@ -408,6 +436,9 @@ class GoogleMapsLeadScraper:
                     break
                 
                 logger.info(f"Total leads collected so far: {len(self.results)}")
+                crm_stats = self.crm_stats()
+                if crm_stats:
+                    logger.info(crm_stats)
                 time.sleep(3)
             
             elapsed = datetime.now() - self.start_time
@@ -415,11 +446,12 @@ class GoogleMapsLeadScraper:
             logger.info(f"Duration: {int(elapsed.total_seconds() / 60)} minutes")
             logger.info(f"Total leads collected: {len(self.results)}")
             
-            # Push remaining leads in batch if enabled
+            # Push leads real-time pushing did not deliver, if enabled
             if self.crm_enabled and self.push_settings.get('batch_at_end', True) and self.results:
-                logger.info("📤 Pushing leads batch to CRM...")
-                results = self.crm_connector.push_leads_batch(self.results)
-                logger.info(f"CRM Push Results - Success: {results['success']}, Failed: {results['failed']}")
+                self.push_remaining_to_crm()
+                crm_stats = self.crm_stats()
+                if crm_stats:
+                    logger.info(crm_stats)
             
         except KeyboardInterrupt:
             logger.info("Scraping interrupted by user")
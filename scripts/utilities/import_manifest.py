@@ -0,0 +1,178 @@
+# ================================================================
+# 🧾 IMPORT MANIFEST - what has already been imported to the CRM
+# ================================================================
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List
+
+from lead_identity import idempotency_key
+
+logger = logging.getLogger(__name__)
+
+SENT = 'sent'
+FAILED = 'failed'
+
+
+def row_hash(lead: Dict) -> str:
+    """Canonical hash of a normalized lead: identity plus content, timestamps excluded"""
+    return idempotency_key(lead)
+
+
+class ImportManifest:
+    """
+    SQLite record of imported files (content hash) and rows (canonical hash + status)
+
+    Files whose content hash was fully imported before are skipped without
+    being read; rows already sent are skipped without being pushed. The file
+    hash is only recomputed when a file's size or modification time changed.
+    Both are kept per destination, so importers posting to different
+    webhooks can share one manifest file without skipping each other's work.
+    """
+
+    def __init__(self, db_path: str, destination: str = '', flush_every: int = 500):
+        """
+        Open (or create) the manifest
+
+        Args:
+            db_path: SQLite file path, e.g. 'results/.import_manifest.db'
+            destination: Where the rows are sent, e.g. the webhook URL
+            flush_every: Row statuses buffered before they are written
+        """
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.db_path = db_path
+        self.destination = destination
+        self.flush_every = flush_every
+        self.pending_rows = []
+        # Importers record results from their sender threads
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._drop_legacy_tables()
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS files (
+                destination TEXT NOT NULL,
+                path TEXT NOT NULL,
+                sha256 TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime REAL NOT NULL,
+                complete INTEGER NOT NULL DEFAULT 0,
+                imported_at TEXT,
+                PRIMARY KEY (destination, path)
+            );
+            CREATE INDEX IF NOT EXISTS files_sha256 ON files (destination, sha256);
+            CREATE TABLE IF NOT EXISTS rows (
+                destination TEXT NOT NULL,
+                row_hash TEXT NOT NULL,
+                status TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (destination, row_hash)
+            );
+        """)
+        self.conn.commit()
+
+    def _drop_legacy_tables(self):
+        """
+        Manifests written before statuses were kept per destination cannot
+        say which webhook a row went to; they are dropped and the rows resent
+        (the webhook's Idempotency-Key check absorbs the repeats)
+        """
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(files)")}
+        if columns and 'destination' not in columns:
+            logger.warning(f"Import manifest {self.db_path} has no destination column, starting it afresh")
+            self.conn.executescript("DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS rows;")
+
+    def file_hash(self, path: str) -> str:
+        """sha256 of a file, reusing the recorded one while size and mtime are unchanged"""
+        stat = os.stat(path)
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT sha256, size, mtime FROM files WHERE destination = ? AND path = ?",
+                (self.destination, os.path.abspath(path))
+            ).fetchone()
+        if row and row[1] == stat.st_size and row[2] == stat.st_mtime:
+            return row[0]
+
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        sha = digest.hexdigest()
+
+        with self.lock:
+            self.conn.execute("""
+                INSERT INTO files (destination, path, sha256, size, mtime) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (destination, path) DO UPDATE SET
+                    sha256 = excluded.sha256, size = excluded.size, mtime = excluded.mtime,
+                    complete = CASE WHEN files.sha256 = excluded.sha256 THEN files.complete ELSE 0 END
+            """, (self.destination, os.path.abspath(path), sha, stat.st_size, stat.st_mtime))
+            self.conn.commit()
+        return sha
+
+    def pending_files(self, files: Iterable[str]) -> List[str]:
+        """Files that are new, changed, or were not completely imported"""
+        pending = []
+        for path in files:
+            sha = self.file_hash(path)
+            with self.lock:
+                # A copy of an imported file under another name is done too
+                done = self.conn.execute(
+                    "SELECT 1 FROM files WHERE destination = ? AND sha256 = ? AND complete = 1",
+                    (self.destination, sha)
+                ).fetchone()
+            if not done:
+                pending.append(path)
+        return pending
+
+    def mark_file(self, path: str, complete: bool = True):
+        """Record whether every row of a file was delivered"""
+        self.flush()
+        with self.lock:
+            self.conn.execute(
+                "UPDATE files SET complete = ?, imported_at = ? WHERE destination = ? AND path = ?",
+                (int(complete), datetime.now().isoformat(), self.destination, os.path.abspath(path))
+            )
+            self.conn.commit()
+
+    def is_delivered(self, lead: Dict) -> bool:
+        """Whether this exact lead (identity and content) was already sent"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT status FROM rows WHERE destination = ? AND row_hash = ?",
+                (self.destination, row_hash(lead))
+            ).fetchone()
+        return bool(row) and row[0] == SENT
+
+    def record(self, lead: Dict, ok: bool):
+        """Buffer a row's delivery status"""
+        with self.lock:
+            self.pending_rows.append(
+                (self.destination, row_hash(lead), SENT if ok else FAILED, datetime.now().isoformat())
+            )
+            full = len(self.pending_rows) >= self.flush_every
+        if full:
+            self.flush()
+
+    def flush(self):
+        """Write buffered row statuses"""
+        with self.lock:
+            if not self.pending_rows:
+                return
+            self.conn.executemany("""
+                INSERT INTO rows (destination, row_hash, status, updated_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT (destination, row_hash) DO UPDATE SET
+                    status = CASE WHEN rows.status = 'sent' THEN 'sent' ELSE excluded.status END,
+                    updated_at = excluded.updated_at
+            """, self.pending_rows)
+            self.conn.commit()
+            self.pending_rows = []
+
+    def close(self):
+        self.flush()
+        self.conn.close()
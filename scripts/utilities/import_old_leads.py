@@ -2,11 +2,12 @@
 """
 Enhanced script to send old leads from CSV files to Odoo CRM via webhook
 """
-import csv
 import json
 import os
 import glob
-import requests
+from async_webhook_connector import AsyncOdooWebhookConnector
+from import_manifest import ImportManifest
+from lead_schema import read_leads
 import logging
 from datetime import datetime
 from typing import List, Dict
@@ -15,14 +16,20 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 logger = logging.getLogger(__name__)
 
 class OldLeadsImporter:
-    def __init__(self, webhook_url: str, results_dir: str = "d:/apify/apify_actor/results"):
+    def __init__(self, webhook_url: str, results_dir: str = "d:/apify/apify_actor/results",
+                 webhook_settings: Dict = None):
         self.webhook_url = webhook_url
         self.results_dir = results_dir
         self.imported_count = 0
         self.failed_count = 0
+        # Concurrent pushes over one pooled session, paced by webhook_settings.rate_limit
+        self.connector = AsyncOdooWebhookConnector(webhook_url, webhook_settings=webhook_settings)
+        # Files and rows already imported by earlier runs
+        self.manifest = ImportManifest(os.path.join(results_dir, '.import_manifest.db'), destination=webhook_url)
+        self.skipped_count = 0
         
     def get_latest_csv_files(self, count: int = 2) -> List[str]:
-        """Get the latest CSV files from results directory"""
+        """Get the latest CSV files from results directory that were not fully imported yet"""
         try:
             csv_pattern = os.path.join(self.results_dir, "*.csv")
             csv_files = glob.glob(csv_pattern)
@@ -30,8 +37,10 @@ class OldLeadsImporter:
             # Sort by modification time (newest first)
             csv_files.sort(key=os.path.getmtime, reverse=True)
             
-            latest_files = csv_files[:count]
-            logger.info(f"Found {len(csv_files)} CSV files, selecting latest {count}:")
+            pending_files = self.manifest.pending_files(csv_files)
+            latest_files = pending_files[:count]
+            logger.info(f"Found {len(csv_files)} CSV files ({len(csv_files) - len(pending_files)} already imported), "
+                        f"selecting latest {count} pending:")
             
             for i, file in enumerate(latest_files, 1):
                 filename = os.path.basename(file)
@@ -49,29 +58,27 @@ class OldLeadsImporter:
         leads = []
         
         try:
-            with open(csv_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    # Clean and format the lead data
-                    lead = {
-                        'Name': row.get('Name', '').strip().strip('"'),
-                        'Category': row.get('Category', '').strip().strip('"'),
-                        'Phone': row.get('Phone', '').strip().strip('"'),
-                        'Email': row.get('Email', 'Not available').strip().strip('"'),
-                        'Website': row.get('Website', '').strip().strip('"'),
-                        'Address': row.get('Address', '').strip().strip('"'),
-                        'Priority': row.get('Priority', 'MEDIUM').strip().strip('"'),
-                        'Quality Score': row.get('Quality Score', '5'),
-                        'Data Source': f"Historical Import - {row.get('Data Source', 'Previous Run')}",
-                        'Search Term': f"{row.get('Search Term', '').strip()} [Historical]",
-                        'Timestamp': datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z',
-                        'Import Source': os.path.basename(csv_file),
-                        'Import Date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    }
-                    
-                    # Only add leads with valid names
-                    if lead['Name'] and len(lead['Name']) > 2 and lead['Name'] != 'Name':
-                        leads.append(lead)
+            for record in read_leads(csv_file):
+                # Clean and format the lead data
+                lead = {
+                    'Name': record.name,
+                    'Category': record.category,
+                    'Phone': record.phone,
+                    'Email': record.email or 'Not available',
+                    'Website': record.website,
+                    'Address': record.address,
+                    'Priority': record.priority or 'MEDIUM',
+                    'Quality Score': str(record.quality_score if record.quality_score is not None else 5),
+                    'Data Source': f"Historical Import - {record.data_source or 'Previous Run'}",
+                    'Search Term': f"{record.search_term} [Historical]",
+                    'Timestamp': datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z',
+                    'Import Source': os.path.basename(csv_file),
+                    'Import Date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                }
+                
+                # Only add leads with valid names
+                if len(lead['Name']) > 2:
+                    leads.append(lead)
             
             logger.info(f"Read {len(leads)} valid leads from {os.path.basename(csv_file)}")
             return leads
@@ -80,37 +87,11 @@ class OldLeadsImporter:
             logger.error(f"Error reading CSV file {csv_file}: {e}")
             return []
     
-    def send_lead_to_webhook(self, lead: Dict) -> bool:
-        """Send single lead to Odoo webhook"""
-        try:
-            headers = {
-                'Content-Type': 'application/json',
-                'User-Agent': 'Dubai-SME-Scraper/1.0'
-            }
-            
-            response = requests.post(
-                self.webhook_url,
-                headers=headers,
-                json=lead,
-                timeout=30
-            )
-            
-            if response.status_code in [200, 201, 202]:
-                logger.info(f"✓ Sent to Odoo: {lead['Name']}")
-                return True
-            else:
-                logger.error(f"Webhook error {response.status_code}: {lead['Name']}")
-                return False
-                
-        except requests.exceptions.Timeout:
-            logger.error(f"Timeout sending lead: {lead['Name']}")
-            return False
-        except requests.exceptions.ConnectionError:
-            logger.error(f"Connection error sending lead: {lead['Name']}")
-            return False
-        except Exception as e:
-            logger.error(f"Error sending lead {lead['Name']}: {e}")
-            return False
+    def send_leads_to_webhook(self, leads: List[Dict]) -> List[bool]:
+        """Send leads to the Odoo webhook concurrently; returns whether each one was delivered"""
+        if not leads:
+            return []
+        return self.connector.push_leads(leads)['delivered']
     
     def import_csv_file(self, csv_file: str):
         """Import all leads from a single CSV file"""
@@ -122,23 +103,26 @@ class OldLeadsImporter:
             logger.warning(f"No leads found in {csv_file}")
             return
         
-        logger.info(f"🚀 Importing {len(leads)} leads to Odoo...")
+        # Same lead with the same content was sent by an earlier run
+        pending = [lead for lead in leads if not self.manifest.is_delivered(lead)]
+        self.skipped_count += len(leads) - len(pending)
+        
+        logger.info(f"🚀 Importing {len(pending)} leads to Odoo...")
         
         success_count = 0
+        failed_in_file = 0
         
-        for i, lead in enumerate(leads, 1):
-            logger.info(f"Processing lead {i}/{len(leads)}: {lead['Name']}")
-            
-            if self.send_lead_to_webhook(lead):
+        for lead, sent in zip(pending, self.send_leads_to_webhook(pending)):
+            self.manifest.record(lead, sent)
+            if sent:
                 success_count += 1
                 self.imported_count += 1
             else:
+                logger.error(f"Webhook push failed: {lead['Name']}")
+                failed_in_file += 1
                 self.failed_count += 1
-            
-            # Small delay to avoid overwhelming the webhook
-            import time
-            time.sleep(0.5)
         
+        self.manifest.mark_file(csv_file, complete=failed_in_file == 0)
         logger.info(f"✅ File completed: {success_count}/{len(leads)} leads imported successfully")
     
     def run(self, file_count: int = 2):
@@ -153,6 +137,9 @@ class OldLeadsImporter:
         csv_files = self.get_latest_csv_files(file_count)
         
         if not csv_files:
+            if glob.glob(os.path.join(self.results_dir, "*.csv")):
+                logger.info("✅ Every CSV file was already imported - nothing to send")
+                return True
             logger.error("No CSV files found to import!")
             return False
         
@@ -167,6 +154,7 @@ class OldLeadsImporter:
         logger.info(f"Total files processed: {len(csv_files)}")
         logger.info(f"✅ Successfully imported: {self.imported_count} leads")
         logger.info(f"❌ Failed imports: {self.failed_count} leads")
+        logger.info(f"⏭️  Already imported (unchanged): {self.skipped_count} leads")
         if (self.imported_count + self.failed_count) > 0:
             success_rate = (self.imported_count/(self.imported_count+self.failed_count)*100)
             logger.info(f"📈 Success rate: {success_rate:.1f}%")
@@ -182,17 +170,22 @@ def main():
         with open('d:/apify/apify_actor/crm_config.json', 'r') as f:
             config = json.load(f)
         webhook_url = config['credentials']['webhook_url']
+        webhook_settings = config.get('webhook_settings')
         logger.info(f"✅ Loaded webhook URL from config")
     except Exception as e:
         logger.error(f"Error loading config: {e}")
         webhook_url = "http://scholarixglobal.com/web/hook/1342d838-a97c-466c-99f1-8ae3222f38ce"
+        webhook_settings = None
         logger.info(f"✅ Using default webhook URL")
     
     # Initialize importer
-    importer = OldLeadsImporter(webhook_url)
+    importer = OldLeadsImporter(webhook_url, webhook_settings=webhook_settings)
     
     # Run import
-    success = importer.run(file_count=2)
+    try:
+        success = importer.run(file_count=2)
+    finally:
+        importer.connector.close()
     
     if success:
         print("\n✅ Old leads import completed successfully!")
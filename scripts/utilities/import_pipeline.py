@@ -0,0 +1,224 @@
+# ================================================================
+# 🚰 STREAMING LEAD IMPORT PIPELINE
+# reader -> normalize -> dedup/merge -> skip imported -> concurrent sender (adaptive rate)
+# ================================================================
+
+import csv
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveRateController:
+    """
+    AIMD concurrency window driven by observed latency and errors
+
+    Each success under the latency target grows the window by about one slot
+    per window's worth of requests (additive increase); an error, or latency
+    above twice the target, halves it (multiplicative decrease), at most once
+    per window so one burst of failures doesn't collapse it to the floor.
+    """
+
+    def __init__(self, initial: int = 8, min_limit: int = 1, max_limit: int = 128,
+                 target_latency: float = 0.5):
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.in_flight = 0
+        self.since_decrease = 0
+        self.condition = threading.Condition()
+
+    def acquire(self):
+        """Block until the window has room for another request"""
+        with self.condition:
+            while self.in_flight >= int(self.limit):
+                self.condition.wait()
+            self.in_flight += 1
+
+    def release(self, latency: float, ok: bool):
+        """Free a slot and adapt the window to the request's outcome"""
+        with self.condition:
+            self.in_flight -= 1
+            self.since_decrease += 1
+
+            if not ok or latency > 2 * self.target_latency:
+                if self.since_decrease >= self.limit:
+                    self.limit = max(self.min_limit, self.limit / 2)
+                    self.since_decrease = 0
+            elif latency <= self.target_latency:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+            self.condition.notify_all()
+
+
+class ImportProgress:
+    """Thread-safe counters with a throughput/ETA progress line"""
+
+    def __init__(self, total: int = 0, every: float = 2.0):
+        self.total = total
+        self.every = every
+        self.started = time.monotonic()
+        self.last_report = self.started
+        self.counts = {'read': 0, 'invalid': 0, 'unchanged': 0, 'duplicates': 0, 'sent': 0, 'failed': 0}
+        self.lock = threading.Lock()
+
+    def add(self, name: str, amount: int = 1):
+        with self.lock:
+            self.counts[name] += amount
+
+    def done(self) -> int:
+        return self.counts['sent'] + self.counts['failed']
+
+    def rate(self) -> float:
+        elapsed = time.monotonic() - self.started
+        return self.done() / elapsed if elapsed > 0 else 0.0
+
+    def line(self, window: float = None) -> str:
+        done = self.done()
+        rate = self.rate()
+        # Rows dropped before sending shrink what is left to do
+        dropped = self.counts['invalid'] + self.counts['unchanged'] + self.counts['duplicates']
+        remaining = max(self.total - dropped - done, 0)
+        eta = f"{remaining / rate:.0f}s" if rate and self.total else "?"
+        window_text = f" | window {window:.0f}" if window is not None else ""
+        return (f"📈 {done} done ({self.counts['sent']} ✅ / {self.counts['failed']} ❌), "
+                f"{self.counts['unchanged']} unchanged, {self.counts['duplicates']} dup, "
+                f"{self.counts['invalid']} invalid | "
+                f"{rate:.0f} leads/s | ETA {eta}{window_text}")
+
+    def maybe_report(self, window: float = None):
+        now = time.monotonic()
+        if now - self.last_report >= self.every:
+            self.last_report = now
+            print(self.line(window))
+
+
+def count_rows(files: List[str]) -> int:
+    """Cheap row-count estimate (data lines) used for the ETA"""
+    total = 0
+    for path in files:
+        with open(path, 'rb') as f:
+            total += max(sum(1 for _ in f) - 1, 0)
+    return total
+
+
+def read_rows(files: Iterable[str]) -> Iterator[Tuple[str, Dict]]:
+    """Reader stage: stream (file, row) pairs from CSV files"""
+    for path in files:
+        try:
+            with open(path, 'r', encoding='utf-8', newline='') as f:
+                for row in csv.DictReader(f):
+                    yield path, row
+        except (OSError, UnicodeDecodeError, csv.Error) as e:
+            logger.error(f"Error reading {path}: {e}")
+
+
+class ImportPipeline:
+    """
+    Streaming import: reader -> normalize -> dedup -> skip -> concurrent sender
+
+    Stages are chained generators, so memory stays bounded by the sender's
+    in-flight window however many rows the files hold. A dedup stage is the
+    exception: it has to see every row before it can merge a business's
+    copies, so it holds one group per distinct business.
+    """
+
+    def __init__(self, send: Callable[[Dict], Tuple[bool, str]],
+                 normalize: Callable[[Dict], Optional[Dict]] = None,
+                 skip: Callable[[Dict], bool] = None,
+                 dedup=None,
+                 controller: AdaptiveRateController = None,
+                 max_workers: int = 64, on_result: Callable = None):
+        """
+        Args:
+            send: Pushes one lead, returns (ok, message); called from worker threads
+            normalize: Row -> lead dict, or None to drop the row
+            skip: Lead -> True to drop it as already imported (e.g. ImportManifest.is_delivered)
+            dedup: Optional LeadDeduplicator; copies of a business are merged into one lead
+            controller: Concurrency window (default AdaptiveRateController())
+            max_workers: Upper bound on sender threads
+            on_result: Optional callback(lead, ok, message) per sent lead
+        """
+        self.send = send
+        self.normalize = normalize or (lambda row: row)
+        self.skip = skip
+        self.dedup = dedup
+        self.controller = controller or AdaptiveRateController(max_limit=max_workers)
+        self.max_workers = max_workers
+        self.on_result = on_result
+        self.progress = None
+
+    def normalize_stage(self, rows: Iterable[Tuple[str, Dict]]) -> Iterator[Dict]:
+        for _, row in rows:
+            self.progress.add('read')
+            lead = self.normalize(row)
+            if lead:
+                yield lead
+            else:
+                self.progress.add('invalid')
+
+    def skip_stage(self, leads: Iterable[Dict]) -> Iterator[Dict]:
+        if not self.skip:
+            yield from leads
+            return
+
+        for lead in leads:
+            if self.skip(lead):
+                self.progress.add('unchanged')
+            else:
+                yield lead
+
+    def dedup_stage(self, leads: Iterable[Dict]) -> Iterator[Dict]:
+        if not self.dedup:
+            yield from leads
+            return
+
+        for lead in leads:
+            self.dedup.add(lead)
+        self.progress.add('duplicates', self.dedup.duplicates)
+        print(f"🧬 {self.dedup.added} records -> {self.dedup.businesses} distinct businesses")
+        yield from self.dedup.merged()
+
+    def send_stage(self, leads: Iterable[Dict]):
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for lead in leads:
+                self.controller.acquire()
+                executor.submit(self._send_one, lead)
+                self.progress.maybe_report(self.controller.limit)
+
+    def _send_one(self, lead: Dict):
+        started = time.monotonic()
+        try:
+            ok, message = self.send(lead)
+        except Exception as e:
+            ok, message = False, f"Exception: {e}"
+
+        self.controller.release(time.monotonic() - started, ok)
+        self.progress.add('sent' if ok else 'failed')
+        if self.on_result:
+            self.on_result(lead, ok, message)
+
+    def run(self, files: List[str], rows: Iterable[Tuple[str, Dict]] = None) -> Dict:
+        """
+        Import every row of the given files
+
+        Args:
+            files: CSV paths (also used for the ETA row estimate)
+            rows: Optional pre-built reader stage replacing read_rows(files)
+
+        Returns:
+            Final counters plus elapsed seconds and leads/second
+        """
+        self.progress = ImportProgress(total=count_rows(files))
+        rows = rows if rows is not None else read_rows(files)
+        # Merging before the skip check makes the manifest see the merged record
+        self.send_stage(self.skip_stage(self.dedup_stage(self.normalize_stage(rows))))
+
+        print(self.progress.line(self.controller.limit))
+        elapsed = time.monotonic() - self.progress.started
+        return dict(self.progress.counts, elapsed=elapsed, rate=self.progress.rate())
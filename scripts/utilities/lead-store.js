@@ -0,0 +1,165 @@
+/**
+ * Lead Store - Node query API over the SQLite lead store
+ *
+ * The store is built and refreshed by the Python side:
+ *   python scripts/utilities/lead_store.py --results results ingest
+ *
+ * Uses the built-in node:sqlite driver (Node >= 22.13, see package.json
+ * engines); the store is opened read-only.
+ *
+ * The store path is LEAD_STORE_PATH when set, <repo>/results/.lead_store.db
+ * otherwise - the same default lead_store.py writes to.
+ *
+ * Usage:
+ *   const { LeadStore } = require('./lead-store');
+ *   const store = new LeadStore();
+ *   store.search('property management');
+ *   store.find({ priority: 'HIGH', hasPhone: true, limit: 50 });
+ *
+ *   node scripts/utilities/lead-store.js search "accounting dubai"
+ *   node scripts/utilities/lead-store.js stats
+ */
+
+const fs = require('fs');
+const path = require('path');
+
+const DEFAULT_DB_PATH = process.env.LEAD_STORE_PATH || path.join(__dirname, '../../results/.lead_store.db');
+
+const PRIORITY_ORDER = `CASE priority WHEN 'URGENT' THEN 4 WHEN 'HIGH' THEN 3 WHEN 'MEDIUM' THEN 2
+                                     WHEN 'LOW' THEN 1 ELSE 0 END`;
+
+function openDatabase(dbPath) {
+    if (!fs.existsSync(dbPath)) {
+        throw new Error(`Lead store not found at ${dbPath} - run "python scripts/utilities/lead_store.py ingest" first`);
+    }
+
+    const { DatabaseSync } = require('node:sqlite');
+    return new DatabaseSync(dbPath, { readOnly: true });
+}
+
+/**
+ * Free text -> FTS5 prefix query where every word must match
+ */
+function ftsQuery(text) {
+    return text.split(/\s+/)
+        .filter(Boolean)
+        .map(word => `"${word.replace(/"/g, '""')}"*`)
+        .join(' ');
+}
+
+class LeadStore {
+    constructor(dbPath = DEFAULT_DB_PATH) {
+        this.db = openDatabase(dbPath);
+        this.fts = Boolean(this.db.prepare(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'leads_fts'"
+        ).get());
+    }
+
+    /**
+     * Full-text search over names, categories and addresses, best matches first
+     */
+    search(text, limit = 20) {
+        if (!text || !text.trim()) return [];
+
+        if (this.fts) {
+            return this.db.prepare(`
+                SELECT leads.* FROM leads_fts JOIN leads ON leads.id = leads_fts.rowid
+                 WHERE leads_fts MATCH ? ORDER BY bm25(leads_fts) LIMIT ?
+            `).all(ftsQuery(text), limit);
+        }
+
+        const pattern = `%${text.trim()}%`;
+        return this.db.prepare(
+            'SELECT * FROM leads WHERE name LIKE ? OR category LIKE ? OR address LIKE ? LIMIT ?'
+        ).all(pattern, pattern, pattern, limit);
+    }
+
+    /**
+     * Filter leads on indexed columns, best priority and score first
+     * @param {Object} filters - { priority, category, minScore, hasEmail, hasPhone, hasWebsite, limit }
+     */
+    find(filters = {}) {
+        const clauses = [];
+        const params = [];
+
+        if (filters.priority) {
+            clauses.push('priority = ?');
+            params.push(filters.priority.toUpperCase());
+        }
+        if (filters.category) {
+            clauses.push('category = ? COLLATE NOCASE');
+            params.push(filters.category);
+        }
+        if (filters.minScore !== undefined) {
+            clauses.push('quality_score >= ?');
+            params.push(filters.minScore);
+        }
+        for (const [column, wanted] of [['email', filters.hasEmail], ['phone', filters.hasPhone], ['website', filters.hasWebsite]]) {
+            if (wanted !== undefined) clauses.push(`${column} ${wanted ? '!=' : '='} ''`);
+        }
+
+        let sql = 'SELECT * FROM leads';
+        if (clauses.length) sql += ` WHERE ${clauses.join(' AND ')}`;
+        sql += ` ORDER BY ${PRIORITY_ORDER} DESC, quality_score DESC`;
+        if (filters.limit) {
+            sql += ' LIMIT ?';
+            params.push(filters.limit);
+        }
+        return this.db.prepare(sql).all(...params);
+    }
+
+    executives(leadId) {
+        return this.db.prepare('SELECT * FROM executives WHERE lead_id = ? ORDER BY name').all(leadId);
+    }
+
+    /**
+     * Leads joined with their executives, one row per executive
+     */
+    leadsWithExecutives() {
+        return this.db.prepare(`
+            SELECT leads.id AS lead_id, leads.name AS company, leads.phone, leads.website, leads.priority,
+                   executives.name, executives.email, executives.position, executives.linkedin
+              FROM executives JOIN leads ON leads.id = executives.lead_id
+             ORDER BY leads.name, executives.name
+        `).all();
+    }
+
+    stats() {
+        const count = sql => Object.values(this.db.prepare(sql).get())[0];
+        return {
+            files: count('SELECT COUNT(*) FROM files'),
+            leads: count('SELECT COUNT(*) FROM leads'),
+            withEmail: count("SELECT COUNT(*) FROM leads WHERE email != ''"),
+            withPhone: count("SELECT COUNT(*) FROM leads WHERE phone != ''"),
+            executives: count('SELECT COUNT(*) FROM executives'),
+            linkedExecutives: count('SELECT COUNT(*) FROM executives WHERE lead_id IS NOT NULL')
+        };
+    }
+
+    close() {
+        this.db.close();
+    }
+}
+
+if (require.main === module) {
+    const [command, ...rest] = process.argv.slice(2);
+    const store = new LeadStore();
+
+    try {
+        if (command === 'search') {
+            const leads = store.search(rest.join(' '));
+            leads.forEach(lead => {
+                console.log(`${String(lead.id).padStart(5)} | ${lead.name.slice(0, 40).padEnd(40)} | ${(lead.priority || '').padEnd(6)} | ${lead.phone || '-'}`);
+            });
+            console.log(`\n${leads.length} lead(s)`);
+        } else if (command === 'stats') {
+            console.log(JSON.stringify(store.stats(), null, 2));
+        } else {
+            console.log('Usage: node scripts/utilities/lead-store.js <search TEXT | stats>');
+        }
+    } finally {
+        store.close();
+    }
+}
+
+module.exports = { LeadStore, ftsQuery, DEFAULT_DB_PATH };
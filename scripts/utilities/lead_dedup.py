@@ -0,0 +1,143 @@
+# ================================================================
+# 🧬 LEAD DEDUP - one merged record per business across result files
+# ================================================================
+
+import logging
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from lead_identity import clean_value, identity_keys
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_RANK = {'URGENT': 4, 'HIGH': 3, 'MEDIUM': 2, 'LOW': 1}
+
+# Names this short say nothing about which business a record is
+MIN_NAME_KEY_LENGTH = 4
+
+
+def lead_keys(lead: Dict) -> List[Tuple[str, str]]:
+    """Canonical (kind, value) keys a lead can be matched on; name keys need MIN_NAME_KEY_LENGTH"""
+    return [(kind, value) for kind, value in identity_keys(lead)
+            if kind != 'name' or len(value) >= MIN_NAME_KEY_LENGTH]
+
+
+def completeness(lead: Dict) -> int:
+    """Number of fields carrying a real value"""
+    return sum(1 for value in lead.values() if clean_value(value))
+
+
+def _score(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return -1
+
+
+def merge_group(leads: List[Dict]) -> Dict:
+    """
+    Merge records of one business field by field
+
+    The most complete record is the base; its empty fields are filled from
+    the others, most complete first. Priority and quality score take the
+    best value any copy carries.
+    """
+    ordered = sorted(leads, key=completeness, reverse=True)
+    merged = dict(ordered[0])
+
+    for lead in ordered[1:]:
+        for field, value in lead.items():
+            if not clean_value(merged.get(field)) and clean_value(value):
+                merged[field] = value
+
+    priorities = [lead['Priority'] for lead in leads if lead.get('Priority') in PRIORITY_RANK]
+    if priorities:
+        merged['Priority'] = max(priorities, key=PRIORITY_RANK.get)
+
+    scores = [lead['Quality Score'] for lead in leads if _score(lead.get('Quality Score')) >= 0]
+    if scores:
+        merged['Quality Score'] = max(scores, key=_score)
+
+    return merged
+
+
+class LeadDeduplicator:
+    """
+    Groups leads of the same business and merges each group
+
+    Leads are linked through hash indexes on place ID, phone, website domain
+    and normalized name (union-find over the links). A name alone does not
+    link two groups whose phones or domains disagree, so branches and
+    same-named businesses stay apart.
+    """
+
+    def __init__(self):
+        self.parent: List[int] = []
+        self.members: Dict[int, List[Dict]] = {}
+        self.phones: Dict[int, set] = {}
+        self.domains: Dict[int, set] = {}
+        self.index: Dict[Tuple[str, str], int] = {}
+        self.added = 0
+
+    def _find(self, group: int) -> int:
+        root = group
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[group] != root:
+            self.parent[group], group = root, self.parent[group]
+        return root
+
+    def _conflict(self, a: int, b: int) -> bool:
+        return ((self.phones[a] and self.phones[b] and not self.phones[a] & self.phones[b]) or
+                (self.domains[a] and self.domains[b] and not self.domains[a] & self.domains[b]))
+
+    def _union(self, a: int, b: int) -> int:
+        # The earlier group stays the root so output keeps first-seen order
+        root, child = min(a, b), max(a, b)
+        self.parent[child] = root
+        self.members[root].extend(self.members.pop(child))
+        self.phones[root] |= self.phones.pop(child)
+        self.domains[root] |= self.domains.pop(child)
+        return root
+
+    def add(self, lead: Dict):
+        """Index a lead, linking it to any group sharing one of its keys"""
+        group = len(self.parent)
+        keys = lead_keys(lead)
+        self.parent.append(group)
+        self.members[group] = [lead]
+        self.phones[group] = {value for kind, value in keys if kind == 'phone'}
+        self.domains[group] = {value for kind, value in keys if kind == 'domain'}
+        self.added += 1
+
+        for key in keys:
+            other = self.index.get(key)
+            if other is None:
+                self.index[key] = group
+                continue
+
+            other = self._find(other)
+            if other != group and (key[0] != 'name' or not self._conflict(group, other)):
+                group = self._union(group, other)
+
+    @property
+    def businesses(self) -> int:
+        return len(self.members)
+
+    @property
+    def duplicates(self) -> int:
+        return self.added - self.businesses
+
+    def merged(self) -> Iterator[Dict]:
+        """One merged record per business, in first-seen order"""
+        for group in sorted(self.members):
+            yield merge_group(self.members[group])
+
+
+def dedup_leads(leads: Iterable[Dict]) -> List[Dict]:
+    """Merge a list of leads down to one record per business"""
+    dedup = LeadDeduplicator()
+    for lead in leads:
+        dedup.add(lead)
+    if dedup.duplicates:
+        logger.info(f"Merged {dedup.added} records into {dedup.businesses} businesses")
+    return list(dedup.merged())
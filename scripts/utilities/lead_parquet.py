@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# ================================================================
+# 🧱 LEAD PARQUET - columnar lead history partitioned by run date
+# ================================================================
+
+import argparse
+import glob
+import logging
+import os
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional
+
+from lead_schema import LEAD_FIELDS, as_dict, coerce_score, read_leads
+
+try:
+    import pyarrow
+    import pyarrow.dataset
+    import pyarrow.parquet
+except ImportError:  # Parquet export is optional, the CSV is always written
+    pyarrow = None
+
+logger = logging.getLogger(__name__)
+
+RESULTS_DIR = "d:/apify/apify_actor/results"
+DATASET_NAME = 'parquet'
+
+# Low-cardinality columns stored dictionary-encoded
+CATEGORICAL_FIELDS = ('Category', 'Priority', 'Data Source', 'Search Term')
+
+
+def lead_arrow_schema():
+    """Arrow schema of the lead dataset (run_date is the hive partition column)"""
+    columns = []
+    for field in LEAD_FIELDS:
+        if field in CATEGORICAL_FIELDS:
+            arrow_type = pyarrow.dictionary(pyarrow.int32(), pyarrow.string())
+        elif field == 'Quality Score':
+            arrow_type = pyarrow.int8()
+        elif field == 'Timestamp':
+            arrow_type = pyarrow.timestamp('ms', tz='UTC')
+        else:
+            arrow_type = pyarrow.string()
+        columns.append(pyarrow.field(field, arrow_type))
+    return pyarrow.schema(columns)
+
+
+def parse_timestamp(value) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value).strip().replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+def leads_to_table(leads: Iterable[Dict]):
+    """Lead dicts (scraper CSV keys) -> Arrow table with typed columns"""
+    columns = {field: [] for field in LEAD_FIELDS}
+    for lead in leads:
+        for field in LEAD_FIELDS:
+            value = lead.get(field)
+            if field == 'Quality Score':
+                value = value if isinstance(value, int) or value is None else coerce_score(str(value))
+            elif field == 'Timestamp':
+                value = parse_timestamp(value) if value else None
+            else:
+                value = '' if value is None else str(value)
+            columns[field].append(value)
+
+    schema = lead_arrow_schema()
+    return pyarrow.table(
+        {field: pyarrow.array(values, type=schema.field(field).type) for field, values in columns.items()},
+        schema=schema
+    )
+
+
+def write_leads_parquet(leads: List[Dict], dataset_dir: str, run_date: date = None,
+                        basename: str = None) -> Optional[str]:
+    """
+    Append leads to the dataset as a new file in its run_date partition
+
+    Existing files are never rewritten; each run adds
+    <dataset_dir>/run_date=YYYY-MM-DD/<basename>.parquet. Returns the file
+    path, or None when pyarrow is not installed or there is nothing to write.
+    """
+    if pyarrow is None:
+        logger.info("pyarrow not installed, skipping Parquet export (pip install pyarrow)")
+        return None
+    if not leads:
+        return None
+
+    run_date = run_date or date.today()
+    partition = os.path.join(dataset_dir, f'run_date={run_date.isoformat()}')
+    os.makedirs(partition, exist_ok=True)
+
+    basename = basename or f"leads-{datetime.now().strftime('%H-%M-%S-%f')}"
+    path = os.path.join(partition, f'{basename}.parquet')
+    pyarrow.parquet.write_table(
+        leads_to_table(leads), path,
+        compression='zstd',
+        use_dictionary=list(CATEGORICAL_FIELDS)
+    )
+    logger.info(f"✓ Saved {len(leads)} leads to {path}")
+    return path
+
+
+def load_history(dataset_dir: str, columns: List[str] = None, since: date = None,
+                 priority: str = None):
+    """
+    Read the lead history as one Arrow table
+
+    Filters are pushed down: partitions before `since` are not opened and
+    row groups are skipped on Priority statistics.
+    """
+    if pyarrow is None:
+        raise RuntimeError("pyarrow is required to read the Parquet lead history (pip install pyarrow)")
+
+    dataset = pyarrow.dataset.dataset(dataset_dir, format='parquet', partitioning='hive')
+    expression = None
+    if since:
+        expression = pyarrow.dataset.field('run_date') >= pyarrow.scalar(since.isoformat())
+    if priority:
+        condition = pyarrow.dataset.field('Priority') == priority.upper()
+        expression = condition if expression is None else expression & condition
+    return dataset.to_table(columns=columns, filter=expression)
+
+
+def main():
+    """Convert existing result CSVs into the dataset, or summarize it"""
+    parser = argparse.ArgumentParser(description="Parquet lead history partitioned by run date")
+    parser.add_argument('--dataset', help=f"Dataset directory (default <results>/{DATASET_NAME})")
+    parser.add_argument('--results', default=RESULTS_DIR, help="Results directory")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    export = commands.add_parser('export', help="Append CSV files (e.g. output of the JS exporters)")
+    export.add_argument('files', nargs='*', help="CSV files (default: every CSV in the results directory)")
+    export.add_argument('--run-date', type=date.fromisoformat,
+                        help="Partition to write to (default: each file's modification date)")
+
+    scan = commands.add_parser('scan', help="Lead counts per run date")
+    scan.add_argument('--since', type=date.fromisoformat)
+    scan.add_argument('--priority')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if pyarrow is None:
+        logger.error("pyarrow is not installed (pip install pyarrow)")
+        return
+
+    dataset_dir = args.dataset or os.path.join(args.results, DATASET_NAME)
+
+    if args.command == 'export':
+        files = args.files or sorted(glob.glob(os.path.join(args.results, '*.csv')))
+        for path in files:
+            leads = [as_dict(record) for record in read_leads(path)]
+            run_date = args.run_date or date.fromtimestamp(os.path.getmtime(path))
+            basename = os.path.splitext(os.path.basename(path))[0]
+            write_leads_parquet(leads, dataset_dir, run_date=run_date, basename=basename)
+        return
+
+    table = load_history(dataset_dir, columns=['run_date', 'Priority'], since=args.since,
+                         priority=args.priority)
+    for row in table.group_by('run_date').aggregate([('Priority', 'count')]).sort_by('run_date').to_pylist():
+        print(f"{row['run_date']} | {row['Priority_count']:6d} leads")
+    print(f"\n{table.num_rows} lead(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+# ================================================================
+# 🧭 LEAD SCHEMA - header-compiled column mapping for result CSVs
+# ================================================================
+
+import csv
+import logging
+from collections import namedtuple
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Canonical lead fields, in the column order the scrapers write them
+LEAD_FIELDS = ('Name', 'Category', 'Phone', 'Email', 'Website', 'Address', 'Priority',
+               'Quality Score', 'Data Source', 'Search Term', 'Timestamp')
+
+LeadRecord = namedtuple('LeadRecord', [field.lower().replace(' ', '_') for field in LEAD_FIELDS])
+
+# Header names (case-insensitive) each canonical field is read from, first match wins
+FIELD_ALIASES = {
+    'Name': ('name', 'company name', 'business name', 'businessname', 'companyname', 'company'),
+    'Category': ('category', 'business category', 'type', 'industry', 'service category', 'business type'),
+    'Phone': ('phone', 'phone number', 'contact number'),
+    'Email': ('email', 'email address', 'emails', 'additionalemails'),
+    'Website': ('website', 'website url', 'url'),
+    'Address': ('address', 'location', 'street'),
+    'Priority': ('priority', 'lead priority', 'leadpriority'),
+    'Quality Score': ('quality score', 'qualityscore', 'score', 'quality', 'lead score', 'leadscore'),
+    'Data Source': ('data source', 'datasource', 'lead source', 'source'),
+    'Search Term': ('search term', 'searchterm', 'source query', 'search focus'),
+    'Timestamp': ('timestamp', 'extractedat', 'scrapedat', 'campaign date'),
+}
+
+# Every header name any field is read from
+HEADER_NAMES = frozenset(alias for aliases in FIELD_ALIASES.values() for alias in aliases)
+
+# Values the scrapers write when a field is missing
+PLACEHOLDERS = {'', 'contact via website', 'not available', 'research required', 'n/a', 'none', 'null'}
+
+PRIORITIES = {'URGENT', 'HIGH', 'MEDIUM', 'LOW'}
+PRIORITY_ALIASES = {'VERY HIGH': 'URGENT', 'CRITICAL': 'URGENT'}
+
+
+def coerce_text(value: str) -> str:
+    return value.strip().strip('"').strip()
+
+
+def coerce_contact(value: str) -> str:
+    value = coerce_text(value)
+    return '' if value.lower() in PLACEHOLDERS else value
+
+
+def coerce_email(value: str) -> str:
+    value = coerce_contact(value)
+    return value if '@' in value else ''
+
+
+def coerce_priority(value: str) -> str:
+    value = coerce_text(value).upper()
+    value = PRIORITY_ALIASES.get(value, value)
+    return value if value in PRIORITIES else ''
+
+
+def coerce_score(value: str) -> Optional[int]:
+    """Quality score as an int 0-10, None when missing or not numeric; 0-100 scores are scaled down"""
+    try:
+        score = float(coerce_text(value))
+    except ValueError:
+        return None
+    if score > 10:
+        score /= 10
+    return min(max(int(round(score)), 0), 10)
+
+
+FIELD_COERCERS = {
+    'Phone': coerce_contact,
+    'Email': coerce_email,
+    'Website': coerce_contact,
+    'Priority': coerce_priority,
+    'Quality Score': coerce_score,
+}
+
+# Value of a field the file has no column for
+FIELD_DEFAULTS = {'Quality Score': None}
+
+
+class LeadSchema:
+    """Column map compiled once from a file header; turns raw rows into LeadRecords"""
+
+    def __init__(self, header: List[str]):
+        columns = {}
+        for index, name in enumerate(header):
+            # First occurrence wins; utf-8-sig BOMs survive some exports
+            columns.setdefault(name.strip().lstrip('﻿').lower(), index)
+
+        self.columns = {}
+        self.getters: List[Tuple[int, Callable]] = []
+        for field in LEAD_FIELDS:
+            index = next((columns[alias] for alias in FIELD_ALIASES[field] if alias in columns), -1)
+            self.columns[field] = index
+            self.getters.append((index, FIELD_COERCERS.get(field, coerce_text)))
+
+        self.defaults = tuple(FIELD_DEFAULTS.get(field, '') for field in LEAD_FIELDS)
+
+    @property
+    def missing(self) -> List[str]:
+        return [field for field, index in self.columns.items() if index < 0]
+
+    def record(self, values: List[str]) -> LeadRecord:
+        """Normalize one raw CSV row"""
+        width = len(values)
+        return LeadRecord._make(
+            coerce(values[index]) if 0 <= index < width else default
+            for (index, coerce), default in zip(self.getters, self.defaults)
+        )
+
+
+_mapping_schemas: Dict[Tuple[str, ...], LeadSchema] = {}
+
+
+def record_from_mapping(item: Dict) -> LeadRecord:
+    """Normalize one JSON lead object; schemas are compiled once per distinct key set"""
+    keys = tuple(item)
+    schema = _mapping_schemas.get(keys)
+    if schema is None:
+        schema = _mapping_schemas[keys] = LeadSchema(list(keys))
+
+    values = []
+    for value in item.values():
+        if isinstance(value, list):
+            # additionalEmails and similar: the first entry is the primary one
+            value = value[0] if value and isinstance(value[0], (str, int, float)) else ''
+        elif value is None or isinstance(value, (dict, bool)):
+            value = ''
+        values.append(str(value))
+    return schema.record(values)
+
+
+def _header_cells(values: List[str]) -> List[str]:
+    return [value.strip().lstrip('\ufeff').lower() for value in values]
+
+
+def is_header_row(values: List[str], header: List[str]) -> bool:
+    """
+    True for a repeated header: the row equals the current header, or every
+    non-empty cell of it (at least two) is a known column name
+    """
+    cells = _header_cells(values)
+    if cells == _header_cells(header):
+        return True
+    named = [cell for cell in cells if cell]
+    return len(named) >= 2 and all(cell in HEADER_NAMES for cell in named)
+
+
+def as_dict(record: LeadRecord) -> Dict:
+    """LeadRecord -> dict keyed by the scraper's CSV column names"""
+    return dict(zip(LEAD_FIELDS, record))
+
+
+def read_leads(path: str) -> Iterator[LeadRecord]:
+    """
+    Stream normalized LeadRecords from a CSV file; rows without a name are dropped
+
+    Some reports concatenate sections with their own headers; a row that is
+    itself a header (see is_header_row) starts a new section and recompiles
+    the schema. A business that happens to be called "Company" is kept.
+    """
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header:
+            return
+
+        schema = LeadSchema(header)
+        if schema.columns['Name'] < 0:
+            logger.warning(f"No company name column in {path}, skipping")
+            return
+
+        for values in reader:
+            if is_header_row(values, header):
+                header, schema = values, LeadSchema(values)
+                continue
+            record = schema.record(values)
+            if record.name:
+                yield record
+
+
+def iter_lead_rows(files: Iterable[str]) -> Iterator[Tuple[str, Dict]]:
+    """Reader stage for ImportPipeline: (file, canonical lead dict) for every file"""
+    for path in files:
+        try:
+            for record in read_leads(path):
+                yield path, as_dict(record)
+        except (OSError, UnicodeDecodeError, csv.Error) as e:
+            logger.error(f"Error reading {path}: {e}")
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# ================================================================
+# 🎯 LEAD SCORING - vectorized priority, quality score and contact flags
+# ================================================================
+# google_maps_scraper.py and bulk_import_leads.py score every lead through
+# this module, so NumPy is a hard dependency of both (see requirements.txt).
+
+import argparse
+import csv
+import time
+from typing import Dict, List, Mapping, Sequence
+
+import numpy as np
+
+from lead_schema import PLACEHOLDERS
+
+# Priority rules
+CONTACT_COUNT = 'contact_count'      # scraper: one level per contact channel found
+EMAIL_WEIGHTED = 'email_weighted'    # historical importer: email is what makes a lead hot
+
+PRIORITY_LEVELS = np.array(['LOW', 'MEDIUM', 'HIGH', 'URGENT'])
+
+QUALITY_WEIGHTS = {'base': 4, 'phone': 2, 'website': 2, 'email': 1, 'category': 1}
+MAX_QUALITY_SCORE = 10
+
+_PLACEHOLDER_ARRAY = np.array(sorted(PLACEHOLDERS))
+
+
+def present(values: Sequence) -> np.ndarray:
+    """Boolean mask of values that carry real data (not blank or a placeholder)"""
+    values = np.char.lower(np.char.strip(np.asarray(values, dtype=str)))
+    return ~np.isin(values, _PLACEHOLDER_ARRAY)
+
+
+def _column(columns: Mapping, field: str, length: int) -> Sequence:
+    return columns[field] if field in columns else [''] * length
+
+
+def contact_flags(columns: Mapping) -> Dict[str, np.ndarray]:
+    """
+    Contact-completeness flags for whole columns
+
+    Args:
+        columns: Mapping of CSV field name -> column (list, NumPy array or a
+                 pandas DataFrame); Phone, Website, Email and Category are used
+    """
+    length = max((len(columns[field]) for field in ('Phone', 'Website', 'Email', 'Category') if field in columns),
+                 default=0)
+    flags = {
+        'has_phone': present(_column(columns, 'Phone', length)),
+        'has_website': present(_column(columns, 'Website', length)),
+        'has_email': present(_column(columns, 'Email', length)),
+        'has_category': present(_column(columns, 'Category', length)),
+    }
+    flags['contact_count'] = (flags['has_phone'].astype(np.int8) + flags['has_website'] + flags['has_email'])
+    return flags
+
+
+def quality_scores(flags: Dict[str, np.ndarray], weights: Dict[str, int] = None) -> np.ndarray:
+    """Quality score (capped at 10) from contact flags"""
+    weights = weights or QUALITY_WEIGHTS
+    score = np.full(len(flags['has_phone']), weights['base'], dtype=np.int16)
+    for channel in ('phone', 'website', 'email', 'category'):
+        score += weights[channel] * flags[f'has_{channel}']
+    return np.minimum(score, MAX_QUALITY_SCORE)
+
+
+def priorities(flags: Dict[str, np.ndarray], rule: str = CONTACT_COUNT) -> np.ndarray:
+    """Priority label per lead under the given rule"""
+    if rule == CONTACT_COUNT:
+        return PRIORITY_LEVELS[np.minimum(flags['contact_count'], 3)]
+
+    if rule == EMAIL_WEIGHTED:
+        email, website, phone = flags['has_email'], flags['has_website'], flags['has_phone']
+        return np.select(
+            [email & website & phone, email & (website | phone), email | website],
+            ['URGENT', 'HIGH', 'MEDIUM'],
+            default='LOW'
+        )
+
+    raise ValueError(f"Unknown priority rule: {rule}")
+
+
+def score_columns(columns: Mapping, rule: str = CONTACT_COUNT, weights: Dict[str, int] = None) -> Dict[str, np.ndarray]:
+    """Priority, Quality Score and contact flags for whole columns"""
+    flags = contact_flags(columns)
+    flags['Priority'] = priorities(flags, rule)
+    flags['Quality Score'] = quality_scores(flags, weights)
+    return flags
+
+
+def score_leads(leads: List[Dict], rule: str = CONTACT_COUNT, weights: Dict[str, int] = None,
+                fill_missing_only: bool = False) -> List[Dict]:
+    """
+    Score a list of lead dicts in one vectorized pass (in place)
+
+    With fill_missing_only, leads keep a Priority or Quality Score they
+    already carry and only blanks are filled.
+    """
+    if not leads:
+        return leads
+
+    columns = {field: [lead.get(field) or '' for lead in leads]
+               for field in ('Phone', 'Website', 'Email', 'Category')}
+    scored = score_columns(columns, rule, weights)
+
+    for lead, priority, score in zip(leads, scored['Priority'].tolist(), scored['Quality Score'].tolist()):
+        if not fill_missing_only or not lead.get('Priority'):
+            lead['Priority'] = priority
+        if not fill_missing_only or lead.get('Quality Score') in (None, ''):
+            lead['Quality Score'] = score
+    return leads
+
+
+def lead_priority(phone, website, email, rule: str = CONTACT_COUNT) -> str:
+    """Scalar wrapper: priority of a single lead"""
+    flags = contact_flags({'Phone': [phone or ''], 'Website': [website or ''], 'Email': [email or '']})
+    return str(priorities(flags, rule)[0])
+
+
+def lead_quality_score(phone, website, category, email, weights: Dict[str, int] = None) -> int:
+    """Scalar wrapper: quality score of a single lead"""
+    flags = contact_flags({'Phone': [phone or ''], 'Website': [website or ''],
+                           'Email': [email or ''], 'Category': [category or '']})
+    return int(quality_scores(flags, weights)[0])
+
+
+def score_summary(leads: List[Dict]) -> Dict:
+    """Counts and average quality of a list of leads, as shown by the live monitors"""
+    if not leads:
+        return {'total': 0, 'urgent': 0, 'high': 0, 'with_email': 0, 'with_website': 0, 'avg_quality': 0.0}
+
+    priority = np.asarray([lead.get('Priority') or '' for lead in leads], dtype=str)
+    scores = np.char.strip(np.asarray([lead.get('Quality Score') or '' for lead in leads], dtype=str))
+    numeric = np.char.isdigit(np.char.replace(scores, '.', '', count=1))
+    flags = contact_flags({field: [lead.get(field) or '' for lead in leads] for field in ('Email', 'Website')})
+
+    return {
+        'total': len(leads),
+        'urgent': int(np.count_nonzero(priority == 'URGENT')),
+        'high': int(np.count_nonzero(priority == 'HIGH')),
+        'with_email': int(np.count_nonzero(flags['has_email'])),
+        'with_website': int(np.count_nonzero(flags['has_website'])),
+        'avg_quality': float(scores[numeric].astype(float).mean()) if numeric.any() else 0.0,
+    }
+
+
+def main():
+    """Re-score result CSVs, e.g. after a weight change"""
+    parser = argparse.ArgumentParser(description="Re-score lead CSV files")
+    parser.add_argument('files', nargs='+', help="Lead CSV files (scraper columns)")
+    parser.add_argument('--rule', choices=[CONTACT_COUNT, EMAIL_WEIGHTED], default=CONTACT_COUNT)
+    parser.add_argument('--write', action='store_true', help="Rewrite Priority and Quality Score in place")
+    args = parser.parse_args()
+
+    for path in args.files:
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.DictReader(f)
+            fieldnames = reader.fieldnames or []
+            rows = list(reader)
+
+        started = time.perf_counter()
+        scored = score_columns({field: [row.get(field) or '' for row in rows] for field in fieldnames
+                                if field in ('Phone', 'Website', 'Email', 'Category')}, args.rule)
+        elapsed = time.perf_counter() - started
+
+        levels, counts = np.unique(scored['Priority'], return_counts=True)
+        distribution = ', '.join(f"{level} {count}" for level, count in zip(levels, counts))
+        print(f"{path}: {len(rows)} leads in {elapsed * 1000:.1f} ms | {distribution}")
+
+        if args.write and rows:
+            for row, priority, score in zip(rows, scored['Priority'].tolist(), scored['Quality Score'].tolist()):
+                row['Priority'], row['Quality Score'] = priority, score
+            fieldnames += [field for field in ('Priority', 'Quality Score') if field not in fieldnames]
+            with open(path, 'w', encoding='utf-8', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=fieldnames)
+                writer.writeheader()
+                writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,492 @@
+#!/usr/bin/env python3
+# ================================================================
+# 🗄️ LEAD STORE - one indexed SQLite database for every result file
+# ================================================================
+
+import argparse
+import csv
+import glob
+import json
+import logging
+import os
+import sqlite3
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from lead_dedup import merge_group
+from lead_identity import clean_value, normalize_name, normalize_phone, website_domain
+from lead_schema import LEAD_FIELDS, LeadRecord, as_dict, read_leads, record_from_mapping
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# <repo>/results; lead-store.js reads the store from the same place
+RESULTS_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'results'))
+STORE_NAME = '.lead_store.db'
+
+# Store columns, one per canonical lead field
+LEAD_COLUMNS = LeadRecord._fields
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS leads (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        category TEXT NOT NULL DEFAULT '',
+        phone TEXT NOT NULL DEFAULT '',
+        email TEXT NOT NULL DEFAULT '',
+        website TEXT NOT NULL DEFAULT '',
+        address TEXT NOT NULL DEFAULT '',
+        priority TEXT NOT NULL DEFAULT '',
+        quality_score INTEGER,
+        data_source TEXT NOT NULL DEFAULT '',
+        search_term TEXT NOT NULL DEFAULT '',
+        timestamp TEXT NOT NULL DEFAULT '',
+        phone_key TEXT NOT NULL DEFAULT '',
+        domain TEXT NOT NULL DEFAULT '',
+        name_key TEXT NOT NULL DEFAULT '',
+        first_seen TEXT NOT NULL,
+        last_seen TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS leads_phone_key ON leads (phone_key) WHERE phone_key != '';
+    CREATE INDEX IF NOT EXISTS leads_domain ON leads (domain) WHERE domain != '';
+    CREATE INDEX IF NOT EXISTS leads_name_key ON leads (name_key);
+    CREATE INDEX IF NOT EXISTS leads_priority_score ON leads (priority, quality_score);
+    CREATE INDEX IF NOT EXISTS leads_category ON leads (category COLLATE NOCASE);
+
+    CREATE TABLE IF NOT EXISTS lead_sources (
+        lead_id INTEGER NOT NULL REFERENCES leads (id),
+        file TEXT NOT NULL,
+        record TEXT NOT NULL,
+        PRIMARY KEY (lead_id, file)
+    );
+
+    CREATE TABLE IF NOT EXISTS executives (
+        id INTEGER PRIMARY KEY,
+        lead_id INTEGER REFERENCES leads (id),
+        company TEXT NOT NULL DEFAULT '',
+        name TEXT NOT NULL,
+        email TEXT NOT NULL DEFAULT '',
+        position TEXT NOT NULL DEFAULT '',
+        linkedin TEXT NOT NULL DEFAULT '',
+        source TEXT NOT NULL DEFAULT '',
+        file TEXT NOT NULL,
+        UNIQUE (name, email, company)
+    );
+    CREATE INDEX IF NOT EXISTS executives_lead ON executives (lead_id);
+    CREATE INDEX IF NOT EXISTS executives_email ON executives (email) WHERE email != '';
+
+    CREATE TABLE IF NOT EXISTS files (
+        path TEXT PRIMARY KEY,
+        size INTEGER NOT NULL,
+        mtime REAL NOT NULL,
+        leads INTEGER NOT NULL,
+        executives INTEGER NOT NULL,
+        ingested_at TEXT NOT NULL
+    );
+"""
+
+FTS_SCHEMA = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS leads_fts USING fts5 (
+        name, category, address, content='leads', content_rowid='id'
+    );
+    CREATE TRIGGER IF NOT EXISTS leads_fts_insert AFTER INSERT ON leads BEGIN
+        INSERT INTO leads_fts (rowid, name, category, address)
+        VALUES (new.id, new.name, new.category, new.address);
+    END;
+    CREATE TRIGGER IF NOT EXISTS leads_fts_delete AFTER DELETE ON leads BEGIN
+        INSERT INTO leads_fts (leads_fts, rowid, name, category, address)
+        VALUES ('delete', old.id, old.name, old.category, old.address);
+    END;
+    CREATE TRIGGER IF NOT EXISTS leads_fts_update AFTER UPDATE OF name, category, address ON leads BEGIN
+        INSERT INTO leads_fts (leads_fts, rowid, name, category, address)
+        VALUES ('delete', old.id, old.name, old.category, old.address);
+        INSERT INTO leads_fts (rowid, name, category, address)
+        VALUES (new.id, new.name, new.category, new.address);
+    END;
+"""
+
+# Keys that mark a JSON object as a business rather than a summary block
+BUSINESS_NAME_KEYS = ('businessName', 'name', 'companyName', 'Company Name', 'Name')
+BUSINESS_DETAIL_KEYS = ('phone', 'website', 'address', 'category', 'Phone', 'Website', 'Address', 'Category')
+
+
+def fts_query(text: str) -> str:
+    """Turn free text into an FTS5 prefix query (every word must match)"""
+    words = [word.replace('"', '""') for word in text.split()]
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def result_files(results_dir: str) -> List[str]:
+    """Every CSV and JSON result file, campaign folders included"""
+    files = []
+    for pattern in ('**/*.csv', '**/*.json'):
+        files.extend(glob.glob(os.path.join(results_dir, pattern), recursive=True))
+    return sorted(path for path in files if not os.path.basename(path).startswith('.'))
+
+
+def json_items(data, depth: int = 0) -> Iterator[Tuple[str, Dict]]:
+    """Walk a result JSON document and yield ('lead' | 'company' | 'executive', object)"""
+    if depth > 5:
+        return
+
+    if isinstance(data, list):
+        for item in data:
+            yield from json_items(item, depth + 1)
+    elif isinstance(data, dict):
+        if isinstance(data.get('company'), dict):
+            # Apollo: {company: {...}, executives: [...], category, scrapedAt}
+            yield 'company', data
+        elif 'position' in data and isinstance(data.get('name'), str):
+            yield 'executive', data
+        elif (any(isinstance(data.get(key), str) and data[key] for key in BUSINESS_NAME_KEYS) and
+              any(key in data for key in BUSINESS_DETAIL_KEYS)):
+            yield 'lead', data
+        else:
+            for value in data.values():
+                if isinstance(value, (list, dict)):
+                    yield from json_items(value, depth + 1)
+
+
+def apollo_company_lead(item: Dict) -> Dict:
+    """Flatten an Apollo company wrapper into a lead object"""
+    company = item['company']
+    return {
+        'name': company.get('name'),
+        'category': item.get('category') or company.get('industry'),
+        'phone': company.get('phone'),
+        'website': company.get('website') or company.get('domain'),
+        'address': ', '.join(part for part in (company.get('street'), company.get('city')) if part),
+        'source': 'Apollo',
+        'scrapedAt': item.get('scrapedAt'),
+    }
+
+
+class LeadStore:
+    """
+    SQLite store of every lead and executive found in the result files
+
+    Copies of a business across files are merged into one row, matched on
+    the indexed canonical keys (E.164 phone, website domain, name slug).
+    Each file a lead came from is kept in lead_sources with the raw record;
+    names, categories and addresses are full-text indexed (FTS5).
+    """
+
+    def __init__(self, db_path: str):
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        try:
+            self.conn.executescript(FTS_SCHEMA)
+            self.fts = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5: search falls back to LIKE
+            logger.warning("SQLite has no FTS5, lead search will use LIKE scans")
+            self.fts = False
+        self.conn.commit()
+
+    # ---------------------------------------------------------------- ingestion
+
+    def ingest(self, paths: Iterable[str], force: bool = False) -> Dict:
+        """Ingest result files, skipping those unchanged since their last ingestion"""
+        totals = {'files': 0, 'skipped': 0, 'leads': 0, 'executives': 0}
+        for path in paths:
+            if not force and self._unchanged(path):
+                totals['skipped'] += 1
+                continue
+
+            try:
+                leads, executives = self.ingest_file(path)
+            except (OSError, UnicodeDecodeError, ValueError, csv.Error) as e:
+                logger.error(f"Error ingesting {path}: {e}")
+                continue
+
+            totals['files'] += 1
+            totals['leads'] += leads
+            totals['executives'] += executives
+        return totals
+
+    def ingest_file(self, path: str) -> Tuple[int, int]:
+        """Ingest one CSV or JSON result file in a single transaction"""
+        name = os.path.basename(path)
+        leads = executives = 0
+
+        with self.conn:
+            if path.lower().endswith('.json'):
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                for kind, item in json_items(data):
+                    if kind == 'company':
+                        lead_id = self._add_lead(record_from_mapping(apollo_company_lead(item)), name, item)
+                        leads += lead_id is not None
+                        for executive in item.get('executives') or []:
+                            executives += self._add_executive(executive, name, lead_id,
+                                                              company=item['company'].get('name'))
+                    elif kind == 'executive':
+                        executives += self._add_executive(item, name)
+                    else:
+                        leads += self._add_lead(record_from_mapping(item), name, item) is not None
+            elif self._is_executive_csv(path):
+                with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+                    for row in csv.DictReader(f):
+                        executives += self._add_executive({k.lower(): v for k, v in row.items() if k}, name)
+            else:
+                for record in read_leads(path):
+                    leads += self._add_lead(record, name, as_dict(record)) is not None
+
+            stat = os.stat(path)
+            self.conn.execute("""
+                INSERT OR REPLACE INTO files (path, size, mtime, leads, executives, ingested_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (os.path.abspath(path), stat.st_size, stat.st_mtime, leads, executives,
+                  datetime.now().isoformat()))
+
+        logger.info(f"Ingested {name}: {leads} leads, {executives} executives")
+        return leads, executives
+
+    def _unchanged(self, path: str) -> bool:
+        stat = os.stat(path)
+        row = self.conn.execute(
+            "SELECT size, mtime FROM files WHERE path = ?", (os.path.abspath(path),)
+        ).fetchone()
+        return bool(row) and row['size'] == stat.st_size and row['mtime'] == stat.st_mtime
+
+    @staticmethod
+    def _is_executive_csv(path: str) -> bool:
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            header = next(csv.reader(f), [])
+        return 'position' in {column.strip().lower() for column in header}
+
+    def _match(self, phone_key: str, domain: str, name_key: str) -> Optional[sqlite3.Row]:
+        """Existing lead for these canonical keys, strongest key first"""
+        if phone_key:
+            row = self.conn.execute("SELECT * FROM leads WHERE phone_key = ? LIMIT 1", (phone_key,)).fetchone()
+            if row:
+                return row
+        if domain:
+            row = self.conn.execute("SELECT * FROM leads WHERE domain = ? LIMIT 1", (domain,)).fetchone()
+            if row:
+                return row
+        if name_key:
+            # Same name but a different phone or domain is another branch or business
+            for row in self.conn.execute("SELECT * FROM leads WHERE name_key = ?", (name_key,)):
+                if not ((phone_key and row['phone_key'] and phone_key != row['phone_key']) or
+                        (domain and row['domain'] and domain != row['domain'])):
+                    return row
+        return None
+
+    def _add_lead(self, record: LeadRecord, file: str, raw: Dict) -> Optional[int]:
+        """Insert a lead or merge it into the stored copy of the same business"""
+        if not record.name:
+            return None
+
+        lead = as_dict(record)
+        now = datetime.now().isoformat()
+        row = self._match(normalize_phone(record.phone), website_domain(record.website),
+                          normalize_name(record.name))
+
+        if row:
+            lead = merge_group([dict(zip(LEAD_FIELDS, (row[column] for column in LEAD_COLUMNS))), lead])
+
+        values = [lead[field] if lead[field] is not None else (None if field == 'Quality Score' else '')
+                  for field in LEAD_FIELDS]
+        keys = [normalize_phone(lead['Phone']), website_domain(lead['Website']), normalize_name(lead['Name'])]
+
+        if row:
+            lead_id = row['id']
+            assignments = ', '.join(f'{column} = ?' for column in LEAD_COLUMNS)
+            self.conn.execute(
+                f"UPDATE leads SET {assignments}, phone_key = ?, domain = ?, name_key = ?, last_seen = ? WHERE id = ?",
+                values + keys + [now, lead_id]
+            )
+        else:
+            placeholders = ', '.join('?' for _ in range(len(LEAD_COLUMNS) + 5))
+            lead_id = self.conn.execute(
+                f"INSERT INTO leads ({', '.join(LEAD_COLUMNS)}, phone_key, domain, name_key, first_seen, last_seen) "
+                f"VALUES ({placeholders})",
+                values + keys + [now, now]
+            ).lastrowid
+
+        self.conn.execute(
+            "INSERT OR REPLACE INTO lead_sources (lead_id, file, record) VALUES (?, ?, ?)",
+            (lead_id, file, json.dumps(raw, ensure_ascii=False, default=str))
+        )
+        return lead_id
+
+    def _add_executive(self, item: Dict, file: str, lead_id: int = None, company: str = None) -> int:
+        """Store an executive, linked to their company's lead when it can be found"""
+        name = clean_value(item.get('name'))
+        if not name:
+            return 0
+
+        email = clean_value(item.get('email')).lower()
+        company = clean_value(company or item.get('company'))
+        if company == 'undefined':
+            company = ''
+
+        if lead_id is None and '@' in email:
+            row = self.conn.execute(
+                "SELECT id FROM leads WHERE domain = ? LIMIT 1", (website_domain(email.split('@', 1)[1]),)
+            ).fetchone()
+            lead_id = row['id'] if row else None
+        if lead_id is None and company:
+            row = self.conn.execute(
+                "SELECT id FROM leads WHERE name_key = ? LIMIT 1", (normalize_name(company),)
+            ).fetchone()
+            lead_id = row['id'] if row else None
+
+        self.conn.execute("""
+            INSERT INTO executives (lead_id, company, name, email, position, linkedin, source, file)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (name, email, company) DO UPDATE SET
+                lead_id = COALESCE(excluded.lead_id, executives.lead_id),
+                position = excluded.position, linkedin = excluded.linkedin, source = excluded.source
+        """, (lead_id, company, name, email, clean_value(item.get('position') or item.get('title')),
+              clean_value(item.get('linkedin') or item.get('linkedin_url')), clean_value(item.get('source')), file))
+        return 1
+
+    # ---------------------------------------------------------------- queries
+
+    def search(self, text: str, limit: int = 20) -> List[Dict]:
+        """Full-text search over names, categories and addresses, best matches first"""
+        if not text.strip():
+            return []
+        if self.fts:
+            rows = self.conn.execute("""
+                SELECT leads.* FROM leads_fts JOIN leads ON leads.id = leads_fts.rowid
+                 WHERE leads_fts MATCH ? ORDER BY bm25(leads_fts) LIMIT ?
+            """, (fts_query(text), limit))
+        else:
+            pattern = f'%{text.strip()}%'
+            rows = self.conn.execute("""
+                SELECT * FROM leads WHERE name LIKE ? OR category LIKE ? OR address LIKE ? LIMIT ?
+            """, (pattern, pattern, pattern, limit))
+        return [dict(row) for row in rows]
+
+    def find(self, priority: str = None, category: str = None, min_score: int = None,
+             has_email: bool = None, has_phone: bool = None, has_website: bool = None,
+             limit: int = None) -> List[Dict]:
+        """Filter leads on indexed columns, best priority and score first"""
+        clauses, params = [], []
+        if priority:
+            clauses.append("priority = ?")
+            params.append(priority.upper())
+        if category:
+            clauses.append("category = ? COLLATE NOCASE")
+            params.append(category)
+        if min_score is not None:
+            clauses.append("quality_score >= ?")
+            params.append(min_score)
+        for column, wanted in (('email', has_email), ('phone', has_phone), ('website', has_website)):
+            if wanted is not None:
+                clauses.append(f"{column} {'!=' if wanted else '='} ''")
+
+        sql = "SELECT * FROM leads"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += """ ORDER BY CASE priority WHEN 'URGENT' THEN 4 WHEN 'HIGH' THEN 3 WHEN 'MEDIUM' THEN 2
+                                          WHEN 'LOW' THEN 1 ELSE 0 END DESC, quality_score DESC"""
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def lookup(self, phone: str = None, website: str = None, name: str = None) -> Optional[Dict]:
+        """The stored lead for a phone, website or business name, if any"""
+        row = self._match(normalize_phone(phone), website_domain(website), normalize_name(name))
+        return dict(row) if row else None
+
+    def executives(self, lead_id: int) -> List[Dict]:
+        return [dict(row) for row in self.conn.execute(
+            "SELECT * FROM executives WHERE lead_id = ? ORDER BY name", (lead_id,)
+        )]
+
+    def leads_with_executives(self) -> List[Dict]:
+        """Leads joined with their executives, one row per executive"""
+        return [dict(row) for row in self.conn.execute("""
+            SELECT leads.id AS lead_id, leads.name AS company, leads.phone, leads.website, leads.priority,
+                   executives.name, executives.email, executives.position, executives.linkedin
+              FROM executives JOIN leads ON leads.id = executives.lead_id
+             ORDER BY leads.name, executives.name
+        """)]
+
+    def iter_leads(self) -> Iterator[Dict]:
+        """Every stored lead as a dict keyed by the scraper's CSV column names"""
+        for row in self.conn.execute(f"SELECT {', '.join(LEAD_COLUMNS)} FROM leads ORDER BY id"):
+            yield dict(zip(LEAD_FIELDS, row))
+
+    def stats(self) -> Dict:
+        one = lambda sql: self.conn.execute(sql).fetchone()[0]
+        return {
+            'files': one("SELECT COUNT(*) FROM files"),
+            'leads': one("SELECT COUNT(*) FROM leads"),
+            'with_email': one("SELECT COUNT(*) FROM leads WHERE email != ''"),
+            'with_phone': one("SELECT COUNT(*) FROM leads WHERE phone != ''"),
+            'executives': one("SELECT COUNT(*) FROM executives"),
+            'linked_executives': one("SELECT COUNT(*) FROM executives WHERE lead_id IS NOT NULL"),
+            'by_priority': dict(self.conn.execute(
+                "SELECT priority, COUNT(*) FROM leads GROUP BY priority ORDER BY COUNT(*) DESC"
+            ).fetchall()),
+        }
+
+    def close(self):
+        self.conn.close()
+
+
+def main():
+    """Build and query the lead store from the command line"""
+    parser = argparse.ArgumentParser(description="SQLite store of every scraped lead")
+    parser.add_argument('--results', default=RESULTS_DIR, help="Results directory")
+    parser.add_argument('--db', default=os.environ.get('LEAD_STORE_PATH'),
+                        help=f"Store path (default $LEAD_STORE_PATH, else <results>/{STORE_NAME})")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    ingest = commands.add_parser('ingest', help="Ingest new or changed result files")
+    ingest.add_argument('--force', action='store_true', help="Re-ingest unchanged files too")
+
+    search = commands.add_parser('search', help="Full-text search over name, category, address")
+    search.add_argument('text')
+    search.add_argument('--limit', type=int, default=20)
+
+    find = commands.add_parser('find', help="Filter leads")
+    find.add_argument('--priority')
+    find.add_argument('--category')
+    find.add_argument('--min-score', type=int)
+    find.add_argument('--with-email', action='store_true')
+    find.add_argument('--with-phone', action='store_true')
+    find.add_argument('--limit', type=int, default=50)
+
+    commands.add_parser('stats', help="Store counts")
+    args = parser.parse_args()
+
+    store = LeadStore(args.db or os.path.join(args.results, STORE_NAME))
+    try:
+        if args.command == 'ingest':
+            totals = store.ingest(result_files(args.results), force=args.force)
+            print(f"📥 {totals['files']} files ingested ({totals['skipped']} unchanged), "
+                  f"{totals['leads']} lead records, {totals['executives']} executives")
+            print(json.dumps(store.stats(), indent=2))
+        elif args.command == 'stats':
+            print(json.dumps(store.stats(), indent=2))
+        else:
+            if args.command == 'search':
+                leads = store.search(args.text, limit=args.limit)
+            else:
+                leads = store.find(priority=args.priority, category=args.category, min_score=args.min_score,
+                                   has_email=args.with_email or None, has_phone=args.with_phone or None,
+                                   limit=args.limit)
+            for lead in leads:
+                print(f"{lead['id']:5d} | {lead['name'][:40]:<40} | {lead['priority']:6} | "
+                      f"{lead['phone'] or '-':<16} | {lead['category'][:30]}")
+            print(f"\n{len(leads)} lead(s)")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ import csv
 import json
 import time
 from datetime import datetime, timedelta
+from lead_scoring import score_summary
 
 def get_latest_results():
     """Get the latest CSV results file"""
@@ -58,20 +59,13 @@ def display_live_progress():
                 
                 if leads:
                     # Analyze lead quality
-                    urgent_leads = [l for l in leads if l.get('Priority') == 'URGENT']
-                    high_leads = [l for l in leads if l.get('Priority') == 'HIGH']
-                    email_leads = [l for l in leads if l.get('Email') and l['Email'] not in ['Not available', '']]
-                    website_leads = [l for l in leads if l.get('Website') and l['Website'] not in ['Not available', '']]
+                    summary = score_summary(leads)
                     
-                    print(f"🔥 URGENT Priority: {len(urgent_leads)} leads")
-                    print(f"⭐ HIGH Priority: {len(high_leads)} leads")
-                    print(f"📧 With Email: {len(email_leads)} leads")
-                    print(f"🌐 With Website: {len(website_leads)} leads")
-                    
-                    # Calculate average quality score
-                    quality_scores = [float(l.get('Quality Score', 0)) for l in leads if l.get('Quality Score', '').replace('.', '').isdigit()]
-                    avg_quality = sum(quality_scores) / len(quality_scores) if quality_scores else 0
-                    print(f"🎯 Average Quality Score: {avg_quality:.1f}/10")
+                    print(f"🔥 URGENT Priority: {summary['urgent']} leads")
+                    print(f"⭐ HIGH Priority: {summary['high']} leads")
+                    print(f"📧 With Email: {summary['with_email']} leads")
+                    print(f"🌐 With Website: {summary['with_website']} leads")
+                    print(f"🎯 Average Quality Score: {summary['avg_quality']:.1f}/10")
                     
                     print("\n" + "─" * 80)
                     print("🏆 TOP QUALITY LEADS")
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# ================================================================
+# 📮 CRM OUTBOX REPLAY - re-send leads that never reached Odoo
+# ================================================================
+
+import argparse
+import json
+import logging
+import os
+
+from lead_outbox import LeadOutbox, OutboxConnector
+from webhook_crm_connector import get_webhook_connector
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+CONFIG_PATH = "d:/apify/apify_actor/crm_config.json"
+
+
+def print_counts(outbox: LeadOutbox):
+    counts = outbox.counts()
+    print(f"   Pending:   {counts['pending']}")
+    print(f"   In flight: {counts['in_flight']}")
+    print(f"   Failed:    {counts['failed']} ({counts['dead']} out of attempts)")
+    print(f"   Delivered: {counts['succeeded']}")
+
+
+def replay_outbox():
+    """Drain the CRM outbox at a controlled rate"""
+    parser = argparse.ArgumentParser(description="Re-send undelivered leads from the CRM outbox")
+    parser.add_argument('--config', default=CONFIG_PATH, help="crm_config.json path")
+    parser.add_argument('--rate', type=float, default=5.0, help="Maximum leads per second (default 5)")
+    parser.add_argument('--limit', type=int, help="Stop after this many leads")
+    parser.add_argument('--retry-dead', action='store_true',
+                        help="Also retry leads that used up all their attempts")
+    parser.add_argument('--status', action='store_true', help="Only show outbox counts")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.config):
+        logger.error(f"CRM config file not found: {args.config}")
+        return
+
+    with open(args.config, 'r') as f:
+        config = json.load(f)
+
+    push_settings = config.get('push_settings', {})
+    outbox_path = push_settings.get('outbox_path')
+    if not outbox_path or not os.path.exists(outbox_path):
+        logger.error("No CRM outbox found (push_settings.outbox_path)")
+        return
+
+    outbox = LeadOutbox(outbox_path, max_attempts=push_settings.get('outbox_max_attempts', 5),
+                        lease_timeout=push_settings.get('outbox_lease_timeout', 300))
+
+    print("\n" + "=" * 60)
+    print("📮 CRM OUTBOX")
+    print("=" * 60)
+    print_counts(outbox)
+
+    if args.status:
+        return
+
+    recovered = outbox.recover_in_flight(older_than=outbox.lease_timeout)
+    if recovered:
+        print(f"\n🔁 {recovered} lead(s) left in flight by a crashed run returned to pending")
+    if args.retry_dead:
+        print(f"🔁 {outbox.reset_failed()} failed lead(s) reset for another round of attempts")
+
+    credentials = config.get('credentials', {})
+    connector = OutboxConnector(
+        get_webhook_connector(
+            webhook_url=credentials.get('webhook_url'),
+            auth_header=credentials.get('auth_header'),
+            push_settings=push_settings,
+            webhook_settings=config.get('webhook_settings', {})
+        ),
+        outbox
+    )
+
+    print(f"\n📤 Replaying at up to {args.rate} leads/sec...")
+    results = connector.drain(limit=args.limit, rate=args.rate)
+
+    print("\n" + "=" * 60)
+    print(f"✅ Delivered: {results['success']}")
+    print(f"❌ Failed:    {results['failed']}")
+    print(f"📮 Still undelivered: {results['undelivered']}")
+    print("=" * 60)
+    outbox.close()
+
+
+if __name__ == "__main__":
+    replay_outbox()
@@ -3,7 +3,6 @@
 Script to send old leads from CSV files to Odoo CRM via webhook
 Enhanced version with better error handling and progress tracking
 """
-import csv
 import json
 import os
 import sys
@@ -12,23 +11,23 @@ import requests
 import logging
 from datetime import datetime
 from typing import List, Dict
+from webhook_crm_connector import get_webhook_connector
+from import_manifest import ImportManifest
+from lead_schema import read_leads
 
-class OldLeadsImporter:
-    def __init__(self, webhook_url: str, results_dir: str = "d:/apify/apify_actor/results"):
-        self.webhook_url = webhook_url
-        self.results_dir = results_dir
-        self.imported_count = 0
-        self.failed_count = 0
-        
-    def get_latest_csv_files(self, count: int = 2) -> List[str]:
-    """Find all CSV files in the results directory"""
-    results_dir = "d:/apify/apify_actor/results"
+RESULTS_DIR = "d:/apify/apify_actor/results"
+
+def find_csv_files(manifest: ImportManifest = None):
+    """Find CSV files in the results directory, minus those fully imported before"""
     csv_files = []
     
-    if os.path.exists(results_dir):
-        csv_files = glob.glob(os.path.join(results_dir, "*.csv"))
+    if os.path.exists(RESULTS_DIR):
+        csv_files = glob.glob(os.path.join(RESULTS_DIR, "*.csv"))
         csv_files.sort(key=os.path.getmtime, reverse=True)  # Sort by modification time, newest first
     
+    if manifest:
+        csv_files = manifest.pending_files(csv_files)
+    
     return csv_files
 
 def load_leads_from_csv(csv_file):
@@ -36,27 +35,21 @@ def load_leads_from_csv(csv_file):
     leads = []
     
     try:
-        with open(csv_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                # Convert to expected format
-                lead = {
-                    'Name': row.get('Name', '').strip('"'),
-                    'Category': row.get('Category', '').strip('"'),
-                    'Phone': row.get('Phone', '').strip('"'),
-                    'Email': row.get('Email', 'Not available').strip('"'),
-                    'Website': row.get('Website', '').strip('"'),
-                    'Address': row.get('Address', '').strip('"'),
-                    'Priority': row.get('Priority', 'MEDIUM').strip('"'),
-                    'Quality Score': int(row.get('Quality Score', 5)) if row.get('Quality Score', '').strip('"').isdigit() else 5,
-                    'Data Source': row.get('Data Source', '').strip('"'),
-                    'Search Term': row.get('Search Term', '').strip('"'),
-                    'Timestamp': row.get('Timestamp', datetime.now().isoformat()).strip('"')
-                }
-                
-                # Only add valid leads (must have name)
-                if lead['Name'] and lead['Name'] != 'Name':
-                    leads.append(lead)
+        for record in read_leads(csv_file):
+            # Convert to expected format
+            leads.append({
+                'Name': record.name,
+                'Category': record.category,
+                'Phone': record.phone,
+                'Email': record.email or 'Not available',
+                'Website': record.website,
+                'Address': record.address,
+                'Priority': record.priority or 'MEDIUM',
+                'Quality Score': record.quality_score if record.quality_score is not None else 5,
+                'Data Source': record.data_source,
+                'Search Term': record.search_term,
+                'Timestamp': record.timestamp or datetime.now().isoformat()
+            })
     
     except Exception as e:
         print(f"❌ Error reading CSV file {csv_file}: {e}")
@@ -94,11 +87,13 @@ def push_old_leads_to_crm():
         print(f"❌ Error initializing webhook connector: {e}")
         return
     
-    # Find CSV files
-    csv_files = find_csv_files()
+    # Find CSV files not fully imported by an earlier run
+    manifest = ImportManifest(os.path.join(RESULTS_DIR, '.import_manifest.db'), destination=webhook_url)
+    csv_files = find_csv_files(manifest)
     
     if not csv_files:
-        print("❌ No CSV files found in results directory")
+        print("✅ No new or changed CSV files in results directory - nothing to send")
+        manifest.close()
         return
     
     print(f"\n📁 Found {len(csv_files)} CSV files:")
@@ -132,6 +127,7 @@ def push_old_leads_to_crm():
         
         success_count = 0
         failed_count = 0
+        skipped_count = 0
         
         for i, lead in enumerate(leads, 1):
             try:
@@ -139,7 +135,13 @@ def push_old_leads_to_crm():
                 lead['Data Source'] = f"{lead.get('Data Source', 'Historical Data')} (Re-imported)"
                 lead['Search Term'] = f"{lead.get('Search Term', '')} [Historical]"
                 
+                # Same lead with the same content was sent by an earlier run
+                if manifest.is_delivered(lead):
+                    skipped_count += 1
+                    continue
+                
                 success = connector.push_lead(lead)
+                manifest.record(lead, success)
                 
                 if success:
                     success_count += 1
@@ -156,10 +158,13 @@ def push_old_leads_to_crm():
                 failed_count += 1
                 print(f"   ❌ ({i}/{len(leads)}) {lead['Name']} - ERROR: {e}")
         
-        print(f"   📈 Results: {success_count} sent, {failed_count} failed")
+        manifest.mark_file(csv_file, complete=failed_count == 0)
+        print(f"   📈 Results: {success_count} sent, {failed_count} failed, {skipped_count} already imported")
         total_leads_sent += success_count
         total_leads_failed += failed_count
     
+    manifest.close()
+    
     # Final summary
     print("\n" + "="*70)
     print("📊 FINAL SUMMARY")
@@ -108,7 +108,8 @@ module.exports = {
         BATCH_SIZE: 100,
         MAX_RETRIES: 1,
         RETRY_DELAY: 3000,
-        MEMORY_LIMIT_MB: 4096
+        MEMORY_LIMIT_MB: 4096,
+        PAGE_MAX_USES: 10
     },
 
     // Google Sheets configuration
@@ -2,7 +2,9 @@ const Apify = require('apify');
 
 const { PERFORMANCE } = require('./constants');
 const GoogleMapsScraper = require('./scraper');
-const { removeDuplicates, validateInput, getTimestamp, getMemoryUsage, sleep } = require('./utils');
+const {
+    removeDuplicates, validateInput, getTimestamp, getMemoryUsage, runWithConcurrency
+} = require('./utils');
 
 /**
  * Main Apify Actor for Dubai SME Business Scraping
@@ -80,71 +82,56 @@ class DubaiSMEActor {
             await this.initialize();
 
             const allBusinesses = [];
+            const { categories } = this.input;
             const maxRetries = this.input.concurrency?.retryAttempts || 3;
-
-            // Process each category
-            for (let i = 0; i < this.input.categories.length; i++) {
-                const category = this.input.categories[i];
-                console.log(`[${getTimestamp()}] Processing category ${i + 1}/${this.input.categories.length}: "${category}"`);
-
-                let categoryBusinesses = [];
-                let retryCount = 0;
-
-                while (retryCount < maxRetries) {
-                    try {
-                        categoryBusinesses = await this.scraper.searchBusinesses(
-                            category,
-                            this.input.maxResultsPerCategory
-                        );
-                        break; // Success, exit retry loop
-                    } catch (error) {
-                        retryCount++;
+            const concurrency = Math.min(this.scraper.options.maxConcurrency, categories.length);
+
+            console.log(`[${getTimestamp()}] Processing ${categories.length} categories, ${concurrency} at a time`);
+
+            // Load Maps once per lane up front; searches then reuse these pages
+            await this.scraper.warmPool(concurrency);
+
+            // Each category runs on a pooled page; a failing category is retried without holding up the others
+            const results = await runWithConcurrency(
+                categories,
+                async (category, index, attempt) => {
+                    const attemptText = attempt > 1 ? ` (attempt ${attempt}/${maxRetries})` : '';
+                    console.log(`[${getTimestamp()}] Processing category ${index + 1}/${categories.length}: "${category}"${attemptText}`);
+
+                    const categoryBusinesses = await this.scraper.searchBusinesses(
+                        category,
+                        this.input.maxResultsPerCategory
+                    );
+
+                    // Save as soon as the category completes, not when the whole run does
+                    await this.recordCategory(category, categoryBusinesses, allBusinesses);
+                    return categoryBusinesses;
+                },
+                {
+                    concurrency,
+                    retryAttempts: maxRetries,
+                    retryDelay: 5000,
+                    taskDelay: this.input.concurrency?.requestDelay || 2000,
+                    onError: (error, category, attempt) => {
                         this.stats.errors.push({
                             category,
-                            attempt: retryCount,
+                            attempt,
                             error: error.message,
                             timestamp: new Date().toISOString()
                         });
 
-                        if (retryCount < maxRetries) {
-                            const delay = 5000 * retryCount; // Exponential backoff
-                            console.log(`[${getTimestamp()}] Retry ${retryCount}/${maxRetries} for category "${category}" in ${delay}ms`);
-                            await sleep(delay);
+                        if (attempt < maxRetries) {
+                            console.log(`[${getTimestamp()}] Retry ${attempt}/${maxRetries} for category "${category}" in ${5000 * attempt}ms`);
                         } else {
                             console.error(`[${getTimestamp()}] Failed to process category "${category}" after ${maxRetries} attempts`);
                         }
                     }
                 }
+            );
 
-                if (categoryBusinesses.length > 0) {
-                    console.log(`[${getTimestamp()}] Extracted ${categoryBusinesses.length} businesses from "${category}"`);
-                    allBusinesses.push(...categoryBusinesses);
-
-                    // Save partial results to dataset
-                    await this.dataset.pushData(categoryBusinesses);
-                } else {
-                    console.warn(`[${getTimestamp()}] No businesses found for category "${category}"`);
-                }
-
-                this.stats.categoriesProcessed++;
-                this.stats.totalBusinesses = allBusinesses.length;
-
-                // Memory management check
-                const memUsage = getMemoryUsage();
-                console.log(`[${getTimestamp()}] Memory usage: ${memUsage.heapUsed}MB / ${memUsage.rss}MB`);
-
-                if (memUsage.heapUsed > PERFORMANCE.MEMORY_LIMIT_MB * 0.8) {
-                    console.log(`[${getTimestamp()}] High memory usage detected, running garbage collection`);
-                    if (global.gc) {
-                        global.gc();
-                    }
-                }
-
-                // Delay between categories to avoid rate limiting
-                if (i < this.input.categories.length - 1) {
-                    const delay = this.input.concurrency?.requestDelay || 2000;
-                    console.log(`[${getTimestamp()}] Waiting ${delay}ms before next category...`);
-                    await sleep(delay);
+            for (const { item: category, error } of results) {
+                if (error) {
+                    await this.recordCategory(category, [], allBusinesses);
                 }
             }
 
@@ -158,6 +145,38 @@ class DubaiSMEActor {
         }
     }
 
+    /**
+     * Save one category's results and update run statistics
+     * @param {string} category - Category search query
+     * @param {Array} categoryBusinesses - Businesses found for the category
+     * @param {Array} allBusinesses - Accumulator for the whole run
+     */
+    async recordCategory(category, categoryBusinesses, allBusinesses) {
+        if (categoryBusinesses.length > 0) {
+            console.log(`[${getTimestamp()}] Extracted ${categoryBusinesses.length} businesses from "${category}"`);
+            allBusinesses.push(...categoryBusinesses);
+
+            // Save partial results to dataset
+            await this.dataset.pushData(categoryBusinesses);
+        } else {
+            console.warn(`[${getTimestamp()}] No businesses found for category "${category}"`);
+        }
+
+        this.stats.categoriesProcessed++;
+        this.stats.totalBusinesses = allBusinesses.length;
+
+        // Memory management check
+        const memUsage = getMemoryUsage();
+        console.log(`[${getTimestamp()}] Memory usage: ${memUsage.heapUsed}MB / ${memUsage.rss}MB`);
+
+        if (memUsage.heapUsed > PERFORMANCE.MEMORY_LIMIT_MB * 0.8) {
+            console.log(`[${getTimestamp()}] High memory usage detected, running garbage collection`);
+            if (global.gc) {
+                global.gc();
+            }
+        }
+    }
+
     /**
      * Process, clean, and export collected business data
      * @param {Array} businesses - Raw business data
@@ -32,15 +32,20 @@ class GoogleMapsScraper {
             requestDelay: options.requestDelay || 2000,
             timeout: options.timeout || PERFORMANCE.DEFAULT_TIMEOUT,
             proxyConfig: options.proxyConfig || null,
-            userAgent: options.userAgent || USER_AGENTS[0]
+            userAgent: options.userAgent || USER_AGENTS[0],
+            pageMaxUses: options.pageMaxUses || PERFORMANCE.PAGE_MAX_USES
         };
 
         this.browser = null;
         this.pages = [];
+        this.idlePages = [];
         this.stats = {
             totalProcessed: 0,
             successful: 0,
             failed: 0,
+            pagesCreated: 0,
+            pagesReused: 0,
+            pagesRecycled: 0,
             startTime: Date.now()
         };
     }
@@ -134,16 +139,11 @@ class GoogleMapsScraper {
     }
 
     /**
-     * Search for businesses in a specific category
-     * @param {string} searchQuery - Search query (e.g., "restaurants dubai")
-     * @param {number} maxResults - Maximum number of results to collect
-     * @returns {Array} - Array of business data
+     * Create a page with the Google Maps shell loaded and ready for a query
+     * @returns {Object} - Pool entry { page, uses }
      */
-    async searchBusinesses(searchQuery, maxResults = 100) {
-        console.log(`[${getTimestamp()}] Starting search for: "${searchQuery}"`);
-
+    async warmPage() {
         const page = await this.createPage();
-        const businesses = [];
 
         try {
             // Navigate to Google Maps with English interface
@@ -152,10 +152,101 @@ class GoogleMapsScraper {
                 timeout: PERFORMANCE.NAVIGATION_TIMEOUT
             });
 
-            // Wait for search box and perform search
             await page.waitForSelector(GOOGLE_MAPS.SELECTORS.SEARCH_BOX, {
                 timeout: PERFORMANCE.ELEMENT_WAIT_TIMEOUT
             });
+        } catch (error) {
+            await this.discardPage(page);
+            throw error;
+        }
+
+        this.stats.pagesCreated++;
+        return { page, uses: 0 };
+    }
+
+    /**
+     * Pre-warm pages so the first searches skip the Maps startup
+     * @param {number} count - Number of pages to keep ready (default maxConcurrency)
+     */
+    async warmPool(count = this.options.maxConcurrency) {
+        const missing = Math.max(0, count - this.idlePages.length);
+        if (missing === 0) return;
+
+        console.log(`[${getTimestamp()}] Warming ${missing} Google Maps page(s)...`);
+        const results = await Promise.allSettled(Array.from({ length: missing }, () => this.warmPage()));
+
+        results.forEach((result) => {
+            if (result.status === 'fulfilled') {
+                this.idlePages.push(result.value);
+            } else {
+                console.warn(`[${getTimestamp()}] Failed to warm page:`, result.reason.message);
+            }
+        });
+    }
+
+    /**
+     * Take a warm page from the pool, loading a new one when none is idle
+     * @returns {Object} - Pool entry { page, uses }
+     */
+    async acquirePage() {
+        while (this.idlePages.length > 0) {
+            const entry = this.idlePages.pop();
+            if (!entry.page.isClosed()) {
+                this.stats.pagesReused++;
+                return entry;
+            }
+            this.pages = this.pages.filter((p) => p !== entry.page);
+        }
+
+        return this.warmPage();
+    }
+
+    /**
+     * Return a page to the pool, or close it after pageMaxUses searches or a failure
+     * @param {Object} entry - Pool entry from acquirePage()
+     * @param {boolean} failed - Whether the search on this page failed
+     */
+    async releasePage(entry, failed = false) {
+        entry.uses++;
+
+        const worn = entry.uses >= this.options.pageMaxUses;
+        const full = this.idlePages.length >= this.options.maxConcurrency;
+
+        if (failed || worn || full || entry.page.isClosed() || !this.browser) {
+            this.stats.pagesRecycled++;
+            await this.discardPage(entry.page);
+            return;
+        }
+
+        this.idlePages.push(entry);
+    }
+
+    /**
+     * Close a page and forget it
+     * @param {Page} page - Playwright page object
+     */
+    async discardPage(page) {
+        await page.close().catch(() => {});
+        this.pages = this.pages.filter((p) => p !== page);
+    }
+
+    /**
+     * Search for businesses in a specific category
+     * @param {string} searchQuery - Search query (e.g., "restaurants dubai")
+     * @param {number} maxResults - Maximum number of results to collect
+     * @returns {Array} - Array of business data
+     */
+    async searchBusinesses(searchQuery, maxResults = 100) {
+        console.log(`[${getTimestamp()}] Starting search for: "${searchQuery}"`);
+
+        const entry = await this.acquirePage();
+        const { page } = entry;
+        const businesses = [];
+        let failed = false;
+
+        try {
+            // A reused page still shows the previous query's results
+            const staleResult = await page.$(GOOGLE_MAPS.SELECTORS.RESULT_ITEMS);
 
             // Clear existing content and fill search box
             await page.fill(GOOGLE_MAPS.SELECTORS.SEARCH_BOX, '');
@@ -181,6 +272,12 @@ class GoogleMapsScraper {
             }
 
             // Wait for results to load
+            if (staleResult) {
+                await staleResult.waitForElementState('hidden', {
+                    timeout: PERFORMANCE.ELEMENT_WAIT_TIMEOUT
+                }).catch(() => {});
+                await staleResult.dispose();
+            }
             await page.waitForSelector(GOOGLE_MAPS.SELECTORS.RESULT_ITEMS, {
                 timeout: PERFORMANCE.ELEMENT_WAIT_TIMEOUT
             });
@@ -241,6 +338,7 @@ class GoogleMapsScraper {
             return businesses;
         } catch (error) {
             console.error(`[${getTimestamp()}] Error in searchBusinesses:`, error);
+            failed = true;
 
             // Check for specific error types
             if (await this.detectCaptcha(page)) {
@@ -253,8 +351,7 @@ class GoogleMapsScraper {
 
             throw error;
         } finally {
-            await page.close();
-            this.pages = this.pages.filter((p) => p !== page);
+            await this.releasePage(entry, failed);
         }
     }
 
@@ -622,6 +719,7 @@ class GoogleMapsScraper {
     async close() {
         console.log(`[${getTimestamp()}] Closing scraper...`);
 
+        this.idlePages = [];
         if (this.pages.length > 0) {
             await Promise.all(this.pages.map((page) => page.close().catch(() => {})));
         }
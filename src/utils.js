@@ -270,6 +270,52 @@ async function retryWithBackoff(fn, maxAttempts = 3, baseDelay = 1000) {
     }
 }
 
+/**
+ * Run async tasks with at most `concurrency` in flight, retrying each task on failure
+ * Each lane waits `taskDelay` between its tasks and lanes start staggered by the
+ * same delay, so concurrent tasks don't hit the target site in the same instant.
+ * @param {Array} items - Task inputs
+ * @param {Function} worker - async (item, index, attempt) => result
+ * @param {Object} options - { concurrency, retryAttempts, retryDelay, taskDelay, onError(error, item, attempt) }
+ * @returns {Promise<Array>} - [{ item, result, error, attempts }] in input order
+ */
+async function runWithConcurrency(items, worker, options = {}) {
+    const concurrency = Math.max(1, Math.min(options.concurrency || 1, items.length));
+    const retryAttempts = Math.max(1, options.retryAttempts || 1);
+    const retryDelay = options.retryDelay ?? 5000;
+    const taskDelay = options.taskDelay || 0;
+    const results = new Array(items.length);
+    let next = 0;
+
+    const runTask = async (index) => {
+        const item = items[index];
+        for (let attempt = 1; ; attempt++) {
+            try {
+                const result = await worker(item, index, attempt);
+                return { item, result, error: null, attempts: attempt };
+            } catch (error) {
+                if (options.onError) options.onError(error, item, attempt);
+                if (attempt >= retryAttempts) {
+                    return { item, result: null, error, attempts: attempt };
+                }
+                await sleep(retryDelay * attempt); // Linear backoff, only this lane waits
+            }
+        }
+    };
+
+    const lane = async (laneIndex) => {
+        await sleep(laneIndex * taskDelay);
+        while (next < items.length) {
+            const index = next++;
+            results[index] = await runTask(index);
+            if (next < items.length && taskDelay) await sleep(taskDelay);
+        }
+    };
+
+    await Promise.all(Array.from({ length: concurrency }, (_, laneIndex) => lane(laneIndex)));
+    return results;
+}
+
 /**
  * Format timestamp for logging
  * @returns {string} - Formatted timestamp
@@ -501,6 +547,7 @@ module.exports = {
     sleep,
     randomDelay,
     retryWithBackoff,
+    runWithConcurrency,
     getTimestamp,
     sanitizeFilename,
     getMemoryUsage,
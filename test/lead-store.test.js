@@ -0,0 +1,89 @@
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const { DatabaseSync } = require('node:sqlite');
+const { LeadStore, ftsQuery, DEFAULT_DB_PATH } = require('../scripts/utilities/lead-store');
+
+// The tables lead-store.js reads, as scripts/utilities/lead_store.py creates them
+const SCHEMA = `
+    CREATE TABLE leads (
+        id INTEGER PRIMARY KEY, name TEXT NOT NULL, category TEXT NOT NULL DEFAULT '',
+        phone TEXT NOT NULL DEFAULT '', email TEXT NOT NULL DEFAULT '', website TEXT NOT NULL DEFAULT '',
+        address TEXT NOT NULL DEFAULT '', priority TEXT NOT NULL DEFAULT '', quality_score INTEGER
+    );
+    CREATE VIRTUAL TABLE leads_fts USING fts5 (name, category, address, content='leads', content_rowid='id');
+    CREATE TABLE executives (
+        id INTEGER PRIMARY KEY, lead_id INTEGER, company TEXT NOT NULL DEFAULT '', name TEXT NOT NULL,
+        email TEXT NOT NULL DEFAULT '', position TEXT NOT NULL DEFAULT '', linkedin TEXT NOT NULL DEFAULT ''
+    );
+    CREATE TABLE files (path TEXT PRIMARY KEY);
+`;
+
+const LEADS = [
+    ['Al Noor Trading LLC', 'Trading', '04 123 4567', '', 'alnoor.ae', 'Deira, Dubai', 'MEDIUM', 6],
+    ['Gulf Group Holding', 'Holding', '04 222 3333', 'info@gulfgroup.ae', 'gulfgroup.ae', 'Business Bay', 'HIGH', 8],
+    ['Noor Accounting', 'Accounting', '', '', '', 'Al Barsha', 'LOW', 4]
+];
+
+describe('Lead Store', () => {
+    let directory;
+    let store;
+
+    beforeAll(() => {
+        directory = fs.mkdtempSync(path.join(os.tmpdir(), 'lead-store-'));
+        const dbPath = path.join(directory, '.lead_store.db');
+
+        const db = new DatabaseSync(dbPath);
+        db.exec(SCHEMA);
+        const insert = db.prepare(`INSERT INTO leads (name, category, phone, email, website, address, priority, quality_score)
+                                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)`);
+        LEADS.forEach(lead => insert.run(...lead));
+        db.exec("INSERT INTO leads_fts (leads_fts) VALUES ('rebuild')");
+        db.prepare('INSERT INTO executives (lead_id, company, name, position) VALUES (?, ?, ?, ?)')
+            .run(2, 'Gulf Group Holding', 'Omar Khalid', 'CFO');
+        db.prepare('INSERT INTO files (path) VALUES (?)').run('results/leads.csv');
+        db.close();
+
+        store = new LeadStore(dbPath);
+    });
+
+    afterAll(() => {
+        store.close();
+        fs.rmSync(directory, { recursive: true, force: true });
+    });
+
+    test('should default to the store lead_store.py writes', () => {
+        if (!process.env.LEAD_STORE_PATH) {
+            expect(DEFAULT_DB_PATH).toBe(path.join(__dirname, '..', 'results', '.lead_store.db'));
+        }
+    });
+
+    test('should quote and prefix full-text words', () => {
+        expect(ftsQuery('al "noor')).toBe('"al"* """noor"*');
+    });
+
+    test('should search names, categories and addresses', () => {
+        const names = store.search('noor').map(lead => lead.name).sort();
+        expect(names).toEqual(['Al Noor Trading LLC', 'Noor Accounting']);
+        expect(store.search('busin').map(lead => lead.name)).toEqual(['Gulf Group Holding']);
+        expect(store.search('  ')).toEqual([]);
+    });
+
+    test('should filter and order by priority and score', () => {
+        expect(store.find().map(lead => lead.priority)).toEqual(['HIGH', 'MEDIUM', 'LOW']);
+        expect(store.find({ hasEmail: true }).map(lead => lead.name)).toEqual(['Gulf Group Holding']);
+        expect(store.find({ hasPhone: true, minScore: 7 })).toHaveLength(1);
+        expect(store.find({ category: 'trading', limit: 5 }).map(lead => lead.name)).toEqual(['Al Noor Trading LLC']);
+    });
+
+    test('should join executives and count the store', () => {
+        expect(store.leadsWithExecutives().map(row => [row.company, row.name])).toEqual([['Gulf Group Holding', 'Omar Khalid']]);
+        expect(store.stats()).toEqual({
+            files: 1, leads: 3, withEmail: 1, withPhone: 2, executives: 1, linkedExecutives: 1
+        });
+    });
+
+    test('should explain how to build a missing store', () => {
+        expect(() => new LeadStore(path.join(directory, 'missing.db'))).toThrow(/lead_store\.py ingest/);
+    });
+});
@@ -1,7 +1,9 @@
 const DubaiSMEActor = require('../src/main');
 const GoogleMapsScraper = require('../src/scraper');
 const GoogleSheetsManager = require('../src/google-sheets');
-const { validateInput, cleanPhoneNumber, removeDuplicates } = require('../src/utils');
+const {
+    validateInput, cleanPhoneNumber, removeDuplicates, runWithConcurrency
+} = require('../src/utils');
 
 // Mock Apify for testing
 jest.mock('apify', () => ({
@@ -85,6 +87,73 @@ describe('Dubai SME Actor', () => {
     });
 });
 
+describe('Category Scheduler', () => {
+    test('should never run more tasks than the concurrency limit', async () => {
+        let running = 0;
+        let peak = 0;
+        const results = await runWithConcurrency([1, 2, 3, 4, 5, 6], async (item) => {
+            running++;
+            peak = Math.max(peak, running);
+            await new Promise((resolve) => setTimeout(resolve, 10));
+            running--;
+            return item * 2;
+        }, { concurrency: 3 });
+
+        expect(peak).toBe(3);
+        expect(results.map((r) => r.result)).toEqual([2, 4, 6, 8, 10, 12]);
+    });
+
+    test('should retry a failing task without failing the others', async () => {
+        const onError = jest.fn();
+        const results = await runWithConcurrency(['ok', 'flaky', 'broken'], async (item, index, attempt) => {
+            if (item === 'broken' || (item === 'flaky' && attempt < 2)) {
+                throw new Error(`${item} failed`);
+            }
+            return item;
+        }, { concurrency: 2, retryAttempts: 3, retryDelay: 1, onError });
+
+        expect(results[0]).toMatchObject({ result: 'ok', attempts: 1, error: null });
+        expect(results[1]).toMatchObject({ result: 'flaky', attempts: 2, error: null });
+        expect(results[2].attempts).toBe(3);
+        expect(results[2].error.message).toBe('broken failed');
+        expect(onError).toHaveBeenCalledTimes(4);
+    });
+});
+
+describe('Page Pool', () => {
+    let scraper;
+
+    beforeEach(() => {
+        scraper = new GoogleMapsScraper({ maxConcurrency: 2, pageMaxUses: 2 });
+        scraper.browser = {};
+        scraper.warmPage = jest.fn(async () => {
+            const page = { closed: false, isClosed() { return this.closed; }, close: jest.fn(async function () { this.closed = true; }) };
+            scraper.stats.pagesCreated++;
+            return { page, uses: 0 };
+        });
+    });
+
+    test('should reuse a released page until it reaches pageMaxUses', async () => {
+        const first = await scraper.acquirePage();
+        await scraper.releasePage(first);
+        const second = await scraper.acquirePage();
+        expect(second).toBe(first);
+
+        await scraper.releasePage(second);
+        expect(first.page.close).toHaveBeenCalled();
+        expect(scraper.idlePages).toHaveLength(0);
+        expect(scraper.stats).toMatchObject({ pagesCreated: 1, pagesReused: 1, pagesRecycled: 1 });
+    });
+
+    test('should recycle a page after a failed search', async () => {
+        const entry = await scraper.acquirePage();
+        await scraper.releasePage(entry, true);
+
+        expect(entry.page.close).toHaveBeenCalled();
+        expect((await scraper.acquirePage()).page).not.toBe(entry.page);
+    });
+});
+
 describe('Google Maps Scraper', () => {
     let scraper;
 